@@ -1,7 +1,8 @@
 """API calls για ανάκτηση δεδομένων"""
 import re
 from datetime import datetime
-from procedures import load_procedures_cache, save_procedures_cache
+from procedures import load_procedures_cache, update_procedures_cache
+from session import get_with_relogin
 
 def extract_field(payload, field_name):
     """Εξάγει πεδίο από API response"""
@@ -88,18 +89,18 @@ def _extract_department_name(raw_department: str | None) -> tuple[str | None, st
     
     return (department or None, general_directorate_fallback)
 
-def fetch_record_details(monitor, doc_id):
-    """Ανακτά λεπτομέρειες εγγραφής"""
-    if not doc_id:
-        return None, None, None, None, None, None, None, None
-    
+_EMPTY_DETAILS = (None, None, None, None, None, None, None, None)
+# Κάτω από αυτό το πλήθος ο εμπλουτισμός δεν τυπώνει progress
+_ENRICH_PROGRESS_MIN = 50
+
+def _fetch_record_payload(monitor, doc_id):
+    """GET fetchDataTableRecord/7· κάνει raise σε σφάλματα δικτύου/HTTP (για retries)."""
     session = getattr(monitor, 'session', None)
     base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
     main_page_url = getattr(monitor, 'main_page_url', '')
     
     if not session or not base_url:
-        return None, None, None, None, None, None, None, None
+        return None
     
     url = base_url.rstrip('/') + f"/services/DataServices/fetchDataTableRecord/7/{doc_id}"
     headers = {
@@ -109,21 +110,13 @@ def fetch_record_details(monitor, doc_id):
         'X-Requested-With': 'XMLHttpRequest',
         'Referer': main_page_url or base_url,
     }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
-    
-    try:
-        response = session.get(url, headers=headers, timeout=15, verify=False)
-        response.raise_for_status()
-        payload = response.json()
-    except Exception as exc:
-        print(f"⚠️  Αποτυχία ανάκτησης στοιχείων για DOCID {doc_id}: {exc}")
-        return None, None, None, None, None, None, None, None
     
-    if not payload.get('success', False):
-        print(f"⚠️  API returned success=false for DOCID {doc_id}")
-        return None, None, None, None, None, None, None, None
+    response = get_with_relogin(monitor, url, headers, timeout=15)
+    response.raise_for_status()
+    return response.json()
 
+def _parse_record_details(payload):
+    """8-tuple λεπτομερειών από payload του fetchDataTableRecord/7"""
     # Extract department and general_directorate from W007_P_FLD18
     department, gd_from_dept = _extract_department_name(extract_field(payload, 'W007_P_FLD18'))
     general_directorate = extract_field(payload, 'W007_P_FLD16') or gd_from_dept
@@ -139,21 +132,112 @@ def fetch_record_details(monitor, doc_id):
             general_directorate,                         # general_directorate (W007_P_FLD16 or from parentheses)
             department)                                  # department (W007_P_FLD18 without parentheses)
 
-def enrich_record_details(monitor, records, procedures_cache=None):
-    """Εμπλουτίζει τις εγγραφές με πρωτόκολλο, διαδικασία, διεύθυνση και οργανωτική μονάδα"""
+def _fetch_record_details_strict(monitor, doc_id):
+    """Όπως το fetch_record_details, αλλά αφήνει τα σφάλματα δικτύου να περάσουν στον caller."""
+    payload = _fetch_record_payload(monitor, doc_id)
+    if payload is None:
+        return _EMPTY_DETAILS
+    if not payload.get('success', False):
+        print(f"⚠️  API returned success=false for DOCID {doc_id}")
+        return _EMPTY_DETAILS
+    return _parse_record_details(payload)
+
+def fetch_record_details(monitor, doc_id):
+    """Ανακτά λεπτομέρειες εγγραφής"""
+    if not doc_id:
+        return _EMPTY_DETAILS
+    try:
+        return _fetch_record_details_strict(monitor, doc_id)
+    except Exception as exc:
+        print(f"⚠️  Αποτυχία ανάκτησης στοιχείων για DOCID {doc_id}: {exc}")
+        return _EMPTY_DETAILS
+
+def _needs_details(rec):
+    if not rec or not rec.get('doc_id'):
+        return False
+    # Ελέγχουμε τα κρίσιμα πεδία (χωρίς protocol_date που είναι προαιρετικό)
+    return not (rec.get('protocol_number') and rec.get('procedure') and rec.get('directory')
+                and rec.get('document_category') and rec.get('general_directorate') and rec.get('department'))
+
+def fetch_details_concurrently(monitor, doc_ids, use_cache=True):
+    """Ανακτά λεπτομέρειες για πολλά DOCID ταυτόχρονα (rate limit ανά host, retries).
+    
+    Τα DOCID με φρέσκια εγγραφή στο detail_cache (και αρνητική, για πρόσφατες
+    αποτυχίες) δεν ζητούνται από το portal· τα νέα αποτελέσματα αποθηκεύονται.
+
+    Returns:
+        dict: doc_id -> 8-tuple (όπως το fetch_record_details)
+    """
+    import detail_cache
+    from concurrency import get_host_limiter, run_concurrently
+    
+    doc_ids = list(dict.fromkeys(str(d) for d in doc_ids if d))
+    if not doc_ids:
+        return {}
+    
+    use_cache = use_cache and detail_cache.is_enabled()
+    details = detail_cache.get_cached_details(doc_ids) if use_cache else {}
+    missing = [doc_id for doc_id in doc_ids if doc_id not in details]
+    if not missing:
+        return details
+    
+    def on_error(doc_id, exc):
+        print(f"⚠️  Αποτυχία ανάκτησης στοιχείων για DOCID {doc_id}: {exc}")
+    
+    results = run_concurrently(
+        lambda doc_id: _fetch_record_details_strict(monitor, doc_id),
+        missing,
+        limiter=get_host_limiter(getattr(monitor, 'base_url', '')),
+        label='Εμπλουτισμός στοιχείων' if len(missing) >= _ENRICH_PROGRESS_MIN else None,
+        on_error=on_error,
+    )
+    fetched = {doc_id: result or _EMPTY_DETAILS for doc_id, result in zip(missing, results)}
+    if use_cache:
+        detail_cache.store_details(fetched)
+    details.update(fetched)
+    return details
+
+def _apply_procedure_details(procedures_cache, found):
+    """Καταχωρεί στο procedures cache τα (procedure, procedure_id, directory)· True αν άλλαξε κάτι"""
+    cache_updated = False
+    for procedure, procedure_id, directory in found:
+        if procedure_id is not None:
+            if procedure not in procedures_cache:
+                procedures_cache[procedure] = {
+                    'title': procedure, 'procedure_id': procedure_id or '',
+                    'first_seen': datetime.now().isoformat()
+                }
+                cache_updated = True
+            elif procedure_id and not procedures_cache[procedure].get('procedure_id'):
+                procedures_cache[procedure]['procedure_id'] = procedure_id
+                cache_updated = True
+        if directory and procedure in procedures_cache:
+            if 'directories' not in procedures_cache[procedure]:
+                procedures_cache[procedure]['directories'] = []
+            if directory not in procedures_cache[procedure]['directories']:
+                procedures_cache[procedure]['directories'].append(directory)
+                cache_updated = True
+    return cache_updated
+
+def enrich_record_details(monitor, records, procedures_cache=None, use_cache=True):
+    """Εμπλουτίζει τις εγγραφές με πρωτόκολλο, διαδικασία, διεύθυνση και οργανωτική μονάδα
+    
+    Οι λεπτομέρειες διαβάζονται από το detail cache ή ανακτώνται ταυτόχρονα
+    (fetch_details_concurrently)· η εφαρμογή τους στις εγγραφές γίνεται σειριακά και
+    οι νέες διαδικασίες/διευθύνσεις γράφονται στο procedures cache με ένα
+    read-modify-write κάτω από lock (update_procedures_cache).
+    """
     if procedures_cache is None:
         procedures_cache = load_procedures_cache()
     
-    cache_updated = False
-    for rec in records or []:
-        if not rec or not rec.get('doc_id'):
-            continue
-        # Ελέγχουμε τα κρίσιμα πεδία (χωρίς protocol_date που είναι προαιρετικό)
-        if (rec.get('protocol_number') and rec.get('procedure') and rec.get('directory')
-            and rec.get('document_category') and rec.get('general_directorate') and rec.get('department')):
-            continue
-        
-        result = fetch_record_details(monitor, rec.get('doc_id'))
+    pending = [rec for rec in records or [] if _needs_details(rec)]
+    if not pending:
+        return procedures_cache
+    details = fetch_details_concurrently(monitor, [rec.get('doc_id') for rec in pending], use_cache=use_cache)
+    
+    found = []
+    for rec in pending:
+        result = details.get(str(rec.get('doc_id')))
         if result is None or result[0] is None:  # Αν η ανάκτηση απέτυχε
             continue
          
@@ -165,32 +249,22 @@ def enrich_record_details(monitor, records, procedures_cache=None):
             rec['protocol_date'] = protocol_date
         if doc_category and not rec.get('document_category'):
             rec['document_category'] = doc_category
-        if procedure and not rec.get('procedure'):
+        new_procedure = bool(procedure and not rec.get('procedure'))
+        if new_procedure:
             rec['procedure'] = procedure
-            if procedure not in procedures_cache:
-                procedures_cache[procedure] = {
-                    'title': procedure, 'procedure_id': procedure_id or '',
-                    'first_seen': datetime.now().isoformat()
-                }
-                cache_updated = True
-            elif procedure_id and not procedures_cache[procedure].get('procedure_id'):
-                procedures_cache[procedure]['procedure_id'] = procedure_id
-                cache_updated = True
-        if directory and not rec.get('directory'):
+        new_directory = bool(directory and not rec.get('directory'))
+        if new_directory:
             rec['directory'] = directory
-            if procedure and procedure in procedures_cache:
-                if 'directories' not in procedures_cache[procedure]:
-                    procedures_cache[procedure]['directories'] = []
-                if directory not in procedures_cache[procedure]['directories']:
-                    procedures_cache[procedure]['directories'].append(directory)
-                    cache_updated = True
+        if procedure and (new_procedure or new_directory):
+            found.append((procedure, (procedure_id or '') if new_procedure else None,
+                          directory if new_directory else None))
         if general_directorate and not rec.get('general_directorate'):
             rec['general_directorate'] = general_directorate
         if department and not rec.get('department'):
             rec['department'] = department
     
-    if cache_updated:
-        save_procedures_cache(procedures_cache)
+    if found and _apply_procedure_details(procedures_cache, found):
+        update_procedures_cache(lambda cache: _apply_procedure_details(cache, found))
     return procedures_cache
 
 def sanitize_party_name(raw_party):
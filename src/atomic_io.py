@@ -0,0 +1,97 @@
+"""Ασφαλείς εγγραφές αρχείων του data/ (crash-safe και με κλείδωμα μεταξύ processes).
+
+- `atomic_write`: γράφει σε προσωρινό αρχείο στον ίδιο φάκελο, fsync και os.replace,
+  ώστε ένα διακοπτόμενο process να αφήνει είτε το παλιό είτε το νέο αρχείο, ποτέ μισό
+- `file_lock`: αποκλειστικό κλείδωμα (`<path>.lock`) για read-modify-write και για
+  λειτουργίες σε πολλά αρχεία, κοινό για API server και cron CLI
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def _fsync_dir(directory):
+    if fcntl is None:
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _default_mode(path):
+    """Δικαιώματα όπως θα τα έδινε ένα `open(path, 'w')`: του υπάρχοντος αρχείου ή 0o666 & ~umask."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path, data, mode=None):
+    """Αντικαθιστά ατομικά το `path` με τα bytes `data` (προαιρετικά με δικαιώματα `mode`).
+
+    Χωρίς `mode` διατηρούνται τα δικαιώματα του υπάρχοντος αρχείου (το mkstemp δίνει 0o600).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if mode is None:
+        mode = _default_mode(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+    return path
+
+
+@contextmanager
+def file_lock(path):
+    """Αποκλειστικό κλείδωμα για το `path` (μπλοκάρει μέχρι να ελευθερωθεί).
+
+    Δεν είναι reentrant: μέσα σε ένα `file_lock(path)` μην ξανακλειδώνετε το ίδιο path.
+    """
+    lock_path = f'{path}.lock'
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
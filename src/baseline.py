@@ -1,8 +1,8 @@
 """Διαχείριση baselines για διαδικασίες"""
 import os
-import json
 from datetime import datetime
 from config import get_baseline_path, get_all_procedures_baseline_path
+from serialization import read_file, write_file
 
 def save_baseline(active_procedures):
     """Αποθηκεύει τις ενεργές διαδικασίες ως baseline"""
@@ -13,8 +13,7 @@ def save_baseline(active_procedures):
         'count': len(active_procedures),
         'procedures': active_procedures
     }
-    with open(baseline_path, 'w', encoding='utf-8') as f:
-        json.dump(baseline_data, f, ensure_ascii=False, indent=2)
+    write_file(baseline_path, baseline_data)
     print(f"\n💾 Baseline αποθηκεύτηκε: {baseline_path}")
     print(f"📋 Ενεργές διαδικασίες: {len(active_procedures)}")
     return baseline_path
@@ -22,10 +21,7 @@ def save_baseline(active_procedures):
 def load_baseline():
     """Φορτώνει το baseline ενεργών διαδικασιών"""
     baseline_path = get_baseline_path()
-    if not os.path.exists(baseline_path):
-        return None
-    with open(baseline_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return read_file(baseline_path)
 
 def save_all_procedures_baseline(all_procedures):
     """Αποθηκεύει όλες τις διαδικασίες ως baseline"""
@@ -36,8 +32,7 @@ def save_all_procedures_baseline(all_procedures):
         'count': len(all_procedures),
         'procedures': all_procedures
     }
-    with open(baseline_path, 'w', encoding='utf-8') as f:
-        json.dump(baseline_data, f, ensure_ascii=False, indent=2)
+    write_file(baseline_path, baseline_data)
     print(f"\n💾 Baseline όλων των διαδικασιών αποθηκεύτηκε: {baseline_path}")
     print(f"📋 Σύνολο διαδικασιών: {len(all_procedures)}")
     return baseline_path
@@ -45,10 +40,7 @@ def save_all_procedures_baseline(all_procedures):
 def load_all_procedures_baseline():
     """Φορτώνει το baseline όλων των διαδικασιών"""
     baseline_path = get_all_procedures_baseline_path()
-    if not os.path.exists(baseline_path):
-        return None
-    with open(baseline_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return read_file(baseline_path)
 
 def compare_with_baseline(current_procedures, baseline_data):
     """Συγκρίνει τις τρέχουσες διαδικασίες με το baseline"""
@@ -0,0 +1,62 @@
+"""Εξαγωγή αριθμού ΠΚΜ και κωδικού υπόθεσης από κείμενα του portal.
+
+Κοινό σημείο για το DESCRIPTION των χρεώσεων (queryId=2/3, OTS) και το "Αφορά Υπόθεση"
+(W007_P_FLD7 / related_case) των εισερχομένων. Τα patterns είναι precompiled και τα
+αποτελέσματα κρατιούνται σε LRU ανά raw string, αφού τα ίδια κείμενα επαναλαμβάνονται
+σε κάθε ανάκτηση. Το `simplify_incoming_records` αποθηκεύει τους κωδικούς ως πεδία
+(`case_code`, `related_case_code`), ώστε τα επόμενα στάδια να μην ξανακάνουν parsing.
+"""
+import html
+import re
+from functools import lru_cache
+
+# "Αίτημα 2026/106653 ΚΗΠΟΣ-258403847" -> 106653
+PKM_PATTERN = re.compile(r'Αίτημα\s+\d+/(\d+)')
+# "Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645" -> 2026/105673
+CASE_CODE_PATTERN = re.compile(r'(\d{4}/\d+)')
+
+_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _pkm_from_text(text):
+    if '&' in text:
+        text = html.unescape(text)
+    match = PKM_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _case_code_from_text(text):
+    match = CASE_CODE_PATTERN.search(text)
+    return match.group(1).strip().upper() if match else None
+
+
+def extract_pkm(description):
+    """Αριθμός ΠΚΜ από DESCRIPTION (π.χ. "106653") ή None."""
+    if not description:
+        return None
+    return _pkm_from_text(str(description))
+
+
+def extract_case_code(reference):
+    """Κωδικός υπόθεσης YYYY/NNNNNN από "Αφορά Υπόθεση" ή παρόμοιο κείμενο (ή None).
+
+    - "Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645" -> "2026/105673"
+    - "2026/105673" -> "2026/105673"
+    """
+    if not reference:
+        return None
+    return _case_code_from_text(str(reference))
+
+
+def incoming_case_code(submission_year, case_id):
+    """Κωδικός υπόθεσης μιας εισερχόμενης (μορφή W001_P_FLD2 των διεκπεραιωμένων)."""
+    submission_year = str(submission_year or '').strip()
+    case_id = str(case_id or '').strip()
+    return f"{submission_year}/{case_id}".upper() if submission_year and case_id else ''
+
+
+def cache_info():
+    """Στατιστικά των LRU (για διάγνωση)."""
+    return {'pkm': _pkm_from_text.cache_info(), 'case_code': _case_code_from_text.cache_info()}
@@ -0,0 +1,80 @@
+"""Persistent cache χρεώσεων (`_charge`) ανά DOCID εισερχόμενης αίτησης.
+
+Αντικαθιστά το data/charges_enrichment_cache.json, που ξαναγραφόταν ολόκληρο σε
+κάθε ενημέρωση και δεν μίκραινε ποτέ. Οι εγγραφές ζουν στο KVStore
+(data/cache.sqlite3, namespace `charge_enrichment`):
+- ανάγνωση/εγγραφή μόνο για τα DOCID που χρειάζονται (UPSERT, όχι rewrite)
+- λήξη μετά από `charge_cache_ttl` (default 30 ημέρες) ώστε να ξαναελέγχονται ανακαθέσεις
+- όριο `charge_cache_max_entries` (default 20000)· πέρα από αυτό φεύγουν οι παλαιότερες
+- οι υποθέσεις που διεκπεραιώθηκαν αφαιρούνται ρητά (βλ. evict)
+"""
+import json
+import os
+import time
+
+from config import get_project_root
+from kv_store import get_kv_store
+from utils import get_settings
+
+NAMESPACE = 'charge_enrichment'
+DEFAULT_CHARGE_TTL = 30 * 24 * 3600  # seconds
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def _legacy_cache_path():
+    return os.path.join(get_project_root(), 'data', 'charges_enrichment_cache.json')
+
+
+def _limits():
+    settings = get_settings()
+    return (settings.get('charge_cache_ttl', DEFAULT_CHARGE_TTL),
+            settings.get('charge_cache_max_entries', DEFAULT_MAX_ENTRIES))
+
+
+def _import_legacy_cache(store):
+    """Μεταφέρει μία φορά το παλιό JSON cache στο KVStore και το μετονομάζει σε *.migrated."""
+    path = _legacy_cache_path()
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        by_doc_id = payload.get('by_doc_id', {}) if isinstance(payload, dict) else {}
+    except (OSError, ValueError) as exc:
+        print(f"[WARNING] Αδυναμία ανάγνωσης {path}: {exc}")
+        return 0
+    store.put_many(NAMESPACE, ((doc_id, charge, True) for doc_id, charge in by_doc_id.items() if charge))
+    os.replace(path, path + '.migrated')
+    return len(by_doc_id)
+
+
+def get_cached_charges(doc_ids, store=None):
+    """Επιστρέφει {doc_id: charge} για τα DOCID με μη ληγμένη εγγραφή."""
+    store = store or get_kv_store()
+    _import_legacy_cache(store)
+    ttl, _ = _limits()
+    now = time.time()
+    return {
+        doc_id: value
+        for doc_id, (value, ok, fetched_at) in store.get_many(NAMESPACE, doc_ids).items()
+        if ok and value and now - fetched_at < ttl
+    }
+
+
+def store_charges(charges_by_doc_id, store=None):
+    """Αποθηκεύει {doc_id: charge} (μόνο χρεωμένες) και εφαρμόζει TTL / όριο μεγέθους."""
+    store = store or get_kv_store()
+    items = [(doc_id, charge, True) for doc_id, charge in charges_by_doc_id.items()
+             if charge and charge.get('charged')]
+    if not items:
+        return
+    store.put_many(NAMESPACE, items)
+    ttl, max_entries = _limits()
+    store.prune(NAMESPACE, max_age=ttl, max_entries=max_entries)
+
+
+def evict(doc_ids, store=None):
+    """Αφαιρεί εγγραφές (π.χ. για υποθέσεις που διεκπεραιώθηκαν)."""
+    doc_ids = [d for d in doc_ids if d]
+    if doc_ids:
+        (store or get_kv_store()).delete_many(NAMESPACE, doc_ids)
@@ -7,8 +7,12 @@
 - Προσθήκη πληροφοριών ανάθεσης υπαλλήλου στα records
 """
 import html
-import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from api import extract_field
+from case_codes import extract_pkm
+from pagination import fetch_all_pages
+from session import get_with_relogin
 from typing import Dict, List, Optional, Tuple
 
 
@@ -25,6 +29,24 @@ CHARGES_PARAMS = {
     'isPoll': 'true'
 }
 
+# Παράμετροι για Routing/Forwarding (queryId=3)
+QUERYID3_PARAMS = {
+    'queryId': '3',
+    'queryOwner': '3',
+    'isCase': 'false',
+    'stateId': 'welcomeGrid-45_dashboard0',
+    'page': '1',
+    'start': '0',
+    'limit': '100',
+    'isPoll': 'true'
+}
+
+
+def _fetch_all_charge_rows(session, params) -> List[dict]:
+    """Όλες οι σελίδες ενός charges query (παράλληλα μετά την 1η σελίδα)."""
+    data = fetch_all_pages(session, params)
+    return data.get('data', []) if data else []
+
 
 def fetch_charges(session) -> Tuple[List[dict], Dict[str, dict]]:
     """
@@ -40,8 +62,7 @@ def fetch_charges(session) -> Tuple[List[dict], Dict[str, dict]]:
             - charges_records: Λίστα με όλες τις OTS εγγραφές
             - charges_by_pkm: Dict με {pkm: charge_record} για γρήγορη αναζήτηση
     """
-    charges_data = session.fetch_data(CHARGES_PARAMS)
-    charges_records = charges_data.get('data', []) if charges_data and charges_data.get('success') else []
+    charges_records = _fetch_all_charge_rows(session, CHARGES_PARAMS)
     
     # Δημιουργία mapping από PKM που εξάγουμε από το DESCRIPTION
     charges_by_pkm = {}
@@ -51,7 +72,7 @@ def fetch_charges(session) -> Tuple[List[dict], Dict[str, dict]]:
         
         # Δοκιμή 2: Εξαγωγή από DESCRIPTION (π.χ. "Αίτημα 2026/106653 ....")
         if not pkm:
-            pkm = _extract_pkm_from_description(rec.get('DESCRIPTION', ''))
+            pkm = extract_pkm(rec.get('DESCRIPTION', ''))
         
         if pkm:
             charges_by_pkm[pkm] = rec
@@ -59,25 +80,6 @@ def fetch_charges(session) -> Tuple[List[dict], Dict[str, dict]]:
     return charges_records, charges_by_pkm
 
 
-def _extract_pkm_from_description(description: str) -> Optional[str]:
-    """
-    Εξάγει τον αριθμό ΠΚΜ από το DESCRIPTION
-    
-    Args:
-        description: DESCRIPTION field (π.χ. "Αίτημα 2026/106653 ΚΗΠΟΣ-258403847")
-        
-    Returns:
-        str: Αριθμός ΠΚΜ (π.χ. "106653") ή None
-    """
-    # Decode HTML entities
-    description = html.unescape(description)
-    
-    # Extract PKM: "Αίτημα 2026/106653 ..." -> 106653
-    import re
-    match = re.search(r'Αίτημα\s+\d+/(\d+)', description)
-    return match.group(1) if match else None
-
-
 def get_employee_from_charge(charge: dict) -> Optional[str]:
     """
     Εξάγει το όνομα του υπαλλήλου που χρεώθηκε την υπόθεση
@@ -98,23 +100,16 @@ def get_employee_from_charge(charge: dict) -> Optional[str]:
     return None
 
 
-def fetch_ots_detail_payload(monitor, doc_id: str) -> Optional[dict]:
-    """Fetch OTS detail payload from DataServices for a given doc_id.
-
-    Uses: /services/DataServices/fetchDataTableRecord/2/{doc_id}
-    """
-    if not doc_id:
-        return None
-
+def _fetch_detail_payload_strict(monitor, table_id: int, doc_id: str) -> Optional[dict]:
+    """GET fetchDataTableRecord/{table_id}/{doc_id}· κάνει raise σε σφάλματα δικτύου/HTTP (για retries)."""
     session = getattr(monitor, 'session', None)
     base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
     main_page_url = getattr(monitor, 'main_page_url', '')
 
-    if not session or not base_url:
+    if not doc_id or not session or not base_url:
         return None
 
-    url = base_url.rstrip('/') + f"/services/DataServices/fetchDataTableRecord/2/{doc_id}"
+    url = base_url.rstrip('/') + f"/services/DataServices/fetchDataTableRecord/{table_id}/{doc_id}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:145.0) Gecko/20100101 Firefox/145.0',
         'Accept': '*/*',
@@ -122,27 +117,46 @@ def fetch_ots_detail_payload(monitor, doc_id: str) -> Optional[dict]:
         'X-Requested-With': 'XMLHttpRequest',
         'Referer': main_page_url or base_url,
     }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
 
+    response = get_with_relogin(monitor, url, headers, timeout=15)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_ots_detail_payload(monitor, doc_id: str) -> Optional[dict]:
+    """Fetch OTS detail payload from DataServices for a given doc_id.
+
+    Uses: /services/DataServices/fetchDataTableRecord/2/{doc_id}
+    """
     try:
-        response = session.get(url, headers=headers, timeout=15, verify=False)
-        response.raise_for_status()
-        payload = response.json()
+        payload = _fetch_detail_payload_strict(monitor, 2, doc_id)
     except Exception:
         return None
 
-    if not payload.get('success', False):
+    if not payload or not payload.get('success', False):
         return None
 
     return payload
 
 
+def _employee_from_ots_payload(payload: Optional[dict]) -> Optional[str]:
+    employee = extract_field(payload, 'W001_P_FLD10') if payload and payload.get('success', False) else None
+    return html.unescape(employee).strip() if employee else None
+
+
 def get_employee_from_ots_detail(monitor, doc_id: str) -> Optional[str]:
     """Extract W001_P_FLD10 (employee) from OTS detail payload."""
-    payload = fetch_ots_detail_payload(monitor, doc_id)
-    employee = extract_field(payload, 'W001_P_FLD10') if payload else None
-    return html.unescape(employee).strip() if employee else None
+    return _employee_from_ots_payload(fetch_ots_detail_payload(monitor, doc_id))
+
+
+def _record_pkm(rec: dict) -> str:
+    """PKM εγγραφής: case_id, αλλιώς protocol_number, αλλιώς W007_P_FLD21."""
+    pkm = str(rec.get('case_id', '')).strip()
+    if not pkm:
+        pkm = str(rec.get('protocol_number', '')).strip()
+    if not pkm:
+        pkm = str(rec.get('W007_P_FLD21', '')).strip()
+    return pkm
 
 
 def add_charge_info(incoming_records: List[dict], charges_by_pkm: Dict[str, dict], monitor=None, enrich_missing: bool = False) -> List[dict]:
@@ -159,23 +173,25 @@ def add_charge_info(incoming_records: List[dict], charges_by_pkm: Dict[str, dict
         enrich_missing: Αν True, χρησιμοποιεί API calls για να βρει χρεώσεις που λείπουν
         
     Returns:
-        list: Incoming records εμπλουτισμένα με _charge metadata
+        list: Οι ίδιες incoming records (εμπλουτισμένες in place) με _charge metadata
     """
     enriched = []
     
+    # Batched enrichment (ταυτόχρονα) για όσα δεν βρίσκονται στα charges
+    employees_by_doc = {}
+    if enrich_missing and monitor:
+        employees_by_doc = resolve_charge_employees(monitor, [
+            rec.get('doc_id') for rec in incoming_records
+            if _record_pkm(rec) not in charges_by_pkm
+        ])
+    
     for rec in incoming_records:
-        # Αντιγραφή original record
-        enriched_rec = rec.copy()
+        # Εμπλουτισμός in place (χωρίς αντίγραφο ανά εγγραφή)
+        enriched_rec = rec
         
         # Ανάκτηση PKM - το case_id στα simplified records είναι το W007_P_FLD21 (το PKM)
         # Στόχος: ταίριασμα με OTS εγγραφές που έχουν PKM στο DESCRIPTION
-        pkm = str(rec.get('case_id', '')).strip()
-        if not pkm:
-            # Fallback: protocol_number
-            pkm = str(rec.get('protocol_number', '')).strip()
-        if not pkm:
-            # Fallback: W007_P_FLD21 αν υπάρχει
-            pkm = str(rec.get('W007_P_FLD21', '')).strip()
+        pkm = _record_pkm(rec)
         
         # Προσθήκη charge info αν υπάρχει OTS εγγραφή
         if pkm and pkm in charges_by_pkm:
@@ -191,12 +207,8 @@ def add_charge_info(incoming_records: List[dict], charges_by_pkm: Dict[str, dict
             }
         else:
             # Αν δεν βρέθηκε στα charges, δοκιμή enrichment με API calls
-            employee = None
-            if enrich_missing and monitor:
-                # Χρησιμοποιούμε το doc_id από το record (όχι το pkm/case_id)
-                doc_id = str(rec.get('doc_id', '')).strip()
-                if doc_id:
-                    employee = enrich_charge_with_employee(monitor, doc_id)
+            # Χρησιμοποιούμε το doc_id από το record (όχι το pkm/case_id)
+            employee = employees_by_doc.get(str(rec.get('doc_id', '')).strip())
             
             enriched_rec['_charge'] = {
                 'charged': bool(employee),  # True αν βρέθηκε από enrichment
@@ -317,26 +329,14 @@ def fetch_charges_from_queryid3(session) -> Tuple[List[dict], Dict[str, dict]]:
             - routing_records: Λίστα με όλες τις Routing εγγραφές
             - charges_by_pkm: Dict με {pkm: routing_record} για γρήγορη αναζήτηση
     """
-    params_q3 = {
-        'queryId': '3',
-        'queryOwner': '3',
-        'isCase': 'false',
-        'stateId': 'welcomeGrid-45_dashboard0',
-        'page': '1',
-        'start': '0',
-        'limit': '100',
-        'isPoll': 'true'
-    }
-    
-    routing_data = session.fetch_data(params_q3)
-    routing_records = routing_data.get('data', []) if routing_data and routing_data.get('success') else []
+    routing_records = _fetch_all_charge_rows(session, QUERYID3_PARAMS)
     
     # Δημιουργία mapping από PKM που εξάγουμε από το DESCRIPTION
     charges_by_pkm = {}
     for rec in routing_records:
         # Εξαγωγή PKM από DESCRIPTION (π.χ. "Αίτημα 2026/106129 ...")
         description = rec.get('DESCRIPTION', '')
-        pkm = _extract_pkm_from_description(description)
+        pkm = extract_pkm(description)
         
         if pkm:
             # Χρησιμοποιούμε USER_GROUP_ID_TO ως χρέωση (ο ανατιθέμενος)
@@ -362,26 +362,31 @@ def get_employee_from_queryid3_charge(charge: dict) -> Optional[str]:
     return None
 
 
-def fetch_charges_combined(session) -> Tuple[List[dict], Dict[str, dict]]:
+def _timed(func, session) -> Tuple[List[dict], Dict[str, dict], float]:
+    started = time.monotonic()
+    records, by_pkm = func(session)
+    return records, by_pkm, time.monotonic() - started
+
+
+def fetch_charges_combined_timed(session) -> Tuple[List[dict], Dict[str, dict], Dict[str, float]]:
     """
-    Ανακτά χρεώσεις από ΣΥΝΔΥΑΣΜΟ queryId=2 (OTS) και queryId=3 (Routing)
+    Όπως το fetch_charges_combined, αλλά queryId=2 και queryId=3 ανακτώνται παράλληλα
     
-    Δίνει προτεραιότητα σε queryId=3, fallback σε queryId=2.
-    Συνδυάζει και τις δύο πηγές για καλύτερη κάλυψη.
+    Οι δύο πηγές είναι ανεξάρτητες· κάθε μία σελιδοποιείται επίσης παράλληλα
+    (βλ. fetch_all_pages). Η συγχώνευση κρατά την ίδια προτεραιότητα (queryId=3 > queryId=2).
     
     Args:
         session: PKMSession instance
         
     Returns:
-        tuple: (combined_records, charges_by_pkm)
-            - combined_records: Λίστα με OTS + Routing εγγραφές
-            - charges_by_pkm: Dict με {pkm: record} (προτεραιότητα queryId=3)
+        tuple: (combined_records, charges_by_pkm, timings)
+            - timings: Dict {'queryId=2': seconds, 'queryId=3': seconds}
     """
-    # Ανάκτηση από queryId=2 (OTS)
-    ots_records, ots_by_pkm = fetch_charges(session)
-    
-    # Ανάκτηση από queryId=3 (Routing)
-    routing_records, q3_by_pkm = fetch_charges_from_queryid3(session)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='charges') as pool:
+        ots_future = pool.submit(_timed, fetch_charges, session)
+        routing_future = pool.submit(_timed, fetch_charges_from_queryid3, session)
+        ots_records, ots_by_pkm, ots_seconds = ots_future.result()
+        routing_records, q3_by_pkm, routing_seconds = routing_future.result()
     
     # Συνδυασμός: queryId=3 πρώτα, fallback σε queryId=2
     combined_charges_by_pkm = {}
@@ -390,7 +395,28 @@ def fetch_charges_combined(session) -> Tuple[List[dict], Dict[str, dict]]:
     
     # Λίστα με όλες τις εγγραφές
     combined_records = ots_records + routing_records
+    timings = {'queryId=2': ots_seconds, 'queryId=3': routing_seconds}
+    
+    return combined_records, combined_charges_by_pkm, timings
+
+
+def fetch_charges_combined(session) -> Tuple[List[dict], Dict[str, dict]]:
+    """
+    Ανακτά χρεώσεις από ΣΥΝΔΥΑΣΜΟ queryId=2 (OTS) και queryId=3 (Routing)
+    
+    Δίνει προτεραιότητα σε queryId=3, fallback σε queryId=2.
+    Συνδυάζει και τις δύο πηγές για καλύτερη κάλυψη. Οι δύο πηγές
+    ανακτώνται παράλληλα (βλ. fetch_charges_combined_timed).
     
+    Args:
+        session: PKMSession instance
+        
+    Returns:
+        tuple: (combined_records, charges_by_pkm)
+            - combined_records: Λίστα με OTS + Routing εγγραφές
+            - charges_by_pkm: Dict με {pkm: record} (προτεραιότητα queryId=3)
+    """
+    combined_records, combined_charges_by_pkm, _ = fetch_charges_combined_timed(session)
     return combined_records, combined_charges_by_pkm
 
 
@@ -409,19 +435,24 @@ def add_charge_info_from_combined(incoming_records: List[dict], charges_by_pkm:
         enrich_missing: Αν True, χρησιμοποιεί API calls για να βρει χρεώσεις που λείπουν
         
     Returns:
-        list: Enriched incoming records με _charge metadata
+        list: Οι ίδιες incoming records (εμπλουτισμένες in place) με _charge metadata
     """
     enriched = []
     
+    # Batched enrichment (ταυτόχρονα): εγγραφές χωρίς χρέωση ή χωρίς employee στη χρέωση
+    employees_by_doc = {}
+    if enrich_missing and monitor:
+        employees_by_doc = resolve_charge_employees(monitor, [
+            rec.get('doc_id') for rec in incoming_records
+            if not get_employee_from_charge(charges_by_pkm.get(_record_pkm(rec)) or {})
+        ])
+    
     for rec in incoming_records:
-        enriched_rec = rec.copy()
+        # Εμπλουτισμός in place (χωρίς αντίγραφο ανά εγγραφή)
+        enriched_rec = rec
         
         # Ανάκτηση PKM
-        pkm = str(rec.get('case_id', '')).strip()
-        if not pkm:
-            pkm = str(rec.get('protocol_number', '')).strip()
-        if not pkm:
-            pkm = str(rec.get('W007_P_FLD21', '')).strip()
+        pkm = _record_pkm(rec)
         
         # Προσθήκη charge info
         if pkm and pkm in charges_by_pkm:
@@ -430,11 +461,9 @@ def add_charge_info_from_combined(incoming_records: List[dict], charges_by_pkm:
             # Χρησιμοποιούμε ΜΟΝΟ W001_P_FLD10 (employee name), ΟΧΙ USER_GROUP_ID_TO (department/team)
             employee = get_employee_from_charge(charge)
             
-            # Αν δεν υπάρχει employee, δοκιμή enrichment
-            if not employee and enrich_missing and monitor:
-                doc_id = str(enriched_rec.get('doc_id', '')).strip()
-                if doc_id:
-                    employee = enrich_charge_with_employee(monitor, doc_id)
+            # Αν δεν υπάρχει employee, αποτέλεσμα από το batched enrichment
+            if not employee:
+                employee = employees_by_doc.get(str(enriched_rec.get('doc_id', '')).strip())
             
             enriched_rec['_charge'] = {
                 'charged': bool(employee),
@@ -446,12 +475,8 @@ def add_charge_info_from_combined(incoming_records: List[dict], charges_by_pkm:
             }
         else:
             # Αν δεν βρέθηκε στα charges, δοκιμή enrichment με API calls
-            employee = None
-            if enrich_missing and monitor:
-                # Χρησιμοποιούμε το doc_id από το record (όχι το pkm/case_id)
-                doc_id = str(enriched_rec.get('doc_id', '')).strip()
-                if doc_id:
-                    employee = enrich_charge_with_employee(monitor, doc_id)
+            # Χρησιμοποιούμε το doc_id από το record (όχι το pkm/case_id)
+            employee = employees_by_doc.get(str(enriched_rec.get('doc_id', '')).strip())
             
             enriched_rec['_charge'] = {
                 'charged': bool(employee),  # True αν βρέθηκε από enrichment
@@ -506,36 +531,15 @@ def fetch_case_detail_payload(monitor, doc_id: str) -> Optional[dict]:
     Returns:
         dict: API response payload or None
     """
-    if not doc_id:
-        return None
-
-    session = getattr(monitor, 'session', None)
-    base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
-    main_page_url = getattr(monitor, 'main_page_url', '')
-
-    if not session or not base_url:
-        return None
-
-    url = base_url.rstrip('/') + f"/services/DataServices/fetchDataTableRecord/7/{doc_id}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:145.0) Gecko/20100101 Firefox/145.0',
-        'Accept': '*/*',
-        'Accept-Language': 'el',
-        'X-Requested-With': 'XMLHttpRequest',
-        'Referer': main_page_url or base_url,
-    }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
-
     try:
-        response = session.get(url, headers=headers, timeout=15, verify=False)
-        response.raise_for_status()
-        payload = response.json()
+        payload = _fetch_detail_payload_strict(monitor, 7, doc_id)
     except Exception as exc:
         print(f"[DEBUG] Failed to fetch case detail for doc_id {doc_id}: {exc}")
         return None
 
+    if payload is None:
+        return None
+
     if not payload.get('success', False):
         print(f"[DEBUG] API returned success=false for doc_id {doc_id}: {payload.get('message', 'No message')}")
         return None
@@ -604,3 +608,51 @@ def enrich_charge_with_employee(monitor, doc_id: str) -> Optional[str]:
     employee = get_employee_from_ots_detail(monitor, charge_doc_id)
     return employee
 
+
+def resolve_charge_employees(monitor, doc_ids: List[str], max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """Batched, ταυτόχρονη εκδοχή του enrich_charge_with_employee για πολλά DOCID.
+    
+    Τα δύο βήματα γίνονται pipeline στο ίδιο bounded pool: μόλις ολοκληρωθεί το
+    βήμα 1 (/7) για ένα DOCID ξεκινά το βήμα 2 (/2) για το charge DOCID του. Κάθε
+    charge DOCID ζητείται μία φορά, ακόμη κι αν το μοιράζονται πολλές εγγραφές.
+    Rate limit ανά host και retries όπως στο concurrency.run_concurrently.
+    
+    Args:
+        monitor: PKMMonitor instance
+        doc_ids: DOCID εισερχόμενων αιτήσεων
+        max_workers: Μέγεθος pool (default: `enrichment_workers`)
+        
+    Returns:
+        dict: {doc_id: employee ή None}
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrency import default_workers, get_host_limiter, retrying
+    
+    doc_ids = list(dict.fromkeys(str(d).strip() for d in doc_ids if str(d or '').strip()))
+    if not doc_ids:
+        return {}
+    
+    limiter = get_host_limiter(getattr(monitor, 'base_url', ''))
+    step1 = retrying(
+        lambda doc_id: get_doc_id_from_w007_p_fld7(_fetch_detail_payload_strict(monitor, 7, doc_id)),
+        limiter=limiter,
+        on_error=lambda doc_id, exc: print(f"[DEBUG] Failed to fetch case detail for doc_id {doc_id}: {exc}"),
+    )
+    step2 = retrying(
+        lambda charge_doc_id: _employee_from_ots_payload(_fetch_detail_payload_strict(monitor, 2, charge_doc_id)),
+        limiter=limiter,
+    )
+    
+    workers = max(1, int(max_workers or default_workers()))
+    charge_of = {}
+    employee_futures = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='charge-resolve') as pool:
+        step1_futures = {pool.submit(step1, doc_id): doc_id for doc_id in doc_ids}
+        for future in as_completed(step1_futures):
+            charge_doc_id = future.result()
+            charge_of[step1_futures[future]] = charge_doc_id
+            if charge_doc_id and charge_doc_id not in employee_futures:
+                employee_futures[charge_doc_id] = pool.submit(step2, charge_doc_id)
+        employees = {charge_doc_id: f.result() for charge_doc_id, f in employee_futures.items()}
+    
+    return {doc_id: employees.get(charge_of.get(doc_id)) for doc_id in doc_ids}
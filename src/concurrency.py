@@ -0,0 +1,146 @@
+"""Engine για ταυτόχρονα per-record requests προς το portal.
+
+- Bounded thread pool (τα requests μοιράζονται το keep-alive pool του PKMSession)
+- Rate limit ανά host (token bucket), κοινό για όλα τα threads του process
+- Retries με exponential backoff + jitter για transient σφάλματα
+- Progress reporting ανά ~10% των εργασιών
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from utils import get_settings
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE_LIMIT = 20.0  # requests/second ανά host
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5  # seconds, διπλασιάζεται σε κάθε retry
+
+
+class RateLimiter:
+    """Token bucket: έως `rate` requests/second με burst έως `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(url):
+    """Κοινός RateLimiter για το host του `url` (ρυθμός από `portal_rate_limit`)."""
+    host = urlparse(url).netloc or url
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            rate = get_settings().get('portal_rate_limit', DEFAULT_RATE_LIMIT)
+            limiter = _limiters[host] = RateLimiter(rate)
+        return limiter
+
+
+def is_retryable(exc):
+    """Connection/timeout σφάλματα, 429 και 5xx ξαναδοκιμάζονται· τα υπόλοιπα όχι."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def retrying(func, limiter=None, retries=None, backoff=None, on_error=None):
+    """Τυλίγει το `func(item)` με rate limit και retries (βλ. is_retryable).
+
+    Το wrapper επιστρέφει None όταν εξαντληθούν οι προσπάθειες (αφού καλέσει το on_error).
+    """
+    if retries is None:
+        retries = get_settings().get('enrichment_retries', DEFAULT_RETRIES)
+    if backoff is None:
+        backoff = DEFAULT_BACKOFF
+
+    def attempt(item):
+        for n in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return func(item)
+            except Exception as exc:
+                if n >= retries or not is_retryable(exc):
+                    if on_error:
+                        on_error(item, exc)
+                    return None
+                time.sleep(backoff * (2 ** n) * (1 + random.random() * 0.25))
+        return None
+
+    return attempt
+
+
+def default_workers():
+    return get_settings().get('enrichment_workers', DEFAULT_WORKERS)
+
+
+def run_concurrently(func, items, max_workers=None, limiter=None, retries=None, backoff=None,
+                     label=None, on_error=None):
+    """Εκτελεί `func(item)` για κάθε item ταυτόχρονα και επιστρέφει τα αποτελέσματα με τη σειρά των items.
+
+    Args:
+        func: Καλείται ανά item· transient σφάλματα (βλ. is_retryable) ξαναδοκιμάζονται
+        items: Λίστα εργασιών
+        max_workers: Μέγεθος pool (default: `enrichment_workers` ή 8)
+        limiter: RateLimiter που καλείται πριν από κάθε προσπάθεια
+        retries: Επιπλέον προσπάθειες ανά item (default: `enrichment_retries` ή 2)
+        backoff: Αρχική αναμονή retry σε δευτερόλεπτα
+        label: Κείμενο για progress μηνύματα (χωρίς label δεν τυπώνεται progress)
+        on_error: Callback(item, exc) όταν εξαντληθούν οι προσπάθειες
+
+    Returns:
+        list: Αποτέλεσμα ανά item (None όπου απέτυχε)
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers is None:
+        max_workers = default_workers()
+    attempt = retrying(func, limiter=limiter, retries=retries, backoff=backoff, on_error=on_error)
+
+    total = len(items)
+    step = max(1, total // 10)
+    done = [0]
+    progress_lock = threading.Lock()
+    started = time.monotonic()
+
+    def task(item):
+        try:
+            return attempt(item)
+        finally:
+            if label:
+                with progress_lock:
+                    done[0] += 1
+                    if done[0] % step == 0 or done[0] == total:
+                        elapsed = time.monotonic() - started
+                        print(f"  🔄 {label}: {done[0]}/{total} ({elapsed:.1f}s)")
+
+    workers = max(1, min(int(max_workers), total))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='portal-enrich') as pool:
+        return list(pool.map(task, items))
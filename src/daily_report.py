@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from monitor import PKMMonitor
+from session_manager import get_shared_monitor
 from utils import load_config
 from config import get_project_root, INCOMING_DEFAULT_PARAMS
 from baseline import (
@@ -21,6 +22,8 @@ from incoming import (
     load_incoming_snapshot,
     save_incoming_snapshot,
     fetch_incoming_records,
+    incoming_watermark,
+    use_incremental_fetch,
     compare_incoming_records,
     merge_with_previous_snapshot,
 )
@@ -34,10 +37,8 @@ load_dotenv()
 
 def _ensure_logged_in(monitor: PKMMonitor):
     """Κάνει login και φορτώνει αρχική σελίδα αν χρειάζεται"""
-    if not monitor.logged_in and not monitor.login():
+    if not monitor.ensure_logged_in():
         raise RuntimeError("Αποτυχία login")
-    if not monitor.main_page_loaded:
-        monitor.load_main_page()
 
 
 def _fetch_procedures(monitor: PKMMonitor):
@@ -53,7 +54,14 @@ def _fetch_procedures(monitor: PKMMonitor):
 def _prepare_incoming(monitor: PKMMonitor, config: dict):
     """Φέρνει εισερχόμενες αιτήσεις, συγκρίνει με προηγούμενο snapshot και αποθηκεύει το σημερινό."""
     incoming_params = config.get("incoming_api_params", INCOMING_DEFAULT_PARAMS).copy()
-    data = fetch_incoming_records(monitor, incoming_params)
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # Incremental: φέρνουμε μόνο όσα είναι νεότερα από το προηγούμενο snapshot
+    prev_date, prev_snap = (None, None)
+    if not os.getenv("INCOMING_FORCE_BASELINE_DATE"):
+        prev_date, prev_snap = load_previous_incoming_snapshot(today)
+    since = incoming_watermark(prev_snap) if use_incremental_fetch() else None
+    data = fetch_incoming_records(monitor, incoming_params, since=since)
     if not data or not data.get("success"):
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
@@ -65,24 +73,17 @@ def _prepare_incoming(monitor: PKMMonitor, config: dict):
             "stats": {"total": 0, "real": 0, "test": 0, "test_breakdown": {}},
         }
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    
     # Έλεγχος αν υπάρχει forced baseline ημερομηνία στο .env
     force_baseline_date = os.getenv("INCOMING_FORCE_BASELINE_DATE")
-    prev_date = None  # Ορισμός default
     
     if force_baseline_date:
         # Χρησιμοποίησε ΜΟΝΟ το snapshot της forced ημερομηνίας (όχι ενδιάμεσες)
         print(f"ℹ️  Χρήση αναγκαστικής ημερομηνίας snapshot: {force_baseline_date}")
 
-        # Ανάκτηση όλων των διαθέσιμων incoming dates
-        from incoming import get_all_incoming_dates, load_incoming_snapshot
-        all_dates = sorted(get_all_incoming_dates())
-
-        # Βρες το index της forced ημερομηνίας
-        try:
-            start_idx = all_dates.index(force_baseline_date)
-        except ValueError:
+        # Προηγούμενη/επόμενη ημερομηνία από το index των snapshots
+        from incoming import get_adjacent_incoming_dates, load_incoming_snapshot
+        forced_snap = load_incoming_snapshot(force_baseline_date)
+        if forced_snap is None:
             print(f"⚠️  Δεν βρέθηκε snapshot για {force_baseline_date}")
             return {
                 "date": today,
@@ -95,21 +96,20 @@ def _prepare_incoming(monitor: PKMMonitor, config: dict):
             }
 
         # Υπολόγισε μόνο το όριο range (για ενημέρωση), χωρίς φόρτωση ενδιάμεσων
-        if start_idx + 1 < len(all_dates):
-            end_date = all_dates[start_idx + 1]
+        prev_date, next_date = get_adjacent_incoming_dates(force_baseline_date)
+        if next_date:
+            end_date = next_date
             print(f"📅 Range: {force_baseline_date} μέχρι {end_date} (αποκλειστικά)")
         else:
             end_date = today
             print(f"📅 Range: {force_baseline_date} μέχρι {end_date} (σήμερα)")
 
         # Φόρτωσε μόνο το forced snapshot
-        forced_snap = load_incoming_snapshot(force_baseline_date)
         records = forced_snap.get('records', []) if forced_snap else []
         today = force_baseline_date  # Το date είναι το snapshot που εξετάζουμε
 
         # Χρησιμοποίησε το snapshot πριν το forced date ως baseline
-        if start_idx > 0:
-            prev_date = all_dates[start_idx - 1]
+        if prev_date:
             prev_snap = load_incoming_snapshot(prev_date)
             has_prev = prev_snap is not None
         else:
@@ -119,8 +119,7 @@ def _prepare_incoming(monitor: PKMMonitor, config: dict):
         # Κανονική ροή: φέρε δεδομένα από API
         records = simplify_incoming_records(data.get("data", []))
         
-        # Ψάχνουμε προηγούμενο snapshot
-        prev_date, prev_snap = load_previous_incoming_snapshot(today)
+        # Προηγούμενο snapshot (φορτώθηκε πριν το fetch για το watermark)
         has_prev = prev_snap is not None
 
         # Αν δεν υπάρχει προηγούμενο snapshot, ψάχνουμε fallback ημερομηνία από .env
@@ -189,16 +188,7 @@ def build_daily_digest(config_path: str | None = None, target_date: str | None =
         os.environ['INCOMING_FORCE_BASELINE_DATE'] = target_date
         print(f"📅 Ημερομηνία δοκιμής: {target_date}")
 
-    monitor = PKMMonitor(
-        base_url=config.get("base_url", "https://shde.pkm.gov.gr"),
-        urls=config.get("urls", {}),
-        api_params=config.get("api_params", {}),
-        login_params=config.get("login_params", {}),
-        check_interval=config.get("check_interval", 300),
-        username=config.get("username"),
-        password=config.get("password"),
-        session_cookies=config.get("session_cookies"),
-    )
+    monitor = get_shared_monitor(cfg_path, config)
 
     _ensure_logged_in(monitor)
     all_procs, active_procs = _fetch_procedures(monitor)
@@ -0,0 +1,90 @@
+"""Ταξινομημένος κατάλογος ημερομηνιών snapshot ενός φακέλου, χωρίς os.listdir σε κάθε κλήση.
+
+Ο φάκελος σαρώνεται μόνο όταν αλλάξει το mtime του (νέο/διαγραμμένο αρχείο, και από
+άλλο process). Οι αναζητήσεις "προηγούμενη/επόμενη ημερομηνία" γίνονται με bisect σε
+O(log n). Οι αποθηκεύσεις του ίδιου process ενημερώνουν το index με `add` (η αλλαγή
+mtime του φακέλου εξασφαλίζει ότι φαίνονται και όσα έγραψαν άλλα processes).
+"""
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class SnapshotDateIndex:
+    """Index ημερομηνιών για αρχεία `<prefix>YYYY-MM-DD<suffix>` (π.χ. incoming_2026-02-01.json)."""
+
+    def __init__(self, directory, prefix, suffixes=('.json',)):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffixes = tuple(suffixes)
+        self._dates = []
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _parse(self, filename):
+        if not filename.startswith(self.prefix):
+            return None
+        for suffix in self.suffixes:
+            if filename.endswith(suffix):
+                try:
+                    return _as_date(filename[len(self.prefix):-len(suffix)])
+                except ValueError:
+                    return None
+        return None
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            self._dates, self._mtime = [], None
+            return
+        if mtime == self._mtime:
+            return
+        found = {self._parse(name) for name in os.listdir(self.directory)}
+        found.discard(None)
+        self._dates = sorted(found)
+        self._mtime = mtime
+
+    def dates(self):
+        with self._lock:
+            self._refresh()
+            return list(self._dates)
+
+    def __contains__(self, value):
+        value = _as_date(value)
+        with self._lock:
+            self._refresh()
+            i = bisect_left(self._dates, value)
+            return i < len(self._dates) and self._dates[i] == value
+
+    def previous(self, value):
+        """Η νεότερη ημερομηνία αυστηρά πριν από `value` (ή None)."""
+        value = _as_date(value)
+        with self._lock:
+            self._refresh()
+            i = bisect_left(self._dates, value)
+            return self._dates[i - 1] if i > 0 else None
+
+    def next(self, value):
+        """Η παλαιότερη ημερομηνία αυστηρά μετά από `value` (ή None)."""
+        value = _as_date(value)
+        with self._lock:
+            self._refresh()
+            i = bisect_right(self._dates, value)
+            return self._dates[i] if i < len(self._dates) else None
+
+    def add(self, value):
+        """Καταχωρεί ημερομηνία που μόλις αποθηκεύτηκε από αυτό το process."""
+        value = _as_date(value)
+        with self._lock:
+            self._refresh()
+            i = bisect_left(self._dates, value)
+            if i == len(self._dates) or self._dates[i] != value:
+                insort(self._dates, value)
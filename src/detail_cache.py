@@ -0,0 +1,49 @@
+"""Persistent cache λεπτομερειών εγγραφής (fetchDataTableRecord/7) ανά DOCID.
+
+Αποθηκεύει το 8-tuple του `api.fetch_record_details` με χρόνο ανάκτησης:
+- επιτυχημένες ανακτήσεις ισχύουν για `detail_cache_ttl` (default 7 ημέρες)
+- αποτυχίες / κενές απαντήσεις για `detail_cache_negative_ttl` (default 6 ώρες),
+  ώστε να μην ξαναζητούνται σε κάθε run αλλά να επανελέγχονται σύντομα
+"""
+import time
+
+from kv_store import get_kv_store
+from utils import get_settings
+
+NAMESPACE = 'record_details'
+DEFAULT_DETAIL_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_NEGATIVE_TTL = 6 * 3600  # seconds
+
+
+def _ttls():
+    settings = get_settings()
+    return (settings.get('detail_cache_ttl', DEFAULT_DETAIL_TTL),
+            settings.get('detail_cache_negative_ttl', DEFAULT_NEGATIVE_TTL))
+
+
+def is_enabled():
+    return bool(get_settings().get('detail_cache_enabled', True))
+
+
+def get_cached_details(doc_ids, store=None):
+    """Επιστρέφει {doc_id: 8-tuple} για τα DOCID με φρέσκια εγγραφή στο cache.
+
+    Για αρνητικές εγγραφές (αποτυχία ανάκτησης) το tuple έχει μόνο None.
+    """
+    store = store or get_kv_store()
+    ttl, negative_ttl = _ttls()
+    now = time.time()
+    fresh = {}
+    for doc_id, (value, ok, fetched_at) in store.get_many(NAMESPACE, doc_ids).items():
+        if now - fetched_at < (ttl if ok else negative_ttl):
+            fresh[doc_id] = tuple(value) if value else (None,) * 8
+    return fresh
+
+
+def store_details(results, store=None):
+    """Αποθηκεύει {doc_id: 8-tuple ή None}· όσα δεν έχουν protocol_number θεωρούνται αποτυχία."""
+    store = store or get_kv_store()
+    store.put_many(NAMESPACE, (
+        (doc_id, list(result) if result else None, bool(result and result[0] is not None))
+        for doc_id, result in results.items()
+    ))
@@ -20,9 +20,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from incoming import load_incoming_snapshot, load_previous_incoming_snapshot, compare_incoming_records
 from test_users import classify_records
 from email_notifier import EmailNotifier
-from utils import load_config
 from config import get_project_root
 from monitor import PKMMonitor
+from session import get_with_relogin
+from session_manager import get_shared_monitor
 from directories_manager import get_directories_manager, find_email_for_request, find_email_for_directory
 
 
@@ -100,7 +101,6 @@ def _get_attachment_list(monitor: PKMMonitor, doc_id: str) -> List[Dict]:
     """
     session = getattr(monitor, 'session', None)
     base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
     main_page_url = getattr(monitor, 'main_page_url', '')
     
     if not session or not base_url or not doc_id:
@@ -114,11 +114,9 @@ def _get_attachment_list(monitor: PKMMonitor, doc_id: str) -> List[Dict]:
         'X-Requested-With': 'XMLHttpRequest',
         'Referer': main_page_url or base_url,
     }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
     
     try:
-        response = session.get(url, headers=headers, timeout=15, verify=False)
+        response = get_with_relogin(monitor, url, headers, timeout=15)
         response.raise_for_status()
         payload = response.json()
         
@@ -143,7 +141,6 @@ def _download_single_document(monitor: PKMMonitor, doc_id: str, output_path: str
     """
     session = getattr(monitor, 'session', None)
     base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
     main_page_url = getattr(monitor, 'main_page_url', '')
     
     if not session or not base_url:
@@ -156,11 +153,9 @@ def _download_single_document(monitor: PKMMonitor, doc_id: str, output_path: str
         'Accept-Language': 'el',
         'Referer': main_page_url or base_url,
     }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
     
     try:
-        response = session.get(url, headers=headers, timeout=30, verify=False, stream=True)
+        response = get_with_relogin(monitor, url, headers, timeout=30, stream=True)
         response.raise_for_status()
         
         # Εξαγωγή filename από Content-Disposition header
@@ -190,7 +185,6 @@ def _download_bulk_documents(monitor: PKMMonitor, doc_ids: List[str], output_pat
     """
     session = getattr(monitor, 'session', None)
     base_url = getattr(monitor, 'base_url', '')
-    jwt_token = getattr(monitor, 'jwt_token', None)
     main_page_url = getattr(monitor, 'main_page_url', '')
     
     if not session or not base_url or not doc_ids:
@@ -204,11 +198,9 @@ def _download_bulk_documents(monitor: PKMMonitor, doc_ids: List[str], output_pat
         'Accept-Language': 'el',
         'Referer': main_page_url or base_url,
     }
-    if jwt_token:
-        headers['Authorization'] = f'Bearer {jwt_token}'
     
     try:
-        response = session.get(url, headers=headers, timeout=60, verify=False, stream=True)
+        response = get_with_relogin(monitor, url, headers, timeout=60, stream=True)
         response.raise_for_status()
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -644,18 +636,8 @@ def send_directory_emails(send_to_chat: bool = False, config_path: str | None =
             if config_path is None:
                 config_path = os.path.join(get_project_root(), 'config', 'config.yaml')
             
-            config = load_config(config_path)
-            monitor = PKMMonitor(
-                base_url=config.get("base_url", "https://shde.pkm.gov.gr"),
-                urls=config.get("urls", {}),
-                api_params=config.get("api_params", {}),
-                login_params=config.get("login_params", {}),
-                check_interval=config.get("check_interval", 300),
-                username=config.get("username"),
-                password=config.get("password"),
-                session_cookies=config.get("session_cookies"),
-            )
-            if monitor.login():
+            monitor = get_shared_monitor(config_path)
+            if monitor.ensure_logged_in():
                 print("✅ Σύνδεση επιτυχής για download attachments")
             else:
                 print("⚠️  Αποτυχία σύνδεσης - τα attachments δεν θα κατέβουν")
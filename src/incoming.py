@@ -1,91 +1,111 @@
 """Διαχείριση εισερχόμενων αιτήσεων"""
 import os
-import json
 import sys
-from datetime import datetime
-from config import get_incoming_snapshot_path, get_project_root, INCOMING_DEFAULT_PARAMS
+from config import get_project_root, INCOMING_DEFAULT_PARAMS
 from api import sanitize_party_name
+from case_codes import extract_case_code, incoming_case_code
+from incoming_record import IncomingRecord
+from pagination import fetch_all_pages, fetch_pages_since
+from snapshot_store import get_snapshot_backend
+from snapshot_stats import save_snapshot_stats
+from utils import get_settings
 
 # Enable imports from root for test_users
 sys.path.insert(0, get_project_root())
 
 def load_incoming_snapshot(date_str):
     """Φορτώνει snapshot για συγκεκριμένη ημερομηνία"""
-    path = get_incoming_snapshot_path(date_str)
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return None
+    return get_snapshot_backend().load(date_str)
 
 def save_incoming_snapshot(date_str, records):
-    """Αποθηκεύει snapshot"""
-    payload = {'date': date_str, 'count': len(records), 'records': records}
-    with open(get_incoming_snapshot_path(date_str), 'w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    """Αποθηκεύει snapshot και τα στατιστικά του (βλ. snapshot_stats)"""
+    get_snapshot_backend().save(date_str, records)
+    try:
+        save_snapshot_stats(date_str, records)
+    except Exception as e:
+        print(f"[WARNING] Αποτυχία αποθήκευσης στατιστικών snapshot {date_str}: {e}")
 
 def list_incoming_snapshot_dates():
     """Επιστρέφει λίστα ημερομηνιών με snapshots"""
-    incoming_dir = os.path.join(get_project_root(), 'data', 'incoming_requests')
-    if not os.path.exists(incoming_dir):
-        return []
-    dates = []
-    for filename in os.listdir(incoming_dir):
-        if filename.startswith('incoming_') and filename.endswith('.json'):
-            date_part = filename[len('incoming_'):-5]
-            try:
-                dates.append(datetime.strptime(date_part, "%Y-%m-%d").date())
-            except ValueError:
-                continue
-    return sorted(dates)
+    return get_snapshot_backend().dates()
+
+def query_incoming_records(start_date=None, end_date=None, **filters):
+    """Εγγραφές (date_str, record) από τα snapshots ενός διαστήματος ημερομηνιών.
+
+    Φίλτρα: case_id, doc_id, directory (ακριβής τιμή) και submitted_from/submitted_to.
+    Με το sqlite backend γίνεται indexed query χωρίς φόρτωση ολόκληρων ημερών.
+    """
+    return get_snapshot_backend().iter_records(start_date, end_date, **filters)
 
 def get_all_incoming_dates():
     """Επιστρέφει λίστα ημερομηνιών με snapshots ως strings (YYYY-MM-DD)"""
     dates = list_incoming_snapshot_dates()
     return [d.strftime("%Y-%m-%d") for d in dates]
 
+def get_adjacent_incoming_dates(date_str):
+    """(προηγούμενη, επόμενη) ημερομηνία με snapshot γύρω από το `date_str` (O(log n))"""
+    backend = get_snapshot_backend()
+    return backend.previous_date(date_str), backend.next_date(date_str)
+
 def load_previous_incoming_snapshot(current_date_str):
     """Φορτώνει το προηγούμενο snapshot"""
-    current_date = datetime.strptime(current_date_str, "%Y-%m-%d").date()
-    for snapshot_date in reversed(list_incoming_snapshot_dates()):
-        if snapshot_date < current_date:
-            snapshot_str = snapshot_date.strftime("%Y-%m-%d")
-            return snapshot_str, load_incoming_snapshot(snapshot_str)
-    return None, None
-
-def fetch_incoming_records(monitor, incoming_params):
-    """Ανακτά εισερχόμενες αιτήσεις με pagination αν χρειάζεται"""
-    params = incoming_params.copy()
-    original_params = monitor.api_params.copy()
-    all_records = []
-    
-    try:
-        # Πρώτο request
-        monitor.api_params = params
-        data = monitor.fetch_page()
-        
-        if not data or not data.get('success'):
-            return None
-        
-        all_records.extend(data.get('data', []))
-        total = data.get('total', len(all_records))
-        
-        # Pagination αν υπάρχουν περισσότερες εγγραφές
-        limit = params.get('limit', 200)
-        while len(all_records) < total:
-            params['start'] = len(all_records)
-            monitor.api_params = params
-            data = monitor.fetch_page()
-            if not data or not data.get('success'):
-                break
-            new_records = data.get('data', [])
-            if not new_records:
-                break
-            all_records.extend(new_records)
-            print(f"  📥 Ανακτήθηκαν {len(all_records)}/{total} εγγραφές...")
-        
-        return {'success': True, 'data': all_records, 'total': total}
-    finally:
-        monitor.api_params = original_params
+    snapshot_str = get_snapshot_backend().previous_date(current_date_str)
+    if snapshot_str is None:
+        return None, None
+    return snapshot_str, load_incoming_snapshot(snapshot_str)
+
+# Πεδίο ταξινόμησης για incremental fetch (νεότερες πρώτα)
+INCOMING_SORT_FIELD = 'DATE_INSERTED_ISO'
+
+
+def _raw_submitted_at(rec):
+    return (rec.get('DATE_INSERTED_ISO') or rec.get('W003_DATA_INSERT') or
+            rec.get('DATE_INSERT') or rec.get('SUBMIT_DATE') or '')
+
+
+def incoming_watermark(snapshot):
+    """Το νεότερο submitted_at ενός snapshot (σημείο εκκίνησης incremental fetch) ή None."""
+    if not snapshot:
+        return None
+    values = [r.get('submitted_at') for r in snapshot.get('records', []) if r.get('submitted_at')]
+    return max(values) if values else None
+
+
+def use_incremental_fetch(full_resync=False):
+    """True αν επιτρέπεται incremental fetch.
+
+    Απενεργοποιείται με `incoming_incremental_fetch: false`, με INCOMING_FULL_RESYNC=1
+    (ή `main.py --full-resync`) ή με full_resync=True (π.χ. reload του digest).
+    """
+    if full_resync or os.getenv('INCOMING_FULL_RESYNC', '').strip().lower() in ('1', 'true', 'yes'):
+        return False
+    return bool(get_settings().get('incoming_incremental_fetch', True))
+
+
+def _fetch_incoming_since(monitor, incoming_params, since):
+    """Σελίδες ταξινομημένες νεότερες-πρώτα, μέχρι την πρώτη εγγραφή παλαιότερη του `since`.
+
+    Επιστρέφει None αν το portal δεν σεβαστεί την ταξινόμηση (ή αποτύχει request),
+    ώστε ο caller να κάνει πλήρη ανάκτηση.
+    """
+    return fetch_pages_since(monitor, incoming_params, INCOMING_SORT_FIELD, _raw_submitted_at, since)
+
+
+def fetch_incoming_records(monitor, incoming_params, since=None):
+    """Ανακτά εισερχόμενες αιτήσεις με pagination αν χρειάζεται (παράλληλα ανά σελίδα)
+
+    Με `since` (watermark submitted_at) φέρνει μόνο τις εγγραφές από το watermark και
+    μετά· οι παλαιότερες προέρχονται από το προηγούμενο snapshot (merge_with_previous_snapshot).
+    """
+    if since:
+        data = _fetch_incoming_since(monitor, incoming_params, since)
+        if data is not None:
+            print(f"  📥 Incremental ανάκτηση: {len(data['data'])} εγγραφές από {since} (σύνολο portal: {data['total']})")
+            return data
+        print("[WARNING] Αποτυχία incremental ανάκτησης (μη ταξινομημένες σελίδες) - πλήρης ανάκτηση")
+    return fetch_all_pages(
+        monitor, incoming_params,
+        progress=lambda done, total: print(f"  📥 Ανακτήθηκαν {done}/{total} εγγραφές..."))
 
 def simplify_incoming_records(records):
     """Απλοποιεί τις εγγραφές από το API"""
@@ -104,8 +124,7 @@ def simplify_incoming_records(records):
         
         # Καταμέτρηση όλων των case_id
         case_id_counter[case_id] += 1
-        submitted_at = (rec.get('DATE_INSERTED_ISO') or rec.get('W003_DATA_INSERT') or
-                       rec.get('DATE_INSERT') or rec.get('SUBMIT_DATE') or '')
+        submitted_at = _raw_submitted_at(rec)
         party_raw = (rec.get('W007_P_FLD13') or rec.get('party') or
                     rec.get('customer') or rec.get('applicant') or '')
         doc_id = str(rec.get('DOCID') or rec.get('docid') or '').strip()
@@ -142,15 +161,18 @@ def simplify_incoming_records(records):
         # Συσχέτιση με αρχική υπόθεση (για συμπληρωματικά αιτήματα) - W007_P_FLD7
         related_case = str(rec.get('W007_P_FLD7', '') or '').strip()
         
-        simplified.append({
-            'case_id': case_id, 'submitted_at': submitted_at,
-            'party': sanitize_party_name(party_raw), 'doc_id': doc_id,
-            'protocol_number': protocol_number, 'protocol_date': protocol_date,
-            'procedure': procedure or '', 'directory': directory or '',
-            'general_directorate': general_directorate or '', 'department': department or '',
-            'document_category': doc_category, 'subject': subject,
-            'submission_year': submission_year, 'related_case': related_case
-        })
+        simplified.append(IncomingRecord(
+            case_id=case_id, submitted_at=submitted_at,
+            party=sanitize_party_name(party_raw), doc_id=doc_id,
+            protocol_number=protocol_number, protocol_date=protocol_date,
+            procedure=procedure or '', directory=directory or '',
+            general_directorate=general_directorate or '', department=department or '',
+            document_category=doc_category, subject=subject,
+            submission_year=submission_year, related_case=related_case,
+            # Κωδικοί υπόθεσης (μορφή W001_P_FLD2) για συσχέτιση χωρίς νέο parsing
+            case_code=incoming_case_code(submission_year, case_id),
+            related_case_code=extract_case_code(related_case) or '',
+        ))
     
     # Εμφάνιση πληροφοριών για case_id με πολλαπλές εγγραφές
     duplicates = {cid: count for cid, count in case_id_counter.items() if count > 1}
@@ -241,7 +263,7 @@ def merge_with_previous_snapshot(current_records, previous_snapshot):
     for key, prev_rec in prev_dict.items():
         if key not in current_dict:
             # Κρατάμε την παλιά εγγραφή (δεν είναι "αφαιρεμένη", απλά δεν επιστράφηκε)
-            current_dict[key] = prev_rec
+            current_dict[key] = IncomingRecord.from_dict(prev_rec)
     
     # Επιστροφή ως λίστα, ταξινομημένη με τις νεότερες πρώτα
     merged = list(current_dict.values())
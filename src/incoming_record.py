@@ -0,0 +1,123 @@
+"""Μοντέλο απλοποιημένης εισερχόμενης αίτησης (έξοδος του simplify_incoming_records).
+
+`IncomingRecord` κρατά τα σταθερά πεδία σε `__slots__` (χωρίς dict ανά εγγραφή) και τα
+επαναλαμβανόμενα κείμενα (Διεύθυνση, Γενική Δ/νση, Τμήμα, Διαδικασία, Κατηγορία, Έτος)
+ως interned strings, ώστε όλες οι εγγραφές να μοιράζονται το ίδιο αντικείμενο. Όσα
+πεδία προστίθενται αργότερα (`_charge`, `is_test`, `test_reason`, `_settled_status`)
+κρατιούνται σε μικρό dict μόνο όταν υπάρχουν.
+
+Συμπεριφέρεται ως mutable mapping (`rec.get`, `rec[...] = ...`, `in`, `dict(rec)`), οπότε
+ο υπάρχων κώδικας και τα snapshots (dict) συνεργάζονται χωρίς αλλαγές. Η μετατροπή
+`to_dict`/`from_dict` είναι χωρίς απώλειες: πεδία που δεν ορίστηκαν δεν εμφανίζονται.
+"""
+import sys
+from collections.abc import MutableMapping
+
+FIELDS = (
+    'case_id', 'submitted_at', 'party', 'doc_id',
+    'protocol_number', 'protocol_date', 'procedure', 'directory',
+    'general_directorate', 'department', 'document_category', 'subject',
+    'submission_year', 'related_case', 'case_code', 'related_case_code',
+)
+INTERNED_FIELDS = frozenset((
+    'directory', 'general_directorate', 'department', 'procedure',
+    'document_category', 'submission_year',
+))
+_FIELD_SET = frozenset(FIELDS)
+_MISSING = object()
+
+
+class IncomingRecord(MutableMapping):
+    """Εισερχόμενη αίτηση με πεδία σε slots (βλ. FIELDS) και προαιρετικά επιπλέον κλειδιά."""
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, **values):
+        self._extra = None
+        for key, value in values.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Από dict (π.χ. εγγραφή snapshot)· ένα IncomingRecord επιστρέφεται ως έχει."""
+        if isinstance(data, cls):
+            return data
+        rec = cls()
+        for key, value in data.items():
+            rec[key] = value
+        return rec
+
+    def to_dict(self):
+        data = {}
+        for name in FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                data[name] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def copy(self):
+        return IncomingRecord.from_dict(self.to_dict())
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+        elif self._extra is not None:
+            value = self._extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        try:
+            if key in _FIELD_SET:
+                delattr(self, key)
+            elif self._extra is not None:
+                del self._extra[key]
+            else:
+                raise KeyError(key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for name in FIELDS:
+            if getattr(self, name, _MISSING) is not _MISSING:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'IncomingRecord({self.to_dict()!r})'
+
+
+def to_builtin(obj):
+    """`default` για σειριοποίηση JSON/msgpack: IncomingRecord (ή άλλο mapping) -> dict."""
+    if isinstance(obj, IncomingRecord):
+        return obj.to_dict()
+    if isinstance(obj, MutableMapping):
+        return dict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
@@ -0,0 +1,135 @@
+"""SQLite key-value store για τα caches του portal (data/cache.sqlite3).
+
+Κάθε cache έχει δικό του namespace. Οι εγγραφές κρατούν JSON τιμή, χρόνο ανάκτησης
+(`fetched_at`) και αν η ανάκτηση ήταν επιτυχής (`ok`), ώστε κάθε cache να εφαρμόζει
+δικό του TTL (και μικρότερο TTL για αποτυχίες). Οι εγγραφές γίνονται incremental
+(UPSERT) αντί για επανεγγραφή ολόκληρου αρχείου.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import get_project_root
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    ok INTEGER NOT NULL DEFAULT 1,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+_CHUNK = 500  # όριο παραμέτρων ανά IN (...) query
+
+
+def get_kv_store_path():
+    return os.path.join(get_project_root(), 'data', 'cache.sqlite3')
+
+
+class KVStore:
+    """Thread-safe SQLite KV: μία σύνδεση ανά process, σειριοποιημένη με lock."""
+
+    def __init__(self, path=None):
+        self.path = path or get_kv_store_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, namespace, keys):
+        """Επιστρέφει {key: (value, ok, fetched_at)} για όσα keys υπάρχουν."""
+        keys = [str(k) for k in keys]
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i:i + _CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, value, ok, fetched_at FROM kv WHERE namespace = ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    [namespace, *chunk],
+                ).fetchall()
+                for key, value, ok, fetched_at in rows:
+                    found[key] = (json.loads(value) if value is not None else None, bool(ok), fetched_at)
+        return found
+
+    def put_many(self, namespace, items, fetched_at=None):
+        """Αποθηκεύει iterable από (key, value, ok)."""
+        fetched_at = fetched_at or time.time()
+        rows = [(namespace, str(key), json.dumps(value, ensure_ascii=False), 1 if ok else 0, fetched_at)
+                for key, value, ok in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO kv (namespace, key, value, ok, fetched_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, ok = excluded.ok, "
+                "fetched_at = excluded.fetched_at",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete_many(self, namespace, keys):
+        keys = [str(k) for k in keys]
+        with self._lock:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i:i + _CHUNK]
+                self._conn.execute(
+                    f"DELETE FROM kv WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [namespace, *chunk],
+                )
+            self._conn.commit()
+
+    def prune(self, namespace, max_age=None, max_entries=None):
+        """Διαγράφει εγγραφές παλαιότερες από `max_age` δευτερόλεπτα και, πέρα από
+        `max_entries`, τις παλαιότερες (με βάση το fetched_at). Επιστρέφει πόσες διαγράφηκαν."""
+        removed = 0
+        with self._lock:
+            if max_age is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM kv WHERE namespace = ? AND fetched_at < ?",
+                    (namespace, time.time() - max_age),
+                ).rowcount
+            if max_entries is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM kv WHERE namespace = ? AND key IN ("
+                    "SELECT key FROM kv WHERE namespace = ? ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                    (namespace, namespace, int(max_entries)),
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def items(self, namespace):
+        """Όλες οι εγγραφές του namespace ως {key: (value, ok, fetched_at)}."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, ok, fetched_at FROM kv WHERE namespace = ?", (namespace,)).fetchall()
+        return {key: (json.loads(value) if value is not None else None, bool(ok), fetched_at)
+                for key, value, ok, fetched_at in rows}
+
+    def count(self, namespace):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM kv WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_kv_store():
+    """Το κοινό KVStore του process (δημιουργείται lazily)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = KVStore()
+        return _store
@@ -12,7 +12,7 @@ if sys.platform == 'win32':
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from monitor import PKMMonitor
+from session_manager import get_shared_monitor
 from utils import load_config
 from config import INCOMING_DEFAULT_PARAMS, get_project_root
 from baseline import (save_baseline, load_baseline, compare_with_baseline,
@@ -62,6 +62,8 @@ def parse_arguments():
                        help='Δημιουργεί και στέλνει emails ανά Διεύθυνση με attachments για νέες αιτήσεις')
     parser.add_argument('--send-directory-emails-to-chat', action='store_true',
                        help='Δημιουργεί, στέλνει emails ανά Διεύθυνση ΚΑΙ αποστέλνει σύνοψη στο chat group υποστήριξης')
+    parser.add_argument('--full-resync', action='store_true',
+                        help='Πλήρης ανάκτηση εισερχόμενων από το portal (χωρίς incremental fetch από το watermark)')
     return parser.parse_args()
 
 def needs_data_fetch(args):
@@ -106,16 +108,17 @@ def handle_procedures(args, all_procedures, active_procedures):
 
 def handle_incoming(args, monitor, config):
     """Χειρίζεται τις εντολές για εισερχόμενες αιτήσεις"""
-    from incoming import merge_with_previous_snapshot  # Προσθήκη import
+    from incoming import merge_with_previous_snapshot, incoming_watermark, use_incremental_fetch
     
-    data = fetch_incoming_records(monitor, config.get('incoming_api_params', INCOMING_DEFAULT_PARAMS).copy())
+    today = datetime.now().strftime("%Y-%m-%d")
+    prev_date, prev_snap = load_previous_incoming_snapshot(today)
+    since = incoming_watermark(prev_snap) if use_incremental_fetch() else None
+    data = fetch_incoming_records(monitor, config.get('incoming_api_params', INCOMING_DEFAULT_PARAMS).copy(), since=since)
     if not data or not data.get('success'):
         print("\n⚠️  Αποτυχία λήψης εισερχόμενων αιτήσεων.")
         return
     
     records = simplify_incoming_records(data.get('data', []))
-    today = datetime.now().strftime("%Y-%m-%d")
-    prev_date, prev_snap = load_previous_incoming_snapshot(today)
     has_prev = prev_snap is not None
     
     # Συγχώνευση με προηγούμενο snapshot για να μην χαθούν παλιές εγγραφές
@@ -181,6 +184,8 @@ def main():
     # Runtime override for terminal formatting widths
     if args.full_text:
         os.environ['PKM_FULL_TEXT'] = '1'
+    if args.full_resync:
+        os.environ['INCOMING_FULL_RESYNC'] = '1'
     print("\n" + "="*80)
     print(f"🚀 PKM Website Monitor - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(80))
     print("="*80)
@@ -215,12 +220,7 @@ def main():
 
     # Always create monitor first (needed for settled cases lookup)
     config = load_config(os.path.join(get_project_root(), 'config', 'config.yaml'))
-    monitor = PKMMonitor(
-        base_url=config.get('base_url', 'https://shde.pkm.gov.gr'),
-        urls=config.get('urls', {}), api_params=config.get('api_params', {}),
-        login_params=config.get('login_params', {}), check_interval=config.get('check_interval', 300),
-        username=config.get('username'), password=config.get('password'),
-        session_cookies=config.get('session_cookies'))
+    monitor = get_shared_monitor(config=config)
 
     if args.export_incoming_xls or args.export_incoming_xls_all:
         # Δημιουργεί το XLS από το digest των νέων αιτήσεων
@@ -257,11 +257,9 @@ def main():
     
     if needs_data_fetch(args) or args.analyze_current:
         print("\n🔄 Ανάκτηση δεδομένων...")
-        if not monitor.logged_in and not monitor.login():
+        if not monitor.ensure_logged_in():
             print("❌ Αποτυχία login")
             sys.exit(1)
-        if not monitor.main_page_loaded:
-            monitor.load_main_page()
         data = monitor.fetch_page()
         if not data:
             print("❌ Αποτυχία ανάκτησης")
@@ -7,10 +7,11 @@ OTS Assignments Module - Συσχέτιση εισερχόμενων με ανα
 - Προσθήκη πληροφοριών ανάθεσης στα records
 """
 import html
-import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from case_codes import extract_pkm
+
 
 # OTS Configuration
 OTS_INCOMING_PARAMS = {
@@ -43,31 +44,13 @@ def fetch_ots_assignments(session) -> Tuple[List[dict], Dict[str, dict]]:
     # Δημιουργία mapping από ΠΚΜ
     ots_by_pkm = {}
     for rec in ots_records:
-        pkm = _extract_pkm_from_description(rec.get('DESCRIPTION', ''))
+        pkm = extract_pkm(rec.get('DESCRIPTION', ''))
         if pkm:
             ots_by_pkm[pkm] = rec
     
     return ots_records, ots_by_pkm
 
 
-def _extract_pkm_from_description(description: str) -> Optional[str]:
-    """
-    Εξάγει τον αριθμό ΠΚΜ από το DESCRIPTION
-    
-    Args:
-        description: OTS DESCRIPTION field (π.χ. "Αίτημα 2026/106653 ΨΥΤΙΛΛΗΣ-136290675")
-        
-    Returns:
-        str: Αριθμός ΠΚΜ (π.χ. "106653") ή None
-    """
-    # Decode HTML entities
-    description = html.unescape(description)
-    
-    # Extract PKM: "Αίτημα 2026/106653 ..." -> 106653
-    match = re.search(r'Αίτημα\s+\d+/(\d+)', description)
-    return match.group(1) if match else None
-
-
 def add_assignment_info(incoming_records: List[dict], ots_by_pkm: Dict[str, dict]) -> List[dict]:
     """
     Προσθέτει πληροφορίες ανάθεσης στα incoming records
@@ -258,7 +241,7 @@ def simplify_ots_record(ots_record: dict) -> dict:
     """
     return {
         'docid': ots_record.get('DOCID'),
-        'pkm': _extract_pkm_from_description(ots_record.get('DESCRIPTION', '')),
+        'pkm': extract_pkm(ots_record.get('DESCRIPTION', '')),
         'description': html.unescape(ots_record.get('DESCRIPTION', '')),
         'department': ots_record.get('USER_GROUP_ID_TO'),
         'department_short': _shorten_department(ots_record.get('USER_GROUP_ID_TO', '')),
@@ -0,0 +1,121 @@
+"""Παράλληλη ανάκτηση σελίδων από το getSearchDataByQueryId.
+
+Η πρώτη σελίδα επιστρέφει το `total`, οπότε τα υπόλοιπα `start` offsets είναι γνωστά
+και ζητούνται ταυτόχρονα (bounded thread pool). Κάθε σελίδα χρησιμοποιεί δικό της
+αντίγραφο παραμέτρων μέσω `monitor.fetch_data(params)`· το `monitor.api_params`
+δεν αλλάζει ποτέ, άρα το ίδιο monitor μπορεί να χρησιμοποιείται από πολλά threads.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_settings
+
+DEFAULT_PAGE_WORKERS = 4
+
+
+def _page_params(params, start, page_size):
+    page_params = dict(params)
+    page_params['start'] = start
+    if 'page' in page_params:
+        page_params['page'] = start // page_size + 1
+    return page_params
+
+
+def fetch_all_pages(monitor, params, max_workers=None, progress=None):
+    """Ανακτά όλες τις σελίδες ενός query και τις επιστρέφει με τη σειρά του server.
+
+    Args:
+        monitor: PKMSession/PKMMonitor με `fetch_data(params)`
+        params: Παράμετροι query (δεν τροποποιούνται)
+        max_workers: Ταυτόχρονα requests (default: `portal_page_workers` ή 4)
+        progress: Callback(fetched, total) μετά από κάθε σελίδα που ολοκληρώνεται
+
+    Returns:
+        dict | None: {'success': True, 'data': [...], 'total': int} ή None αν αποτύχει η 1η σελίδα.
+        Αν αποτύχει ενδιάμεση σελίδα, επιστρέφονται οι εγγραφές μέχρι την προηγούμενη σελίδα.
+    """
+    params = dict(params)
+    first = monitor.fetch_data(params)
+    if not first or not first.get('success'):
+        return None
+
+    records = list(first.get('data', []))
+    total = int(first.get('total') or len(records))
+    page_size = len(records) or int(params.get('limit', 200))
+    offsets = list(range(len(records), total, page_size)) if records else []
+    if not offsets:
+        return {'success': True, 'data': records, 'total': total}
+
+    if max_workers is None:
+        max_workers = get_settings().get('portal_page_workers', DEFAULT_PAGE_WORKERS)
+    workers = max(1, min(int(max_workers), len(offsets)))
+    fetched = [len(records)]
+    progress_lock = threading.Lock()
+
+    def fetch(start):
+        data = monitor.fetch_data(_page_params(params, start, page_size))
+        page = data.get('data', []) if data and data.get('success') else None
+        if page and progress:
+            with progress_lock:
+                fetched[0] += len(page)
+                progress(min(fetched[0], total), total)
+        return page
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='portal-page') as pool:
+        pages = list(pool.map(fetch, offsets))
+
+    for page in pages:
+        if not page:
+            print(f"[WARNING] Ελλιπής pagination: ανακτήθηκαν {len(records)}/{total} εγγραφές")
+            break
+        records.extend(page)
+    return {'success': True, 'data': records, 'total': total}
+
+
+def fetch_pages_since(monitor, params, sort_field, stamp, since):
+    """Σελίδες ταξινομημένες κατά `sort_field` DESC, μέχρι την πρώτη εγγραφή με stamp(rec) < since.
+
+    Args:
+        stamp: Callable(record) -> str συγκρίσιμο λεξικογραφικά (π.χ. ISO ημερομηνία)
+        since: Watermark· εγγραφές με ίδιο stamp επιστρέφονται (ισοπαλίες)
+
+    Returns:
+        dict | None: {'success', 'data', 'total', 'incremental': True} ή None αν αποτύχει request
+        ή αν το portal δεν σεβαστεί την ταξινόμηση, ώστε ο caller να κάνει πλήρη ανάκτηση.
+    """
+    params = dict(params)
+    params['start'] = 0
+    params['sort'] = json.dumps([{'property': sort_field, 'direction': 'DESC'}])
+    new_records = []
+    last_seen = None
+    total = 0
+    while True:
+        data = monitor.fetch_data(params)
+        if not data or not data.get('success'):
+            return None
+        page = data.get('data', [])
+        total = int(data.get('total') or 0)
+
+        stamps = [stamp(rec) for rec in page]
+        ordered = [ts for ts in stamps if ts]
+        if last_seen is not None:
+            ordered.insert(0, last_seen)
+        if any(a < b for a, b in zip(ordered, ordered[1:])):
+            return None
+        if ordered:
+            last_seen = ordered[-1]
+
+        reached = False
+        for rec, ts in zip(page, stamps):
+            if ts and ts < since:
+                reached = True
+                break
+            new_records.append(rec)
+
+        params['start'] += len(page)
+        if reached or not page or params['start'] >= total:
+            break
+        if 'page' in params:
+            params['page'] = int(params['page']) + 1
+    return {'success': True, 'data': new_records, 'total': total, 'incremental': True}
@@ -1,27 +1,38 @@
 """Διαχείριση procedures cache"""
 import os
-import json
 from datetime import datetime
 from config import get_procedures_cache_path
+from atomic_io import file_lock
+from serialization import read_file, write_file
 
 def load_procedures_cache():
     """Φορτώνει το procedures cache"""
-    path = get_procedures_cache_path()
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return read_file(get_procedures_cache_path()) or {}
 
-def save_procedures_cache(cache):
-    """Αποθηκεύει το procedures cache"""
+def update_procedures_cache(mutator):
+    """Read-modify-write του procedures cache κάτω από lock
+
+    Το `mutator(cache)` εφαρμόζει τις αλλαγές στο τρέχον περιεχόμενο του αρχείου και
+    επιστρέφει True αν άλλαξε κάτι, ώστε ταυτόχρονα runs (API / CLI) να μη χάνουν
+    ούτε νέες εγγραφές ούτε αλλαγές σε υπάρχουσες. Επιστρέφει το ενημερωμένο cache.
+    """
     path = get_procedures_cache_path()
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    with file_lock(path):
+        cache = read_file(path) or {}
+        if mutator(cache):
+            write_file(path, cache)
+    return cache
 
-def update_procedures_cache_from_procedures(procedures):
-    """Ενημερώνει το procedures_cache από τη λίστα διαδικασιών"""
-    procedures_cache = load_procedures_cache()
+def save_procedures_cache(cache):
+    """Αποθηκεύει το procedures cache (οι εγγραφές του `cache` αντικαθιστούν όσες υπάρχουν)"""
+    def merge(current):
+        current.update(cache)
+        return True
+    update_procedures_cache(merge)
+
+def _apply_procedures(procedures_cache, procedures):
+    """Εφαρμόζει τη λίστα διαδικασιών στο cache· True αν άλλαξε κάτι"""
     cache_updated = False
     
     for proc in procedures:
@@ -54,8 +65,18 @@ def update_procedures_cache_from_procedures(procedures):
                 procedures_cache[title]['is_active'] = is_active
                 cache_updated = True
     
-    if cache_updated:
-        save_procedures_cache(procedures_cache)
+    return cache_updated
+
+def update_procedures_cache_from_procedures(procedures):
+    """Ενημερώνει το procedures_cache από τη λίστα διαδικασιών"""
+    changed = []
+    
+    def apply(cache):
+        changed.append(_apply_procedures(cache, procedures))
+        return changed[0]
+    
+    procedures_cache = update_procedures_cache(apply)
+    if changed[0]:
         print(f"📝 Ενημερώθηκε το procedures_cache με {len(procedures)} διαδικασίες")
     
     return procedures_cache
@@ -1,5 +1,4 @@
 """Ανάκτηση ημερήσιας αναφοράς ΣΗΔΕ χωρίς email ή terminal output"""
-import json
 import os
 import sys
 from datetime import datetime
@@ -8,6 +7,7 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from monitor import PKMMonitor
+from session_manager import get_shared_monitor
 from utils import load_config
 from config import get_project_root, INCOMING_DEFAULT_PARAMS
 from baseline import (
@@ -22,10 +22,13 @@ from incoming import (
     load_incoming_snapshot,
     save_incoming_snapshot,
     fetch_incoming_records,
+    incoming_watermark,
+    use_incremental_fetch,
     compare_incoming_records,
     merge_with_previous_snapshot,
 )
 from api import enrich_record_details
+import charge_cache
 from test_users import classify_records, get_record_stats
 
 load_dotenv()
@@ -33,10 +36,8 @@ load_dotenv()
 
 def _ensure_logged_in_silent(monitor: PKMMonitor):
     """Κάνει login και φορτώνει αρχική σελίδα αν χρειάζεται (σιωπηλά)"""
-    if not monitor.logged_in and not monitor.login():
+    if not monitor.ensure_logged_in():
         raise RuntimeError("Αποτυχία login")
-    if not monitor.main_page_loaded:
-        monitor.load_main_page()
 
 
 def _fetch_procedures_silent(monitor: PKMMonitor):
@@ -49,39 +50,6 @@ def _fetch_procedures_silent(monitor: PKMMonitor):
     return all_procs, active_procs
 
 
-def _get_charge_enrichment_cache_path() -> str:
-    cache_dir = os.path.join(get_project_root(), "data")
-    os.makedirs(cache_dir, exist_ok=True)
-    return os.path.join(cache_dir, "charges_enrichment_cache.json")
-
-
-def _load_charge_enrichment_cache(force_reload: bool = False) -> dict:
-    if force_reload:
-        return {}
-
-    path = _get_charge_enrichment_cache_path()
-    if not os.path.exists(path):
-        return {}
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
-        return payload.get("by_doc_id", {}) if isinstance(payload, dict) else {}
-    except Exception:
-        return {}
-
-
-def _save_charge_enrichment_cache(by_doc_id: dict) -> None:
-    path = _get_charge_enrichment_cache_path()
-    payload = {
-        "updated_at": datetime.now().isoformat(),
-        "count": len(by_doc_id),
-        "by_doc_id": by_doc_id,
-    }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-
-
 def _prepare_incoming_silent(
     monitor: PKMMonitor,
     config: dict,
@@ -93,7 +61,14 @@ def _prepare_incoming_silent(
 ):
     """Φέρνει εισερχόμενες αιτήσεις, συγκρίνει με προηγούμενο snapshot και αποθηκεύει το σημερινό (σιωπηλά)."""
     incoming_params = config.get("incoming_api_params", INCOMING_DEFAULT_PARAMS).copy()
-    data = fetch_incoming_records(monitor, incoming_params)
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # Incremental: φέρνουμε μόνο όσα είναι νεότερα από το προηγούμενο snapshot
+    prev_date, prev_snap = (None, None)
+    if not os.getenv("INCOMING_FORCE_BASELINE_DATE"):
+        prev_date, prev_snap = load_previous_incoming_snapshot(today)
+    since = incoming_watermark(prev_snap) if use_incremental_fetch(full_resync=force_reload) else None
+    data = fetch_incoming_records(monitor, incoming_params, since=since)
     if not data or not data.get("success"):
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
@@ -105,8 +80,6 @@ def _prepare_incoming_silent(
             "stats": {"total": 0, "real": 0, "test": 0, "test_breakdown": {}},
         }
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    
     # Έλεγχος αν υπάρχει forced baseline ημερομηνία στο .env
     force_baseline_date = os.getenv("INCOMING_FORCE_BASELINE_DATE")
     if force_baseline_date:
@@ -134,8 +107,7 @@ def _prepare_incoming_silent(
         # Κανονική ροή: φέρε δεδομένα από API
         records = simplify_incoming_records(data.get("data", []))
         
-        # Ψάχνουμε προηγούμενο snapshot
-        prev_date, prev_snap = load_previous_incoming_snapshot(today)
+        # Προηγούμενο snapshot (φορτώθηκε πριν το fetch για το watermark)
         has_prev = prev_snap is not None
 
         # Αν δεν υπάρχει προηγούμενο snapshot, ψάχνουμε fallback ημερομηνία από .env
@@ -160,19 +132,17 @@ def _prepare_incoming_silent(
             enrich_record_details(monitor, to_enrich)
 
     # Ανάκτηση χρεώσεων και εμπλουτισμός records
+    charge_timings = {}
     if include_charges_enrichment:
         try:
             from charges import (
                 fetch_charges,
-                fetch_charges_combined,
+                fetch_charges_combined_timed,
                 add_charge_info_from_combined,
             )
 
-            charges_cache = _load_charge_enrichment_cache(force_reload=force_reload)
-            cache_updated = False
-
             if include_routing_query3:
-                _, charges_by_pkm = fetch_charges_combined(monitor)
+                _, charges_by_pkm, charge_timings = fetch_charges_combined_timed(monitor)
             else:
                 _, charges_by_pkm = fetch_charges(monitor)
 
@@ -185,15 +155,14 @@ def _prepare_incoming_silent(
             )
 
             # 2) Fallback από τοπικό cache για ήδη γνωστά doc_id
+            missing = [
+                str(r.get("doc_id", "")).strip() for r in records
+                if not (r.get("_charge") or {}).get("charged") and str(r.get("doc_id", "")).strip()
+            ]
+            charges_cache = {} if force_reload else charge_cache.get_cached_charges(missing)
             for rec in records:
-                charge = rec.get("_charge") or {}
-                if charge.get("charged"):
-                    continue
-                doc_id = str(rec.get("doc_id", "")).strip()
-                if not doc_id:
-                    continue
-                cached_charge = charges_cache.get(doc_id)
-                if cached_charge:
+                cached_charge = charges_cache.get(str(rec.get("doc_id", "")).strip())
+                if cached_charge and not (rec.get("_charge") or {}).get("charged"):
                     rec["_charge"] = cached_charge
 
             # 3) ΜΟΝΟ για νέα/άγνωστα records κάνουμε αργό per-record enrichment
@@ -215,19 +184,14 @@ def _prepare_incoming_silent(
                     doc_id = str(rec.get("doc_id", "")).strip()
                     if not doc_id:
                         continue
-                    charge = rec.get("_charge") or {}
-                    charge_by_docid[doc_id] = charge
-                    if charge.get("charged"):
-                        charges_cache[doc_id] = charge
-                        cache_updated = True
+                    charge_by_docid[doc_id] = rec.get("_charge") or {}
 
                 for rec in records:
                     doc_id = str(rec.get("doc_id", "")).strip()
                     if doc_id in charge_by_docid:
                         rec["_charge"] = charge_by_docid[doc_id]
 
-            if cache_updated:
-                _save_charge_enrichment_cache(charges_cache)
+                charge_cache.store_charges(charge_by_docid)
         except Exception:
             # Συνεχίζουμε χωρίς χρεώσεις αν αποτύχει
             pass
@@ -247,6 +211,8 @@ def _prepare_incoming_silent(
         "real_new": real_new,
         "test_new": test_new,
         "stats": stats,
+        # Διάρκεια ανάκτησης χρεώσεων ανά πηγή σε seconds ({'queryId=2': ..., 'queryId=3': ...})
+        "timings": {"charges": charge_timings},
     }
 
 
@@ -294,16 +260,7 @@ def get_daily_sede_report(
     cfg_path = config_path or os.path.join(root, "config", "config.yaml")
     config = load_config(cfg_path)
 
-    monitor = PKMMonitor(
-        base_url=config.get("base_url", "https://shde.pkm.gov.gr"),
-        urls=config.get("urls", {}),
-        api_params=config.get("api_params", {}),
-        login_params=config.get("login_params", {}),
-        check_interval=config.get("check_interval", 300),
-        username=config.get("username"),
-        password=config.get("password"),
-        session_cookies=config.get("session_cookies"),
-    )
+    monitor = get_shared_monitor(cfg_path, config)
 
     _ensure_logged_in_silent(monitor)
     all_procs, active_procs = _fetch_procedures_silent(monitor)
@@ -0,0 +1,136 @@
+"""Κοινό layer σειριοποίησης για τα αρχεία του data/ (snapshots, baselines, caches).
+
+Μορφή εγγραφής από το config:
+- `storage_format`: `json` (συμπαγές, χωρίς indent) ή `msgpack` (απαιτεί το πακέτο msgpack)
+- `storage_compression`: `none`, `gzip` ή `zstd` (απαιτεί το πακέτο zstandard)
+
+Για JSON χρησιμοποιείται το orjson όταν είναι εγκατεστημένο, αλλιώς το stdlib json.
+Η ανάγνωση αναγνωρίζει αυτόματα τη μορφή (magic bytes για gzip/zstd, πρώτο byte για
+JSON έναντι msgpack), οπότε παλιά αρχεία με indent=2 και νέα αρχεία διαβάζονται το ίδιο.
+"""
+import gzip
+import json
+import os
+
+from atomic_io import atomic_write
+from incoming_record import to_builtin
+from utils import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - εξαρτάται από το περιβάλλον
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_JSON_START = frozenset(b'{["-0123456789tfn \t\r\n\xef')  # \xef: UTF-8 BOM
+
+
+def available_formats():
+    formats = ['json']
+    if msgpack is not None:
+        formats.append('msgpack')
+    return formats
+
+
+def available_compressions():
+    compressions = ['none', 'gzip']
+    if zstandard is not None:
+        compressions.append('zstd')
+    return compressions
+
+
+def _storage_options(fmt, compression):
+    settings = get_settings()
+    fmt = fmt or settings.get('storage_format', 'json')
+    compression = compression or settings.get('storage_compression', 'none') or 'none'
+    if fmt not in available_formats():
+        print(f"[WARNING] Μη διαθέσιμη μορφή αποθήκευσης '{fmt}', χρήση json")
+        fmt = 'json'
+    if compression not in available_compressions():
+        print(f"[WARNING] Μη διαθέσιμη συμπίεση '{compression}', χωρίς συμπίεση")
+        compression = 'none'
+    return fmt, compression
+
+
+def encode_json(obj):
+    """Συμπαγές UTF-8 JSON (orjson αν υπάρχει)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=to_builtin, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=to_builtin).encode('utf-8')
+
+
+def decode_json(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8-sig') if isinstance(data, bytes) else data)
+
+
+def dumps(obj, fmt=None, compression=None):
+    """Σειριοποιεί σε bytes με τη μορφή/συμπίεση του config (ή τις ρητές τιμές)."""
+    fmt, compression = _storage_options(fmt, compression)
+    if fmt == 'msgpack':
+        data = msgpack.packb(obj, use_bin_type=True, default=to_builtin)
+    else:
+        data = encode_json(obj)
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompress(data):
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Το αρχείο είναι συμπιεσμένο με zstd αλλά το πακέτο zstandard δεν είναι εγκατεστημένο")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def _decode(data):
+    if not data or data[0] in _JSON_START:
+        return decode_json(data)
+    if msgpack is None:
+        raise RuntimeError("Το αρχείο είναι σε μορφή msgpack αλλά το πακέτο msgpack δεν είναι εγκατεστημένο")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def loads(data):
+    """Αντίστροφο του dumps· αναγνωρίζει συμπίεση και μορφή από τα περιεχόμενα."""
+    return _decode(_decompress(data))
+
+
+def read_file(path):
+    """Φορτώνει αρχείο οποιασδήποτε υποστηριζόμενης μορφής (None αν δεν υπάρχει)."""
+    return read_file_sized(path)[0]
+
+
+def read_file_sized(path):
+    """Όπως το read_file, αλλά επιστρέφει (payload, μέγεθος σε bytes μετά την αποσυμπίεση).
+
+    Το μέγεθος χωρίς συμπίεση εκτιμά τη μνήμη του parsed payload καλύτερα από το
+    μέγεθος του αρχείου (βλ. snapshot_store.SnapshotCache).
+    """
+    if not os.path.exists(path):
+        return None, 0
+    with open(path, 'rb') as f:
+        data = _decompress(f.read())
+    return _decode(data), len(data)
+
+
+def write_file(path, obj, fmt=None, compression=None):
+    """Αποθηκεύει ατομικά `obj` στο `path` με τη μορφή του config (βλ. atomic_io)."""
+    return atomic_write(path, dumps(obj, fmt=fmt, compression=compression))
@@ -1,16 +1,138 @@
 """Helpers for loading and inspecting the daily SEDE report digest."""
-from typing import Dict, Any, Tuple
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from sede_report import get_daily_sede_report
+from snapshot_stats import load_snapshot_stats
+from utils import get_settings
+
+DEFAULT_DIGEST_CACHE_TTL = 300  # seconds
+FAILURE_COOLDOWN = 60  # seconds χωρίς νέο background rebuild μετά από αποτυχία
+
+
+class _Flight:
+    """Ένα rebuild σε εξέλιξη, στο οποίο περιμένουν όσοι το χρειάζονται."""
+
+    def __init__(self, reload: bool = False):
+        self.reload = reload
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class DigestCache:
+    """In-process cache του digest με TTL, single-flight και stale-while-revalidate.
+
+    - Όσο το digest είναι φρέσκο (ηλικία < ttl) επιστρέφεται απευθείας από τη μνήμη.
+    - Όταν λήξει, επιστρέφεται το παλιό digest και ξεκινά rebuild στο παρασκήνιο.
+    - Ταυτόχρονα αιτήματα μοιράζονται το ίδιο rebuild (ένα login/fetch στο portal).
+    - Μόνο όταν δεν υπάρχει καθόλου digest (ή ζητηθεί reload) ο caller περιμένει.
+    - Ένα reload δεν αρκείται σε κανονικό rebuild που τρέχει ήδη: περιμένει να
+      τελειώσει και ξεκινά δικό του (force_reload).
+    - Μετά από αποτυχημένο rebuild τα stale reads δεν ξεκινούν νέο για
+      min(ttl, FAILURE_COOLDOWN), ώστε ένα πεσμένο portal να μη δέχεται login ανά αίτημα.
+    """
+
+    def __init__(self, builder: Callable[[bool], Dict[str, Any]], ttl: float = DEFAULT_DIGEST_CACHE_TTL):
+        self._builder = builder
+        self.ttl = ttl
+        # False όταν τρέχει background refresher: τα requests δεν προκαλούν ποτέ rebuild
+        self.revalidate_on_read = True
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[Dict[str, Any], float]] = None
+        self._flight: Optional[_Flight] = None
+        self._failed_at: Optional[float] = None
+
+    def get(self, reload: bool = False) -> Dict[str, Any]:
+        entry = self._entry
+        if entry is not None and not reload:
+            digest, built_at = entry
+            now = time.monotonic()
+            if self.revalidate_on_read and now - built_at >= self.ttl and not self._cooling_down(now):
+                self._start(reload=False, background=True)
+            return digest
+
+        return self._wait(self._start(reload=reload, background=False))
+
+    def publish(self, digest: Dict[str, Any]) -> None:
+        """Αντικαθιστά ατομικά το digest που βλέπουν οι readers."""
+        self._entry = (digest, time.monotonic())
+
+    def refresh(self, reload: bool = False) -> Dict[str, Any]:
+        """Κάνει rebuild (ή συμμετέχει σε αυτό που τρέχει) και επιστρέφει το νέο digest."""
+        return self._wait(self._start(reload=reload, background=False))
+
+    def age(self) -> Optional[float]:
+        entry = self._entry
+        return time.monotonic() - entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entry = None
+
+    def _cooling_down(self, now: float) -> bool:
+        failed_at = self._failed_at
+        return failed_at is not None and now - failed_at < min(self.ttl, FAILURE_COOLDOWN)
+
+    def _wait(self, flight: _Flight) -> Dict[str, Any]:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def _start(self, reload: bool, background: bool) -> _Flight:
+        while True:
+            with self._lock:
+                current = self._flight
+                if current is None:
+                    flight = self._flight = _Flight(reload)
+                    break
+                if current.reload or not reload:
+                    return current
+            current.done.wait()
+
+        if background:
+            threading.Thread(target=self._run, args=(flight, reload, True), name="digest-rebuild", daemon=True).start()
+        else:
+            self._run(flight, reload)
+        return flight
+
+    def _run(self, flight: _Flight, reload: bool, background: bool = False) -> None:
+        try:
+            digest = self._builder(reload)
+            self.publish(digest)
+            self._failed_at = None
+            flight.result = digest
+        except BaseException as exc:  # stale digest (αν υπάρχει) παραμένει διαθέσιμο
+            self._failed_at = time.monotonic()
+            flight.error = exc
+            if background:
+                # Κανείς δεν περιμένει αυτό το rebuild· χωρίς log η αποτυχία θα χανόταν
+                print(f"[WARNING] Αποτυχία background ανανέωσης digest: {exc}")
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+
+def _build_digest(reload: bool) -> Dict[str, Any]:
+    return get_daily_sede_report(fast_mode=True, force_reload=reload)
+
+
+_digest_cache = DigestCache(_build_digest, ttl=get_settings().get("digest_cache_ttl", DEFAULT_DIGEST_CACHE_TTL))
+
+
+def get_digest_cache() -> DigestCache:
+    return _digest_cache
 
 
 def load_digest(reload: bool = False) -> Dict[str, Any]:
     """Loads the daily SEDE report digest (shared across API routes).
-    
+
     Args:
         reload (bool): If True, ignores cache and performs full rebuild.
     """
-    return get_daily_sede_report(fast_mode=True, force_reload=reload)
+    return _digest_cache.get(reload=reload)
 
 
 def count_changes(changes: Dict[str, list] | None, key: str) -> int:
@@ -19,6 +141,17 @@ def count_changes(changes: Dict[str, list] | None, key: str) -> int:
     return len(changes.get(key, []))
 
 
+def snapshot_stats(date_str: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """Επιστρέφει (πλήθος εγγραφών, στατιστικά) για το snapshot μιας ημέρας ή None.
+
+    Διαβάζει μόνο το sidecar στατιστικών (βλ. snapshot_stats), όχι ολόκληρο το snapshot.
+    """
+    stats = load_snapshot_stats(date_str)
+    if not stats:
+        return None
+    return stats["total"], stats
+
+
 def incoming_stats(digest: Dict[str, Any]) -> Tuple[int, int, int]:
     incoming = digest.get("incoming", {})
     stats = incoming.get("stats", {})
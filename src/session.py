@@ -2,11 +2,82 @@
 import requests
 import time
 import json
+import base64
+import threading
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import session_store
 from notifications import print_status
+from utils import get_settings
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+DEFAULT_HTTP_POOL_MAXSIZE = 16
+JWT_EXPIRY_MARGIN = 60  # seconds πριν το exp που θεωρούμε το token ληγμένο
+
+
+def build_http_session(pool_maxsize=None):
+    """Δημιουργεί keep-alive requests.Session με connection pool για πολλαπλά threads.
+
+    Τα idempotent GET ξαναδοκιμάζονται σε connection errors / 502-504 με backoff.
+    """
+    if pool_maxsize is None:
+        pool_maxsize = get_settings().get('http_pool_maxsize', DEFAULT_HTTP_POOL_MAXSIZE)
+    retry = Retry(total=2, connect=2, read=0, backoff_factor=0.5,
+                  status_forcelist=(502, 503, 504), allowed_methods=frozenset(['GET']),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, int(pool_maxsize)), max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def jwt_expiry(token):
+    """Επιστρέφει το `exp` (epoch seconds) ενός JWT ή None αν δεν διαβάζεται."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class LoginRedirectError(requests.RequestException):
+    """Το portal ανακατεύθυνε στη σελίδα login και το relogin δεν βοήθησε."""
+
+
+def is_login_redirect(response):
+    """True αν η απάντηση κατέληξε στη σελίδα login (απορρίφθηκε το session)."""
+    return 'login' in str(getattr(response, 'url', '') or '').lower()
+
+
+def get_with_relogin(client, url, headers=None, **kwargs):
+    """GET με το session/JWT του `client` (PKMSession ή PKMMonitor).
+
+    Αν το portal ανακατευθύνει στο login (π.χ. ανακλημένο αποθηκευμένο session), γίνεται
+    `client._relogin` και μία νέα προσπάθεια με το νέο token. Κοινό για το fetch_data
+    και τα απευθείας GET (λεπτομέρειες εγγραφών, χρεώσεις, attachments).
+
+    Raises:
+        LoginRedirectError: αν και μετά το relogin η απάντηση είναι η σελίδα login.
+    """
+    for retry in (True, False):
+        token = getattr(client, 'jwt_token', None)
+        request_headers = dict(headers or {})
+        if token:
+            request_headers['Authorization'] = f'Bearer {token}'
+        response = client.session.get(url, headers=request_headers, verify=False, **kwargs)
+        if not is_login_redirect(response):
+            return response
+        relogin = getattr(client, '_relogin', None)
+        if not (retry and relogin is not None and relogin(token)):
+            break
+    raise LoginRedirectError(f"Ανακατεύθυνση στη σελίδα login: {url}")
+
+
 class PKMSession:
     def __init__(self, base_url, urls, login_params=None, username=None, password=None, session_cookies=None):
         self.base_url = base_url.rstrip('/')
@@ -14,10 +85,13 @@ class PKMSession:
         self.login_params = login_params or {}
         self.username = username
         self.password = password
-        self.session = requests.Session()
+        self.session = build_http_session()
+        # Σειριοποιεί login/ανανέωση όταν το ίδιο session μοιράζεται σε threads
+        self._auth_lock = threading.RLock()
         self.logged_in = False
         self.main_page_loaded = False
         self.jwt_token = None
+        self._store_checked = False
         
         # URLs
         self.login_page_url = self.base_url + self.urls.get('login_page', '/login.jsp')
@@ -103,11 +177,80 @@ class PKMSession:
         except:
             return False
 
+    def token_expired(self):
+        """True αν το JWT λήγει μέσα στα επόμενα JWT_EXPIRY_MARGIN δευτερόλεπτα."""
+        if not self.jwt_token:
+            return False
+        exp = jwt_expiry(self.jwt_token)
+        return exp is not None and exp - JWT_EXPIRY_MARGIN <= time.time()
+
+    def invalidate(self):
+        """Ξεχνά την τρέχουσα αυθεντικοποίηση ώστε το επόμενο ensure_logged_in να κάνει login."""
+        with self._auth_lock:
+            self.logged_in = False
+            self.main_page_loaded = False
+            self.jwt_token = None
+            if session_store.is_enabled():
+                session_store.clear_session(self)
+
+    def _restore_stored_session(self):
+        """Επαναφέρει cookies/JWT από προηγούμενο run (μία προσπάθεια ανά process)."""
+        if self._store_checked or not session_store.is_enabled():
+            return False
+        self._store_checked = True
+        if not session_store.load_session(self):
+            return False
+        if self.token_expired():
+            self.invalidate()
+            return False
+        self.logged_in = True
+        self.main_page_loaded = True
+        print_status("♻️ Επαναχρησιμοποίηση αποθηκευμένου session (χωρίς login)", 'info')
+        return True
+
+    def _store_session(self):
+        if not session_store.is_enabled():
+            return
+        exp = jwt_expiry(self.jwt_token) if self.jwt_token else None
+        session_store.save_session(self, expires_at=exp - JWT_EXPIRY_MARGIN if exp else None)
+
+    def ensure_logged_in(self):
+        """Login + φόρτωση κύριας σελίδας μόνο αν χρειάζεται (thread-safe).
+
+        Πρώτα δοκιμάζει το αποθηκευμένο session (session_store)· αν το portal το
+        απορρίψει (redirect στο login), το get_with_relogin κάνει κανονικό login.
+        Ανανεώνει αυτόματα τη σύνδεση όταν το JWT έχει λήξει. Επιστρέφει False
+        αν αποτύχει το login ή η φόρτωση της κύριας σελίδας.
+        """
+        with self._auth_lock:
+            if self.logged_in and self.token_expired():
+                print_status("🔄 Το JWT έληξε - ανανέωση σύνδεσης", 'info')
+                self.invalidate()
+            if not self.logged_in and self._restore_stored_session():
+                return True
+            fresh_login = not self.logged_in
+            if fresh_login and not self.login():
+                return False
+            if not self.main_page_loaded and not self.load_main_page():
+                return False
+            if fresh_login:
+                self._store_session()
+            return True
+
+    def _relogin(self, stale_token):
+        """Νέο login μετά από redirect στη σελίδα login.
+
+        Αν άλλο thread έχει ήδη ανανεώσει τη σύνδεση (άλλαξε το token) δεν ξαναγίνεται login.
+        """
+        with self._auth_lock:
+            if self.logged_in and self.main_page_loaded and self.jwt_token != stale_token:
+                return True
+            self.invalidate()
+            return self.ensure_logged_in()
+
     def fetch_data(self, api_params):
         """Ανάκτηση δεδομένων από API"""
-        if not self.logged_in and not self.login():
-            return None
-        if not self.main_page_loaded and not self.load_main_page():
+        if not self.ensure_logged_in():
             return None
         
         try:
@@ -116,25 +259,15 @@ class PKMSession:
                 'Accept': '*/*', 'Accept-Language': 'el',
                 'X-Requested-With': 'XMLHttpRequest', 'Referer': self.main_page_url,
             }
-            if self.jwt_token:
-                headers['Authorization'] = f'Bearer {self.jwt_token}'
             
             params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in api_params.items()}
             params['_dc'] = str(int(time.time() * 1000))
             
-            response = self.session.get(self.data_api_url, params=params, 
-                                       headers=headers, timeout=15, verify=False)
-            
-            if 'login' in response.url.lower():
-                self.logged_in = False
-                self.main_page_loaded = False
-                self.jwt_token = None
-                if self.login() and self.load_main_page():
-                    return self.fetch_data(api_params)
-                return None
-            
+            response = get_with_relogin(self, self.data_api_url, headers, params=params, timeout=15)
             response.raise_for_status()
             return response.json()
+        except LoginRedirectError:
+            return None
         except Exception as e:
             print_status(f"❌ Σφάλμα fetch: {e}", 'error')
             return None
@@ -0,0 +1,67 @@
+"""Κοινό, αυθεντικοποιημένο PKMMonitor για όλα τα entry points.
+
+Κάθε process κρατά ένα PKMMonitor ανά config αρχείο. Έτσι ένα run (main, ημερήσια
+αναφορά, εβδομαδιαία αναφορά, emails ανά Διεύθυνση, FastAPI) κάνει ένα login και
+επαναχρησιμοποιεί το ίδιο keep-alive connection pool. Η ανανέωση JWT/cookies γίνεται
+από το `PKMSession.ensure_logged_in()`.
+"""
+import os
+import threading
+
+from config import get_project_root
+from monitor import PKMMonitor
+from utils import load_config
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def _default_config_path():
+    return os.path.join(get_project_root(), 'config', 'config.yaml')
+
+
+def build_monitor(config):
+    """Δημιουργεί νέο PKMMonitor από ένα φορτωμένο config (χωρίς login)."""
+    return PKMMonitor(
+        base_url=config.get('base_url', 'https://shde.pkm.gov.gr'),
+        urls=config.get('urls', {}),
+        api_params=config.get('api_params', {}),
+        login_params=config.get('login_params', {}),
+        check_interval=config.get('check_interval', 300),
+        username=config.get('username'),
+        password=config.get('password'),
+        session_cookies=config.get('session_cookies'),
+    )
+
+
+def get_shared_monitor(config_path=None, config=None):
+    """Επιστρέφει το κοινό PKMMonitor για το `config_path` (δημιουργείται μία φορά).
+
+    Το login γίνεται lazily στο πρώτο `ensure_logged_in()` / `fetch_data()`.
+
+    Args:
+        config_path: Διαδρομή config (default: config/config.yaml)
+        config: Ήδη φορτωμένο config για το ίδιο αρχείο (αποφεύγει δεύτερη ανάγνωση)
+    """
+    key = os.path.abspath(config_path or _default_config_path())
+    with _monitors_lock:
+        monitor = _monitors.get(key)
+        if monitor is None:
+            monitor = _monitors[key] = build_monitor(config if config is not None else load_config(key))
+        return monitor
+
+
+def get_logged_in_monitor(config_path=None, config=None):
+    """Όπως το get_shared_monitor, αλλά εξασφαλίζει login. Raises RuntimeError αν αποτύχει."""
+    monitor = get_shared_monitor(config_path, config)
+    if not monitor.ensure_logged_in():
+        raise RuntimeError("Αποτυχία login")
+    return monitor
+
+
+def reset_shared_monitors():
+    """Απορρίπτει τα κοινά monitors (π.χ. μετά από αλλαγή credentials ή σε tests)."""
+    with _monitors_lock:
+        for monitor in _monitors.values():
+            monitor.session.close()
+        _monitors.clear()
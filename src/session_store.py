@@ -0,0 +1,92 @@
+"""Αποθήκευση του αυθεντικοποιημένου session στο δίσκο για επαναχρησιμοποίηση μεταξύ runs.
+
+Κάθε run του CLI (cron, --send-daily-email, εβδομαδιαία αναφορά) ξαναχρησιμοποιεί τα
+cookies και το JWT του προηγούμενου run αντί για login + φόρτωση κύριας σελίδας.
+Το αρχείο γράφεται με δικαιώματα 0600 (μόνο ο κάτοχος) στο data/.session/ και
+διαγράφεται μόλις το portal κάνει redirect στο login.
+"""
+import hashlib
+import json
+import os
+import time
+
+from atomic_io import atomic_write
+from config import get_project_root
+from utils import get_settings
+
+DEFAULT_SESSION_MAX_AGE = 8 * 3600  # seconds, όταν το JWT δεν έχει exp
+
+
+def is_enabled():
+    return bool(get_settings().get('session_store_enabled', True))
+
+
+def session_store_path(base_url, username):
+    """Ένα αρχείο ανά (portal, χρήστη)· το όνομα δεν αποκαλύπτει το username."""
+    key = hashlib.sha256(f"{base_url}|{username}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_project_root(), 'data', '.session', f'{key}.json')
+
+
+def _write_private(path, payload):
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    atomic_write(path, json.dumps(payload).encode('utf-8'), mode=0o600)
+
+
+def save_session(sess, expires_at=None):
+    """Αποθηκεύει cookies + JWT ενός συνδεδεμένου PKMSession."""
+    if not sess.username:
+        return
+    now = time.time()
+    cookies = [
+        {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path, 'expires': c.expires}
+        for c in sess.session.cookies
+    ]
+    payload = {
+        'base_url': sess.base_url,
+        'saved_at': now,
+        'expires_at': expires_at or now + get_settings().get('session_store_max_age', DEFAULT_SESSION_MAX_AGE),
+        'jwt': sess.jwt_token,
+        'cookies': cookies,
+    }
+    try:
+        _write_private(session_store_path(sess.base_url, sess.username), payload)
+    except OSError as e:
+        print(f"[WARNING] Αποτυχία αποθήκευσης session: {e}")
+
+
+def load_session(sess):
+    """Φορτώνει αποθηκευμένο session στο `sess` αν υπάρχει και δεν έχει λήξει.
+
+    Returns:
+        bool: True αν φορτώθηκε (η εγκυρότητα επιβεβαιώνεται στο πρώτο data request)
+    """
+    if not sess.username:
+        return False
+    path = session_store_path(sess.base_url, sess.username)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    now = time.time()
+    if payload.get('base_url') != sess.base_url or payload.get('expires_at', 0) <= now:
+        clear_session(sess)
+        return False
+
+    for c in payload.get('cookies', []):
+        if c.get('expires') and c['expires'] <= now:
+            continue
+        sess.session.cookies.set(c['name'], c['value'], domain=c.get('domain') or '', path=c.get('path') or '/')
+    sess.jwt_token = payload.get('jwt')
+    return True
+
+
+def clear_session(sess):
+    """Διαγράφει το αποθηκευμένο session (π.χ. μετά από redirect στο login)."""
+    if not sess.username:
+        return
+    try:
+        os.remove(session_store_path(sess.base_url, sess.username))
+    except OSError:
+        pass
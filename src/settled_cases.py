@@ -1,9 +1,13 @@
 """Διαχείριση διεκπεραιωμένων υποθέσεων"""
 import os
-import json
+from collections.abc import Mapping
 from datetime import datetime
 from config import get_project_root, SETTLED_CASES_DEFAULT_PARAMS
 from api import sanitize_party_name
+from case_codes import extract_case_code, incoming_case_code
+from date_index import SnapshotDateIndex
+from pagination import fetch_all_pages
+from serialization import read_file, write_file
 
 def get_settled_cases_snapshot_path(date_str):
     """Path για settled cases snapshot συγκεκριμένης ημερομηνίας"""
@@ -13,34 +17,27 @@ def get_settled_cases_snapshot_path(date_str):
 
 def load_settled_cases_snapshot(date_str):
     """Φορτώνει snapshot διεκπεραιωμένων υποθέσεων"""
-    path = get_settled_cases_snapshot_path(date_str)
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return None
+    return read_file(get_settled_cases_snapshot_path(date_str))
 
 def save_settled_cases_snapshot(date_str, records):
     """Αποθηκεύει snapshot διεκπεραιωμένων υποθέσεων"""
     payload = {'date': date_str, 'count': len(records), 'records': records}
-    path = get_settled_cases_snapshot_path(date_str)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    path = write_file(get_settled_cases_snapshot_path(date_str), payload)
+    _get_settled_date_index().add(date_str)
     return path
 
+_settled_date_index = None
+
+def _get_settled_date_index():
+    global _settled_date_index
+    settled_dir = os.path.join(get_project_root(), 'data', 'settled_cases')
+    if _settled_date_index is None or _settled_date_index.directory != settled_dir:
+        _settled_date_index = SnapshotDateIndex(settled_dir, 'settled_')
+    return _settled_date_index
+
 def list_settled_cases_snapshot_dates():
     """Επιστρέφει λίστα ημερομηνιών με settled cases snapshots"""
-    settled_dir = os.path.join(get_project_root(), 'data', 'settled_cases')
-    if not os.path.exists(settled_dir):
-        return []
-    dates = []
-    for filename in os.listdir(settled_dir):
-        if filename.startswith('settled_') and filename.endswith('.json'):
-            date_part = filename[len('settled_'):-5]
-            try:
-                dates.append(datetime.strptime(date_part, "%Y-%m-%d").date())
-            except ValueError:
-                continue
-    return sorted(dates)
+    return _get_settled_date_index().dates()
 
 def fetch_settled_cases(monitor, settled_params=None):
     """Ανακτά διεκπεραιωμένες υποθέσεις με pagination αν χρειάζεται
@@ -57,43 +54,19 @@ def fetch_settled_cases(monitor, settled_params=None):
     else:
         settled_params = settled_params.copy()
     
-    params = settled_params.copy()
-    original_params = monitor.api_params.copy()
-    all_records = []
-    
     try:
-        # Πρώτο request
-        monitor.api_params = params
-        data = monitor.fetch_page()
-        
-        if not data or not data.get('success'):
+        data = fetch_all_pages(
+            monitor, settled_params,
+            progress=lambda done, total: print(f"  📋 Ανακτήθηκαν {done}/{total} διεκπεραιωμένες υποθέσεις..."))
+        if not data:
             print("  ❌ Αποτυχία ανάκτησης διεκπεραιωμένων υποθέσεων")
             return {'success': False, 'data': [], 'total': 0}
         
-        all_records.extend(data.get('data', []))
-        total = data.get('total', len(all_records))
-        
-        # Pagination αν υπάρχουν περισσότερες εγγραφές
-        limit = params.get('limit', 200)
-        while len(all_records) < total:
-            params['start'] = len(all_records)
-            monitor.api_params = params
-            data = monitor.fetch_page()
-            if not data or not data.get('success'):
-                break
-            new_records = data.get('data', [])
-            if not new_records:
-                break
-            all_records.extend(new_records)
-            print(f"  📋 Ανακτήθηκαν {len(all_records)}/{total} διεκπεραιωμένες υποθέσεις...")
-        
-        print(f"  ✅ Ολοκληρώθηκε: {len(all_records)} εγγραφές")
-        return {'success': True, 'data': all_records, 'total': total}
+        print(f"  ✅ Ολοκληρώθηκε: {len(data['data'])} εγγραφές")
+        return data
     except Exception as e:
         print(f"  ❌ Σφάλμα κατά την ανάκτηση: {e}")
         return {'success': False, 'data': [], 'total': 0}
-    finally:
-        monitor.api_params = original_params
 
 def simplify_settled_records(records):
     """Απλοποιεί τις εγγραφές διεκπεραιωμένων υποθέσεων
@@ -261,40 +234,21 @@ def correlate_incoming_with_settled(incoming_records, settled_records):
             }
         }
     """
-    # Ανίχνευση αν είναι simplified ή raw records
-    is_settled_simplified = settled_records and 'case_code' in settled_records[0] if settled_records else False
-    
-    # Δημιουργία mapping: case_code -> settled record
-    settled_by_code = {}
-    for rec in settled_records:
-        if is_settled_simplified:
-            case_code = rec.get('case_code', '')
-        else:
-            case_code = rec.get('W001_P_FLD2', '')
-        
-        if case_code:
-            settled_by_code[case_code.strip().upper()] = rec
+    # Index: κανονικοποιημένο case_code -> settled record (μία φορά, αναζήτηση O(1))
+    settled_index = settled_records if isinstance(settled_records, SettledIndex) else SettledIndex(settled_records)
     
     # Συσχέτιση
     correlated = []
     incoming_without_settled = []
     
     for inc_rec in incoming_records:
-        # Εξαγωγή του πεδίου "Αφορά Υπόθεση"
-        case_ref = inc_rec.get('W007_P_FLD7', '')
-        
-        if not case_ref:
-            incoming_without_settled.append(inc_rec)
-            continue
-        
-        # Εξαγωγή κωδικού υπόθεσης από το "Αφορά Υπόθεση"
-        # Format: "Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645"
-        case_code = _extract_case_code_from_reference(case_ref)
-        
-        if case_code and case_code in settled_by_code:
+        # "Αφορά Υπόθεση" (W007_P_FLD7) στις raw, YEAR/CASE_ID / protocol_number /
+        # related_case στις simplified. Format: "Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645"
+        case_code, settled = settled_index.match(inc_rec)
+        if settled is not None:
             correlated.append({
                 'incoming': inc_rec,
-                'settled': settled_by_code[case_code],
+                'settled': settled,
                 'case_code': case_code
             })
         else:
@@ -303,7 +257,7 @@ def correlate_incoming_with_settled(incoming_records, settled_records):
     # Βρες διεκπεραιωμένες που δεν έχουν εισερχόμενες
     matched_case_codes = {item['case_code'] for item in correlated}
     settled_without_incoming = [
-        rec for code, rec in settled_by_code.items()
+        rec for code, rec in settled_index.items()
         if code not in matched_case_codes
     ]
     
@@ -323,26 +277,6 @@ def correlate_incoming_with_settled(incoming_records, settled_records):
     }
 
 
-def _extract_case_code_from_reference(case_ref):
-    """
-    Εξάγει τον κωδικό υπόθεσης από το πεδίο "Αφορά Υπόθεση".
-    
-    Παραδείγματα:
-    - "Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645" -> "2026/105673"
-    - "2026/105673" -> "2026/105673"
-    """
-    import re
-    if not case_ref:
-        return None
-    
-    # Pattern: YYYY/NNNNNN
-    match = re.search(r'(\d{4}/\d+)', str(case_ref))
-    if match:
-        return match.group(1).strip().upper()
-    
-    return None
-
-
 def filter_out_settled_from_incoming(incoming_records, settled_records):
     """
     Αφαιρεί από τις εισερχόμενες αιτήσεις αυτές που έχουν ήδη διεκπεραιωθεί.
@@ -364,30 +298,96 @@ def get_settled_for_incoming(incoming_record, settled_records):
     
     Args:
         incoming_record: Μια εισερχόμενη αίτηση
-        settled_records: Λίστα διεκπεραιωμένων
+        settled_records: SettledIndex (προτείνεται για επαναλαμβανόμενες κλήσεις) ή λίστα διεκπεραιωμένων
     
     Returns:
         dict ή None: Η διεκπεραιωμένη υπόθεση αν βρεθεί
     """
-    # Εξαγωγή case reference
-    case_ref = incoming_record.get('W007_P_FLD7', '')
-    if not case_ref:
-        return None
-    
-    case_code = _extract_case_code_from_reference(case_ref)
-    if not case_code:
-        return None
-    
-    # Αναζήτηση στις διεκπεραιωμένες
-    is_simplified = settled_records and 'case_code' in settled_records[0] if settled_records else False
-    
-    for rec in settled_records:
-        if is_simplified:
-            rec_code = rec.get('case_code', '')
+    if not isinstance(settled_records, SettledIndex):
+        settled_records = SettledIndex(settled_records)
+    return settled_records.match(incoming_record)[1]
+
+
+def normalize_case_code(code):
+    """Κανονική μορφή κωδικού υπόθεσης για κλειδί/αναζήτηση ("2026/105673")."""
+    return str(code or '').strip().upper()
+
+
+class SettledIndex(Mapping):
+    """Διεκπεραιωμένες ανά κανονικοποιημένο κωδικό υπόθεσης (W001_P_FLD2 / case_code).
+
+    Χτίζεται μία φορά από raw ή simplified εγγραφές (ή από έτοιμο mapping με
+    `from_mapping`) και απαντά σε O(1)· τα κλειδιά αναζήτησης κανονικοποιούνται.
+    `match` δοκιμάζει με τη σειρά YEAR/CASE_ID, protocol_number, related_case και
+    "Αφορά Υπόθεση" (W007_P_FLD7) μιας εισερχόμενης αίτησης.
+    """
+
+    __slots__ = ('_by_code',)
+
+    def __init__(self, records=()):
+        self._by_code = {}
+        for rec in records:
+            code = normalize_case_code(rec.get('case_code') or rec.get('W001_P_FLD2'))
+            if code:
+                self._by_code[code] = rec
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Index από {case_code: τιμή} (π.χ. settled_store summaries)."""
+        if isinstance(mapping, cls):
+            return mapping
+        index = cls()
+        for code, value in mapping.items():
+            code = normalize_case_code(code)
+            if code:
+                index._by_code[code] = value
+        return index
+
+    def __getitem__(self, case_code):
+        return self._by_code[normalize_case_code(case_code)]
+
+    def __contains__(self, case_code):
+        return normalize_case_code(case_code) in self._by_code
+
+    def __iter__(self):
+        return iter(self._by_code)
+
+    def __len__(self):
+        return len(self._by_code)
+
+    def get(self, case_code, default=None):
+        return self._by_code.get(normalize_case_code(case_code), default)
+
+    @staticmethod
+    def candidate_codes(incoming_record, use_related_case=True):
+        """Κωδικοί υπόθεσης μιας εισερχόμενης, με σειρά προτεραιότητας.
+
+        Χρησιμοποιεί τα `case_code`/`related_case_code` του simplify_incoming_records
+        όταν υπάρχουν (παλιά snapshots δεν τα έχουν, οπότε εξάγονται εδώ).
+        """
+        if 'case_code' in incoming_record:
+            case_code = incoming_record['case_code']
         else:
-            rec_code = rec.get('W001_P_FLD2', '')
-        
-        if rec_code and rec_code.strip().upper() == case_code:
-            return rec
-    
-    return None
+            case_code = incoming_case_code(incoming_record.get('submission_year'), incoming_record.get('case_id'))
+        if case_code:
+            yield case_code
+        protocol_number = normalize_case_code(incoming_record.get('protocol_number'))
+        if protocol_number:
+            yield protocol_number
+        if use_related_case:
+            if 'related_case_code' in incoming_record:
+                related = [incoming_record['related_case_code']]
+            else:
+                related = [extract_case_code(incoming_record.get(field))
+                           for field in ('related_case', 'W007_P_FLD7')]
+            for code in related:
+                if code:
+                    yield code
+
+    def match(self, incoming_record, use_related_case=True):
+        """(case_code, settled) για την πρώτη αντιστοίχιση, αλλιώς (None, None)."""
+        for code in self.candidate_codes(incoming_record, use_related_case):
+            settled = self._by_code.get(code)
+            if settled is not None:
+                return code, settled
+        return None, None
@@ -0,0 +1,169 @@
+"""Τοπικό αποθετήριο διεκπεραιωμένων υποθέσεων (queryId=19) με incremental συγχρονισμό.
+
+Οι εγγραφές W001 αποθηκεύονται στο KVStore (data/cache.sqlite3, namespace `settled_cases`)
+με κλειδί τον κανονικοποιημένο κωδικό υπόθεσης (W001_P_FLD2, π.χ. "2026/105673"), ώστε
+η αναζήτηση να είναι O(1) και κοινή για xls_export, εβδομαδιαία αναφορά και συσχετίσεις.
+
+Συγχρονισμός (`sync_settled_cases`):
+- πρώτη φορά, με `force` ή κάθε `settled_full_sync_interval`: πλήρης ανάκτηση
+- αλλιώς μόνο όσες έχουν Ημ/νία Διεκπεραίωσης (W001_P_FLD8) >= του watermark
+  (ταξινόμηση DESC, βλ. pagination.fetch_pages_since)· αν το portal αγνοήσει την
+  ταξινόμηση, γίνεται πλήρης ανάκτηση
+- όχι συχνότερα από `settled_sync_interval` (κοινό όριο για όλα τα processes)
+- για τις νέες διεκπεραιωμένες αφαιρούνται οι cached χρεώσεις (charge_cache) των
+  αντίστοιχων εισερχομένων του τελευταίου snapshot
+"""
+import os
+import threading
+import time
+
+import charge_cache
+from atomic_io import file_lock
+from config import SETTLED_CASES_DEFAULT_PARAMS, get_project_root
+from kv_store import get_kv_store
+from pagination import fetch_pages_since
+from settled_cases import SettledIndex, fetch_settled_cases, normalize_case_code
+from snapshot_store import get_snapshot_backend
+from utils import get_settings
+
+NAMESPACE = 'settled_cases'
+META_NAMESPACE = 'settled_cases_meta'
+COMPLETION_FIELD = 'W001_P_FLD8'
+DEFAULT_SYNC_INTERVAL = 3600  # seconds
+DEFAULT_FULL_SYNC_INTERVAL = 7 * 24 * 3600  # seconds
+
+_summaries = {}  # store path -> (synced_at, SettledIndex)
+_summaries_lock = threading.Lock()
+
+
+def _completion_stamp(rec):
+    return str(rec.get(COMPLETION_FIELD) or '').strip()
+
+
+def _intervals():
+    settings = get_settings()
+    return (settings.get('settled_sync_interval', DEFAULT_SYNC_INTERVAL),
+            settings.get('settled_full_sync_interval', DEFAULT_FULL_SYNC_INTERVAL))
+
+
+def _sync_lock_path():
+    return os.path.join(get_project_root(), 'data', 'settled_cases_sync')
+
+
+def get_sync_state(store=None):
+    """{'watermark', 'synced_at', 'full_synced_at', 'count'} του τελευταίου συγχρονισμού (ή None)."""
+    found = (store or get_kv_store()).get_many(META_NAMESPACE, ['sync'])
+    return found['sync'][0] if 'sync' in found else None
+
+
+def _evict_settled_charges(codes, store):
+    """Αφαιρεί τις cached χρεώσεις των εισερχομένων (τελευταίο snapshot) με κωδικό στο `codes`."""
+    backend = get_snapshot_backend()
+    dates = backend.dates()
+    if not codes or not dates:
+        return
+    snapshot = backend.load(dates[-1].strftime("%Y-%m-%d")) or {}
+    doc_ids = [
+        str(rec.get('doc_id', '')).strip()
+        for rec in snapshot.get('records', [])
+        if any(code in codes for code in SettledIndex.candidate_codes(rec, use_related_case=False))
+    ]
+    charge_cache.evict(doc_ids, store=store)
+
+
+def sync_settled_cases(monitor, force=False, store=None):
+    """Ενημερώνει το τοπικό αποθετήριο από το portal.
+
+    Returns:
+        int | None: Πλήθος εγγραφών που ανακτήθηκαν (0 αν ο συγχρονισμός ήταν πρόσφατος),
+        None αν απέτυχε η ανάκτηση.
+    """
+    store = store or get_kv_store()
+    with file_lock(_sync_lock_path()):
+        state = get_sync_state(store) or {}
+        interval, full_interval = _intervals()
+        now = time.time()
+        if not force and now - state.get('synced_at', 0) < interval:
+            return 0
+
+        full = force or not state.get('watermark') or now - state.get('full_synced_at', 0) >= full_interval
+        data = None
+        if not full:
+            data = fetch_pages_since(monitor, SETTLED_CASES_DEFAULT_PARAMS, COMPLETION_FIELD,
+                                     _completion_stamp, state['watermark'])
+            if data is None:
+                print("[WARNING] Αποτυχία incremental ανάκτησης διεκπεραιωμένων, πλήρης ανάκτηση")
+        if data is None:
+            full = True
+            data = fetch_settled_cases(monitor)
+            if not data.get('success'):
+                return None
+
+        records = {}
+        for rec in data.get('data', []):
+            code = normalize_case_code(rec.get('W001_P_FLD2'))
+            if code:
+                records[code] = rec
+        settled_now = set(records) - set(store.get_many(NAMESPACE, list(records)))
+        store.put_many(NAMESPACE, ((code, rec, True) for code, rec in records.items()))
+        if full and len(data.get('data', [])) >= data.get('total', 0):
+            # Μόνο με πλήρη λίστα αφαιρούνται όσες δεν επιστρέφει πλέον το portal
+            stale = set(store.items(NAMESPACE)) - set(records)
+            store.delete_many(NAMESPACE, stale)
+
+        stamps = [_completion_stamp(rec) for rec in records.values()]
+        state = {
+            'watermark': max([s for s in stamps if s] + [state.get('watermark') or '']) or None,
+            'synced_at': now,
+            'full_synced_at': now if full else state.get('full_synced_at', 0),
+            'count': store.count(NAMESPACE),
+        }
+        store.put_many(META_NAMESPACE, [('sync', state, True)])
+
+    try:
+        _evict_settled_charges(settled_now, store)
+    except Exception as exc:
+        print(f"[WARNING] Αποτυχία αφαίρεσης cached χρεώσεων διεκπεραιωμένων: {exc}")
+    return len(records)
+
+
+def load_settled_records(store=None):
+    """Όλες οι αποθηκευμένες εγγραφές W001 (raw, όπως τις επιστρέφει το portal)."""
+    return [value for value, _, _ in (store or get_kv_store()).items(NAMESPACE).values()]
+
+
+def get_settled_case(case_code, store=None):
+    """Η εγγραφή W001 ενός κωδικού υπόθεσης (ή None)."""
+    code = normalize_case_code(case_code)
+    found = (store or get_kv_store()).get_many(NAMESPACE, [code])
+    return found[code][0] if code in found else None
+
+
+def get_settled_summaries(monitor=None, store=None):
+    """SettledIndex {case_code: {'settled_date', 'assigned_employee'}} για αναζητήσεις O(1).
+
+    Με `monitor` γίνεται πρώτα συγχρονισμός (αν χρειάζεται). Το index μοιράζεται μεταξύ
+    των callers του process και ανανεώνεται μόνο μετά από νέο συγχρονισμό.
+    """
+    store = store or get_kv_store()
+    if monitor is not None:
+        try:
+            if sync_settled_cases(monitor, store=store) is None:
+                print("[WARNING] Αποτυχία συγχρονισμού διεκπεραιωμένων, χρήση τοπικών δεδομένων")
+        except Exception as exc:
+            print(f"[WARNING] Σφάλμα συγχρονισμού διεκπεραιωμένων: {exc}")
+
+    synced_at = (get_sync_state(store) or {}).get('synced_at')
+    with _summaries_lock:
+        cached = _summaries.get(store.path)
+        if cached and cached[0] == synced_at:
+            return cached[1]
+        summaries = SettledIndex.from_mapping({
+            code: {
+                'settled_date': str(rec.get('W001_P_FLD3', '')).strip(),
+                'assigned_employee': str(rec.get('W001_P_FLD10', '')).strip(),
+            }
+            for code, (rec, _, _) in store.items(NAMESPACE).items()
+        })
+        _summaries[store.path] = (synced_at, summaries)
+        return summaries
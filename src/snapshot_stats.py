@@ -0,0 +1,78 @@
+"""Προϋπολογισμένα στατιστικά ανά snapshot εισερχομένων (sidecar αρχεία).
+
+Γράφονται μαζί με κάθε snapshot στο data/incoming_requests/stats/stats_YYYY-MM-DD.json
+και περιέχουν σύνολα, πραγματικές/δοκιμαστικές, ανάλυση δοκιμαστικών και πλήθη ανά
+Διεύθυνση και Γενική Διεύθυνση. Τα history/trend endpoints διαβάζουν μόνο αυτά, όχι
+ολόκληρα snapshots. Αν λείπει το sidecar ή άλλαξε το test_users.json (διαφορετικό
+`test_users_signature`), υπολογίζεται ξανά από το snapshot και αποθηκεύεται.
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+
+from config import get_data_path
+from serialization import read_file, write_file
+from snapshot_store import get_snapshot_backend
+
+
+def get_snapshot_stats_path(date_str):
+    stats_dir = get_data_path('incoming_requests', 'stats')
+    os.makedirs(stats_dir, exist_ok=True)
+    return os.path.join(stats_dir, f'stats_{date_str}.json')
+
+
+_signature_cache = None  # ((path, mtime_ns, size), signature)
+
+
+def _test_users_signature():
+    """Hash του test_users.json· υπολογίζεται ξανά μόνο όταν αλλάξει το αρχείο (mtime/μέγεθος)."""
+    global _signature_cache
+    from test_users import get_test_users_config_path, load_test_users_config
+    path = get_test_users_config_path()
+    try:
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = (path, None, None)
+    cached = _signature_cache
+    if cached and cached[0] == key:
+        return cached[1]
+    config = json.dumps(load_test_users_config(), sort_keys=True, ensure_ascii=False)
+    signature = hashlib.sha1(config.encode('utf-8')).hexdigest()[:12]
+    _signature_cache = (key, signature)
+    return signature
+
+
+def compute_snapshot_stats(date_str, records):
+    """Στατιστικά ενός snapshot (δεν τροποποιεί τις εγγραφές του καλούντα)."""
+    from test_users import get_record_stats
+    records = [dict(r) for r in records]
+    stats = get_record_stats(records)
+    return {
+        'date': date_str,
+        'total': stats['total'],
+        'real': stats['real'],
+        'test': stats['test'],
+        'test_breakdown': stats['test_breakdown'],
+        'by_directory': dict(Counter(r.get('directory') or '' for r in records)),
+        'by_general_directorate': dict(Counter(r.get('general_directorate') or '' for r in records)),
+        'test_users_signature': _test_users_signature(),
+    }
+
+
+def save_snapshot_stats(date_str, records):
+    stats = compute_snapshot_stats(date_str, records)
+    write_file(get_snapshot_stats_path(date_str), stats)
+    return stats
+
+
+def load_snapshot_stats(date_str):
+    """Στατιστικά ημέρας από το sidecar (ή από το snapshot αν λείπει/είναι παλιό). None αν δεν υπάρχει snapshot."""
+    stats = read_file(get_snapshot_stats_path(date_str))
+    if stats and stats.get('test_users_signature') == _test_users_signature():
+        return stats
+    snapshot = get_snapshot_backend().load(date_str)
+    if not snapshot:
+        return None
+    return save_snapshot_stats(date_str, snapshot.get('records', []))
@@ -0,0 +1,510 @@
+"""Backends αποθήκευσης ημερήσιων snapshots εισερχόμενων αιτήσεων.
+
+Το `incoming.load_incoming_snapshot` / `save_incoming_snapshot` κρατούν το ίδιο API
+και αναθέτουν στο backend που ορίζει το `snapshot_backend` του config:
+- `json`: ένα αρχείο data/incoming_requests/incoming_YYYY-MM-DD.json ανά ημέρα (default)
+- `sqlite`: data/snapshots.sqlite3 (WAL) με indexes σε date, case_id, doc_id, directory
+  και submitted_at, ώστε τα range queries να μη φορτώνουν ολόκληρες ημέρες στη μνήμη
+- `delta`: περιοδικό πλήρες keyframe (incoming_YYYY-MM-DD.json, ίδια μορφή με το json)
+  και για τις ενδιάμεσες ημέρες μόνο οι αλλαγές (incoming_YYYY-MM-DD.delta.json)
+
+Η μεταφορά των υπαρχόντων JSON γίνεται με:
+    python src/snapshot_store.py --import-json
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from config import get_data_path
+from atomic_io import file_lock
+from date_index import SnapshotDateIndex
+from incoming_record import to_builtin
+from serialization import read_file, read_file_sized, write_file
+from utils import get_settings
+
+# Πεδία που αποθηκεύονται και ως στήλες (με index) στο sqlite backend
+INDEXED_FIELDS = ('case_id', 'doc_id', 'directory', 'submitted_at')
+
+
+def _parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+DEFAULT_CACHE_MAX_MB = 256
+_PARSED_OVERHEAD = 4  # εκτίμηση: αντικείμενα Python ~4x το μέγεθος του JSON χωρίς συμπίεση
+
+
+class SnapshotCache:
+    """Process-wide LRU των parsed snapshot αρχείων, με κλειδί (path, mtime, μέγεθος).
+
+    Επαναλαμβανόμενα history queries δεν ξαναδιαβάζουν ούτε ξανακάνουν parse αρχεία που
+    δεν άλλαξαν. Το κόστος κάθε εγγραφής εκτιμάται από το μέγεθος των δεδομένων μετά την
+    αποσυμπίεση (ο `loader` επιστρέφει `(payload, bytes)`, βλ. read_file_sized) και οι
+    παλαιότερες αφαιρούνται όταν ξεπεραστεί το `max_bytes`. Επιστρέφει αντίγραφα των
+    εγγραφών, ώστε οι καλούντες να μπορούν να τις τροποποιούν.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = get_settings().get('snapshot_cache_max_mb', DEFAULT_CACHE_MAX_MB) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(payload):
+        if not isinstance(payload, dict) or not isinstance(payload.get('records'), list):
+            return payload
+        return dict(payload, records=[dict(r) for r in payload['records']])
+
+    def get(self, path, loader):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return self._copy(entry[2])
+            self.misses += 1
+        payload, size = loader(path)
+        cost = size * _PARSED_OVERHEAD
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old:
+                self.total_bytes -= old[1]
+            if payload is not None and cost <= self.max_bytes:
+                self._entries[path] = (signature, cost, payload)
+                self.total_bytes += cost
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_cost, _) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted_cost
+        return self._copy(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+_snapshot_cache = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache():
+    """Το κοινό SnapshotCache του process (δημιουργείται lazily)."""
+    global _snapshot_cache
+    with _snapshot_cache_lock:
+        if _snapshot_cache is None:
+            _snapshot_cache = SnapshotCache()
+        return _snapshot_cache
+
+
+def _matches(rec, filters):
+    return all(str(rec.get(field, '')) == str(value) for field, value in filters.items())
+
+
+class JsonSnapshotBackend:
+    """Ένα JSON αρχείο ανά ημέρα (η αρχική μορφή αποθήκευσης)."""
+
+    name = 'json'
+
+    suffixes = ('.json',)
+
+    def __init__(self, directory=None):
+        self.directory = directory or get_data_path('incoming_requests')
+        self._index = SnapshotDateIndex(self.directory, 'incoming_', self.suffixes)
+
+    def path(self, date_str):
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f'incoming_{date_str}.json')
+
+    def load(self, date_str):
+        return get_snapshot_cache().get(self.path(date_str), read_file_sized)
+
+    def save(self, date_str, records):
+        payload = {'date': date_str, 'count': len(records), 'records': records}
+        write_file(self.path(date_str), payload)
+        self._index.add(date_str)
+
+    def saved_at(self, date_str):
+        """Χρόνος (epoch) τελευταίας αποθήκευσης του snapshot της ημέρας ή None."""
+        try:
+            return os.stat(self.path(date_str)).st_mtime
+        except OSError:
+            return None
+
+    def dates(self):
+        return self._index.dates()
+
+    def previous_date(self, date_str):
+        """Η αμέσως προηγούμενη ημερομηνία με snapshot (bisect στο index) ή None."""
+        found = self._index.previous(date_str)
+        return found.strftime("%Y-%m-%d") if found else None
+
+    def next_date(self, date_str):
+        found = self._index.next(date_str)
+        return found.strftime("%Y-%m-%d") if found else None
+
+    def iter_records(self, start_date=None, end_date=None, submitted_from=None, submitted_to=None, **filters):
+        """Εγγραφές (date_str, record) στο διάστημα ημερομηνιών· φορτώνει μία ημέρα τη φορά."""
+        for day in self.dates():
+            date_str = day.strftime("%Y-%m-%d")
+            if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+                continue
+            snapshot = self.load(date_str) or {}
+            for rec in snapshot.get('records', []):
+                submitted_at = rec.get('submitted_at', '')
+                if submitted_from and submitted_at < submitted_from:
+                    continue
+                if submitted_to and submitted_at > submitted_to:
+                    continue
+                if _matches(rec, filters):
+                    yield date_str, rec
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    date TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_records (
+    date TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    case_id TEXT,
+    doc_id TEXT,
+    directory TEXT,
+    submitted_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (date, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_records_case_id ON snapshot_records (case_id, date);
+CREATE INDEX IF NOT EXISTS idx_snapshot_records_doc_id ON snapshot_records (doc_id, date);
+CREATE INDEX IF NOT EXISTS idx_snapshot_records_directory ON snapshot_records (directory, date);
+CREATE INDEX IF NOT EXISTS idx_snapshot_records_submitted_at ON snapshot_records (submitted_at);
+"""
+
+
+class SqliteSnapshotBackend:
+    """Snapshots σε SQLite: μία γραμμή ανά εγγραφή, με τη σειρά της λίστας (pos)."""
+
+    name = 'sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or get_data_path('snapshots.sqlite3')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._conn.commit()
+
+    def load(self, date_str):
+        with self._lock:
+            row = self._conn.execute("SELECT count FROM snapshots WHERE date = ?", (date_str,)).fetchone()
+            if row is None:
+                return None
+            records = [json.loads(data) for (data,) in self._conn.execute(
+                "SELECT data FROM snapshot_records WHERE date = ? ORDER BY pos", (date_str,))]
+        return {'date': date_str, 'count': row[0], 'records': records}
+
+    def save(self, date_str, records):
+        rows = [
+            (date_str, pos, *(str(rec.get(field, '') or '') for field in INDEXED_FIELDS),
+             json.dumps(rec, ensure_ascii=False, default=to_builtin))
+            for pos, rec in enumerate(records)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM snapshot_records WHERE date = ?", (date_str,))
+            self._conn.executemany(
+                "INSERT INTO snapshot_records (date, pos, case_id, doc_id, directory, submitted_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (date, count, saved_at) VALUES (?, ?, ?)",
+                (date_str, len(records), time.time()))
+
+    def saved_at(self, date_str):
+        with self._lock:
+            row = self._conn.execute("SELECT saved_at FROM snapshots WHERE date = ?", (date_str,)).fetchone()
+        return row[0] if row else None
+
+    def dates(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT date FROM snapshots ORDER BY date").fetchall()
+        return [d for d in (_parse_date(date_str) for (date_str,) in rows) if d]
+
+    def previous_date(self, date_str):
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(date) FROM snapshots WHERE date < ?", (date_str,)).fetchone()
+        return row[0] if row else None
+
+    def next_date(self, date_str):
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(date) FROM snapshots WHERE date > ?", (date_str,)).fetchone()
+        return row[0] if row else None
+
+    def iter_records(self, start_date=None, end_date=None, submitted_from=None, submitted_to=None, **filters):
+        """Εγγραφές (date_str, record) μέσω indexed query· διαβάζονται σταδιακά από τον cursor."""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Μη υποστηριζόμενα φίλτρα: {', '.join(sorted(unknown))}")
+        clauses, args = [], []
+        for column, op, value in (('date', '>=', start_date), ('date', '<=', end_date),
+                                  ('submitted_at', '>=', submitted_from), ('submitted_at', '<=', submitted_to)):
+            if value:
+                clauses.append(f"{column} {op} ?")
+                args.append(value)
+        for field, value in filters.items():
+            clauses.append(f"{field} = ?")
+            args.append(str(value))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        # Ξεχωριστός cursor ώστε να μην κρατάμε όλο το αποτέλεσμα στη μνήμη
+        cursor = self._conn.cursor()
+        with self._lock:
+            cursor.execute(f"SELECT date, data FROM snapshot_records {where} ORDER BY date, pos", args)
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(500)
+            if not batch:
+                break
+            for date_str, data in batch:
+                yield date_str, json.loads(data)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+DEFAULT_KEYFRAME_INTERVAL = 7  # deltas μεταξύ δύο πλήρων keyframes
+DEFAULT_DELTA_CACHE_DAYS = 8  # ανακατασκευασμένες ημέρες στο LRU
+
+
+def _record_key(rec):
+    from incoming import _get_unique_key
+    return _get_unique_key(rec)
+
+
+class DeltaSnapshotBackend(JsonSnapshotBackend):
+    """Keyframe + ημερήσια deltas (νέες/αλλαγμένες εγγραφές και keys που αφαιρέθηκαν).
+
+    Τα υπάρχοντα incoming_*.json λειτουργούν ως keyframes, οπότε δεν χρειάζεται μετατροπή.
+    Κάθε delta αναφέρεται στο αμέσως προηγούμενο snapshot (`base`)· η ανάγνωση μιας ημέρας
+    ξεκινά από το πλησιέστερο keyframe και εφαρμόζει τα deltas, με LRU των ανακατασκευασμένων
+    ημερών (ελέγχεται με το mtime/μέγεθος του αρχείου κάθε ημέρας, ώστε να βλέπει εγγραφές
+    άλλων processes). Η σειρά εγγραφών αποθηκεύεται ρητά μόνο όταν διαφέρει από την προκύπτουσα.
+    """
+
+    name = 'delta'
+    suffixes = ('.delta.json', '.json')
+
+    def __init__(self, directory=None, keyframe_interval=None, cache_days=None):
+        super().__init__(directory)
+        settings = get_settings()
+        self.keyframe_interval = keyframe_interval or settings.get(
+            'snapshot_keyframe_interval', DEFAULT_KEYFRAME_INTERVAL)
+        self.cache_days = cache_days or settings.get('snapshot_delta_cache_days', DEFAULT_DELTA_CACHE_DAYS)
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    def delta_path(self, date_str):
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f'incoming_{date_str}.delta.json')
+
+    def _read_delta(self, date_str):
+        return read_file(self.delta_path(date_str))
+
+    def _chain_length(self, date_str):
+        """Πόσα deltas χωρίζουν την ημέρα από το keyframe της."""
+        length = 0
+        while date_str and not os.path.exists(self.path(date_str)):
+            delta = self._read_delta(date_str)
+            if delta is None:
+                break
+            length += 1
+            date_str = delta.get('base')
+        return length
+
+    def _reconstruct(self, date_str):
+        chain = []
+        current = date_str
+        base = None
+        while current:
+            cached = self._cache.get(current)
+            if cached and cached[0] == self._signature(current):
+                base = cached[1]
+                self._cache.move_to_end(current)
+                break
+            if os.path.exists(self.path(current)):
+                base = JsonSnapshotBackend.load(self, current)['records']
+                break
+            delta = self._read_delta(current)
+            if delta is None:
+                return None
+            chain.append((current, delta))
+            current = delta.get('base')
+        if base is None and chain and chain[-1][1].get('base'):
+            return None
+        records = list(base or [])
+        for day, delta in reversed(chain):
+            records = self._apply(records, delta)
+            self._remember(day, records)
+        if not chain:
+            self._remember(date_str, records)
+        return records
+
+    @staticmethod
+    def _apply(records, delta):
+        by_key = OrderedDict((_record_key(r), r) for r in records)
+        for key in delta.get('removed', []):
+            by_key.pop(key, None)
+        upserts = OrderedDict((_record_key(r), r) for r in delta.get('upserts', []))
+        added = [r for key, r in upserts.items() if key not in by_key]
+        for key, rec in upserts.items():
+            if key in by_key:
+                by_key[key] = rec
+        if 'order' in delta:
+            merged = dict(by_key)
+            merged.update((_record_key(r), r) for r in added)
+            return [merged[key] for key in delta['order']]
+        return added + list(by_key.values())
+
+    def _signature(self, date_str):
+        """(είδος, mtime, μέγεθος) του αρχείου της ημέρας· αλλάζει όταν το γράψει άλλο process."""
+        for kind, path in (('keyframe', self.path(date_str)), ('delta', self.delta_path(date_str))):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return kind, st.st_mtime_ns, st.st_size
+        return None
+
+    def saved_at(self, date_str):
+        """mtime του keyframe ή του delta αρχείου της ημέρας (ή None)."""
+        signature = self._signature(date_str)
+        return signature[1] / 1e9 if signature else None
+
+    def _remember(self, date_str, records):
+        self._cache[date_str] = (self._signature(date_str), records)
+        self._cache.move_to_end(date_str)
+        while len(self._cache) > self.cache_days:
+            self._cache.popitem(last=False)
+
+    def load(self, date_str):
+        with self._lock:
+            records = self._reconstruct(date_str)
+        if records is None:
+            return None
+        # Αντίγραφα ώστε οι καλούντες να μπορούν να τροποποιούν τις εγγραφές χωρίς να αλλοιώνουν το LRU
+        records = [dict(r) for r in records]
+        return {'date': date_str, 'count': len(records), 'records': records}
+
+    def _write_keyframe(self, date_str, records):
+        JsonSnapshotBackend.save(self, date_str, records)
+        if os.path.exists(self.delta_path(date_str)):
+            os.remove(self.delta_path(date_str))
+
+    def _build_delta(self, date_str, base_date, base_records, records):
+        prev = OrderedDict((_record_key(r), r) for r in base_records)
+        curr = OrderedDict((_record_key(r), r) for r in records)
+        delta = {
+            'date': date_str,
+            'base': base_date,
+            'count': len(records),
+            'upserts': [r for key, r in curr.items() if prev.get(key) != r],
+            'removed': [key for key in prev if key not in curr],
+        }
+        if [_record_key(r) for r in self._apply(base_records, delta)] != list(curr):
+            delta['order'] = list(curr)
+        return delta
+
+    def save(self, date_str, records):
+        records = [dict(r) for r in records]
+        # Η αποθήκευση αγγίζει έως τρία αρχεία: κλείδωμα και μεταξύ processes (API / CLI)
+        with self._lock, file_lock(os.path.join(self.directory, 'snapshots')):
+            next_date = self.next_date(date_str)
+            # Το επόμενο snapshot μπορεί να βασίζεται σε αυτή την ημέρα: γίνεται πρώτα keyframe
+            if next_date and not os.path.exists(self.path(next_date)):
+                next_delta = self._read_delta(next_date)
+                if next_delta and next_delta.get('base') == date_str:
+                    self._write_keyframe(next_date, self._reconstruct(next_date))
+            for day in [d for d in self._cache if d >= date_str]:
+                self._cache.pop(day, None)
+
+            base_date = self.previous_date(date_str)
+            base_records = self._reconstruct(base_date) if base_date else None
+            unique = len({_record_key(r) for r in records}) == len(records)
+            if (base_records is None or not unique
+                    or self._chain_length(base_date) + 1 >= self.keyframe_interval):
+                self._write_keyframe(date_str, records)
+            else:
+                delta = self._build_delta(date_str, base_date, base_records, records)
+                write_file(self.delta_path(date_str), delta)
+                self._index.add(date_str)
+                if os.path.exists(self.path(date_str)):
+                    os.remove(self.path(date_str))
+            self._remember(date_str, records)
+
+
+_BACKENDS = {'json': JsonSnapshotBackend, 'sqlite': SqliteSnapshotBackend, 'delta': DeltaSnapshotBackend}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_snapshot_backend():
+    """Το backend του process σύμφωνα με το `snapshot_backend` (default: json)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            name = get_settings().get('snapshot_backend', 'json')
+            if name not in _BACKENDS:
+                print(f"[WARNING] Άγνωστο snapshot_backend '{name}', χρήση json")
+                name = 'json'
+            _backend = _BACKENDS[name]()
+        return _backend
+
+
+def import_json_snapshots(target=None, source=None, overwrite=False):
+    """Αντιγράφει τα υπάρχοντα incoming_*.json στο `target` backend. Επιστρέφει πόσα εισήχθησαν."""
+    target = target or get_snapshot_backend()
+    source = source or JsonSnapshotBackend()
+    existing = set() if overwrite else set(target.dates())
+    imported = 0
+    for day in source.dates():
+        if day in existing:
+            continue
+        date_str = day.strftime("%Y-%m-%d")
+        snapshot = source.load(date_str)
+        if snapshot is None:
+            continue
+        target.save(date_str, snapshot.get('records', []))
+        imported += 1
+    return imported
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Μεταφορά JSON snapshots στο sqlite backend')
+    parser.add_argument('--import-json', action='store_true', help='Εισαγωγή data/incoming_requests/*.json')
+    parser.add_argument('--overwrite', action='store_true', help='Αντικατάσταση ημερών που υπάρχουν ήδη')
+    args = parser.parse_args()
+    if args.import_json:
+        count = import_json_snapshots(SqliteSnapshotBackend(), overwrite=args.overwrite)
+        print(f"✅ Εισήχθησαν {count} snapshots στο {get_data_path('snapshots.sqlite3')}")
+    else:
+        parser.print_help()
@@ -2,6 +2,8 @@ import yaml
 import os
 from dotenv import load_dotenv
 
+_settings_cache = None
+
 def log_message(message, level='INFO'):
     """Logs a message with a specified level."""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -24,6 +26,23 @@ def load_config(config_path):
     
     return config
 
+def get_settings():
+    """Επιστρέφει τις ρυθμίσεις του config/config.yaml (φορτώνονται μία φορά ανά process).
+
+    Προορίζεται για runtime ρυθμίσεις (TTL, διαστήματα ανανέωσης, workers) που
+    διαβάζονται από modules χωρίς δικό τους config object.
+    """
+    global _settings_cache
+    if _settings_cache is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config_path = os.path.join(project_root, 'config', 'config.yaml')
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                _settings_cache = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError):
+            _settings_cache = {}
+    return _settings_cache
+
 def save_log_to_file(log_data, log_file):
     """Saves log data to a specified file."""
     with open(log_file, 'a', encoding='utf-8') as f:
@@ -5,6 +5,7 @@ except ImportError:  # pragma: no cover - app factory guarded by import elsewher
     FastAPI = None
 
 from . import routes_daily, routes_export, routes_incoming, routes_procedures, routes_search, routes_status
+from .background import lifespan
 
 
 def create_app() -> "FastAPI":
@@ -15,6 +16,7 @@ def create_app() -> "FastAPI":
         title="PKM Monitor API",
         version="1.0.0",
         description="API για πρόσβαση στα δεδομένα παρακολούθησης του PKM Portal",
+        lifespan=lifespan,
     )
 
     app.include_router(routes_daily.router)
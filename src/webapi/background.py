@@ -0,0 +1,50 @@
+"""Background ανανέωση του digest για τα /sede/* endpoints."""
+import asyncio
+from contextlib import asynccontextmanager
+
+from services.report_service import get_digest_cache
+from utils import get_settings
+from .executor import run_blocking, shutdown_executor
+
+DEFAULT_DIGEST_REFRESH_INTERVAL = 900  # seconds
+
+
+async def refresh_digest_periodically(interval: float) -> None:
+    """Ξαναχτίζει το digest κάθε `interval` δευτερόλεπτα και το δημοσιεύει στους readers.
+
+    Το rebuild τρέχει στο thread pool του API ώστε να μη μπλοκάρει το event loop. Αν αποτύχει,
+    οι readers συνεχίζουν να βλέπουν το τελευταίο επιτυχημένο digest.
+    """
+    cache = get_digest_cache()
+    while True:
+        try:
+            await run_blocking(cache.refresh)
+        except Exception as exc:
+            print(f"[WARNING] Αποτυχία background ανανέωσης digest: {exc}")
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Ξεκινά τον refresher με την εκκίνηση της εφαρμογής και τον σταματά στο shutdown.
+
+    Με `digest_refresh_interval: 0` ο refresher απενεργοποιείται και το digest
+    ανανεώνεται από τα ίδια τα requests (TTL του DigestCache).
+    """
+    interval = get_settings().get("digest_refresh_interval", DEFAULT_DIGEST_REFRESH_INTERVAL)
+    cache = get_digest_cache()
+    task = None
+    if interval and interval > 0:
+        cache.revalidate_on_read = False
+        task = asyncio.create_task(refresh_digest_periodically(interval))
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            cache.revalidate_on_read = True
+        shutdown_executor()
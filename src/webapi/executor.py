@@ -0,0 +1,57 @@
+"""Εκτέλεση blocking κώδικα (portal requests, αρχεία, openpyxl) εκτός event loop.
+
+Όλα τα handlers είναι `async def`, οπότε κάθε blocking κλήση πρέπει να περνά από
+`run_blocking` ώστε να τρέχει σε bounded thread pool και να μην παγώνει τα
+υπόλοιπα endpoints (π.χ. /health) όσο τρέχει ένα export.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_settings
+
+DEFAULT_BLOCKING_WORKERS = 8
+DEFAULT_MAX_CONCURRENT_EXPORTS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+_export_slots = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Επιστρέφει το κοινό thread pool (μέγεθος από `api_blocking_workers`)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = get_settings().get("api_blocking_workers", DEFAULT_BLOCKING_WORKERS)
+            _executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="api-blocking")
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor, _export_slots
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+    _export_slots = None
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Τρέχει `func(*args, **kwargs)` στο thread pool και επιστρέφει το αποτέλεσμα."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def export_slots() -> asyncio.Semaphore:
+    """Όριο ταυτόχρονων exports (`api_max_concurrent_exports`).
+
+    Τα exports είναι τα βαρύτερα jobs· με το όριο αυτό δεν μπορούν να καταλάβουν
+    όλους τους workers του pool.
+    """
+    global _export_slots
+    if _export_slots is None:
+        limit = get_settings().get("api_max_concurrent_exports", DEFAULT_MAX_CONCURRENT_EXPORTS)
+        _export_slots = asyncio.Semaphore(max(1, int(limit)))
+    return _export_slots
@@ -0,0 +1,23 @@
+"""JSON απαντήσεις του API που σειριοποιούν και εγγραφές `IncomingRecord`.
+
+Το digest κρατά τις εισερχόμενες ως IncomingRecord (slots, βλ. incoming_record)· εδώ
+μετατρέπονται σε dict μόνο τη στιγμή της απάντησης, με την ίδια μορφή JSON.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse as _JSONResponse
+
+from incoming_record import to_builtin
+
+
+class JSONResponse(_JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=to_builtin,
+        ).encode("utf-8")
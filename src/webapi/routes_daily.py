@@ -3,12 +3,11 @@ from datetime import datetime, timedelta
 from typing import Optional, Annotated
 
 from fastapi import APIRouter, Body, Query
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from incoming import load_incoming_snapshot
-from services.report_service import load_digest, count_changes, incoming_stats
-from test_users import get_record_stats
+from services.report_service import load_digest, count_changes, incoming_stats, snapshot_stats
+from .executor import run_blocking
+from .responses import JSONResponse
 
 router = APIRouter()
 
@@ -28,11 +27,7 @@ async def get_sede_daily(
     - reload (bool): Αν True, αγνοεί cache και κάνει πλήρη rebuild της αναφοράς.
     """
     try:
-        if reload:
-            from sede_report import get_daily_sede_report
-            report = get_daily_sede_report(fast_mode=True, force_reload=True)
-        else:
-            report = load_digest()
+        report = await run_blocking(load_digest, reload=reload)
         incoming = report.get("incoming", {})
         incoming_changes = incoming.get("changes", {})
         active_changes = (report.get("active") or {}).get("changes") or {}
@@ -76,7 +71,7 @@ async def get_sede_daily(
 async def get_summary():
     """Επιστρέφει σύνοψη με βασικά νούμερα."""
     try:
-        report = load_digest()
+        report = await run_blocking(load_digest)
         incoming = report.get("incoming", {})
         active_changes = (report.get("active") or {}).get("changes") or {}
         all_changes = (report.get("all") or {}).get("changes") or {}
@@ -112,7 +107,7 @@ async def get_summary():
 async def get_stats():
     """Επιστρέφει λεπτομερή στατιστικά."""
     try:
-        report = load_digest()
+        report = await run_blocking(load_digest)
         incoming = report.get("incoming", {})
         total, real, test = incoming_stats(report)
 
@@ -163,12 +158,10 @@ async def post_period_summary(request: PeriodSummaryRequest = Body(...)):
         
         for i in range(days):
             date_str = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            snapshot = load_incoming_snapshot(date_str)
+            day_stats = await run_blocking(snapshot_stats, date_str)
             
-            if snapshot:
-                records = snapshot.get("records", [])
-                stats = get_record_stats(records)
-                day_total = len(records)
+            if day_stats:
+                day_total, stats = day_stats
                 day_real = stats.get("real", 0)
                 day_test = stats.get("test", 0)
                 
@@ -3,33 +3,38 @@ import csv
 import io
 
 from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 
 from services.report_service import load_digest
 from xls_export import build_requests_xls
+from .executor import export_slots, run_blocking
+from .responses import JSONResponse
 from .state import get_monitor
 
 router = APIRouter()
 
 
+def _records_to_csv(records) -> str:
+    output = io.StringIO()
+    if records:
+        fieldnames = list(records[0].keys())
+        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+    return output.getvalue()
+
+
 @router.get("/sede/export/csv", tags=["Export"])
 async def export_csv():
     """Επιστρέφει δεδομένα σε CSV format."""
     try:
-        report = load_digest()
+        report = await run_blocking(load_digest)
         incoming = report.get("incoming", {})
         records = incoming.get("records", [])
+        csv_text = await run_blocking(_records_to_csv, records)
 
-        output = io.StringIO()
-        if records:
-            fieldnames = list(records[0].keys())
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(records)
-
-        output.seek(0)
         return StreamingResponse(
-            iter([output.getvalue()]),
+            iter([csv_text]),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=sede_incoming_{incoming.get('date')}.csv"},
         )
@@ -46,14 +51,15 @@ async def export_xls(scope: str = Query(default="new", pattern="^(new|all)$", de
     try:
         from urllib.parse import quote
         
-        report = load_digest()
-        incoming = report.get("incoming", {})
-        date_str = incoming.get("date") or report.get("generated_at", "")[:10]
+        async with export_slots():
+            report = await run_blocking(load_digest)
+            incoming = report.get("incoming", {})
+            date_str = incoming.get("date") or report.get("generated_at", "")[:10]
 
-        # Get monitor instance for settled cases lookup
-        monitor = get_monitor()
-        
-        xls_bytes = build_requests_xls(report, scope=scope, monitor_instance=monitor)
+            # Get monitor instance for settled cases lookup
+            monitor = await run_blocking(get_monitor)
+
+            xls_bytes = await run_blocking(build_requests_xls, report, scope=scope, monitor_instance=monitor)
         filename = "Διαδικασίες - εισερχόμενες αιτήσεις.xlsx" if scope == "all" else f"incoming_{scope}_{date_str}.xlsx"
         # RFC 5987 encoding for non-ASCII filenames
         filename_encoded = quote(filename, safe="")
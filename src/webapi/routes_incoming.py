@@ -2,17 +2,18 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 from incoming import compare_incoming_records, load_incoming_snapshot
-from services.report_service import load_digest
+from services.report_service import load_digest, snapshot_stats
 from test_users import classify_records, get_record_stats
+from .executor import run_blocking
+from .responses import JSONResponse
 
 router = APIRouter()
 
 
-def _incoming_section():
-    report = load_digest()
+async def _incoming_section():
+    report = await run_blocking(load_digest)
     return report.get("incoming", {})
 
 
@@ -20,7 +21,7 @@ def _incoming_section():
 async def get_incoming():
     """Επιστρέφει όλες τις εισερχόμενες αιτήσεις."""
     try:
-        incoming = _incoming_section()
+        incoming = await _incoming_section()
         return JSONResponse(
             content={
                 "date": incoming.get("date"),
@@ -41,7 +42,7 @@ async def get_incoming():
 async def get_incoming_new():
     """Επιστρέφει μόνο νέες αιτήσεις (real + test)."""
     try:
-        incoming = _incoming_section()
+        incoming = await _incoming_section()
         return JSONResponse(
             content={
                 "date": incoming.get("date"),
@@ -62,9 +63,9 @@ async def get_incoming_new():
 async def get_incoming_real():
     """Επιστρέφει μόνο πραγματικές αιτήσεις."""
     try:
-        incoming = _incoming_section()
+        incoming = await _incoming_section()
         records = incoming.get("records", [])
-        real, _ = classify_records(records)
+        real, _ = await run_blocking(classify_records, records)
         return JSONResponse(
             content={"date": incoming.get("date"), "total": len(real), "records": real},
             status_code=200,
@@ -80,9 +81,9 @@ async def get_incoming_real():
 async def get_incoming_test():
     """Επιστρέφει μόνο δοκιμαστικές αιτήσεις."""
     try:
-        incoming = _incoming_section()
+        incoming = await _incoming_section()
         records = incoming.get("records", [])
-        _, test = classify_records(records)
+        _, test = await run_blocking(classify_records, records)
         return JSONResponse(
             content={"date": incoming.get("date"), "total": len(test), "records": test},
             status_code=200,
@@ -98,7 +99,7 @@ async def get_incoming_test():
 async def get_incoming_changes():
     """Επιστρέφει μόνο αλλαγές εισερχόμενων."""
     try:
-        incoming = _incoming_section()
+        incoming = await _incoming_section()
         changes = incoming.get("changes", {})
         return JSONResponse(
             content={
@@ -126,12 +127,12 @@ async def get_incoming_changes():
 async def get_incoming_by_date(date: str):
     """Επιστρέφει snapshot συγκεκριμένης ημερομηνίας (YYYY-MM-DD)."""
     try:
-        snapshot = load_incoming_snapshot(date)
+        snapshot = await run_blocking(load_incoming_snapshot, date)
         if not snapshot:
             return JSONResponse(content={"error": f"Δεν βρέθηκε snapshot για {date}"}, status_code=404)
 
         records = snapshot.get("records", [])
-        stats = get_record_stats(records)
+        stats = await run_blocking(get_record_stats, records)
         return JSONResponse(
             content={"date": date, "total": len(records), "stats": stats, "records": records},
             status_code=200,
@@ -152,14 +153,13 @@ async def get_daily_history(days: int = 7):
 
         for i in range(days):
             snapshot_date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            snapshot = load_incoming_snapshot(snapshot_date)
-            if snapshot:
-                records = snapshot.get("records", [])
-                stats = get_record_stats(records)
+            day_stats = await run_blocking(snapshot_stats, snapshot_date)
+            if day_stats:
+                total, stats = day_stats
                 history.append(
                     {
                         "date": snapshot_date,
-                        "total": len(records),
+                        "total": total,
                         "real": stats.get("real", 0),
                         "test": stats.get("test", 0),
                     }
@@ -177,8 +177,8 @@ async def get_daily_history(days: int = 7):
 async def compare_dates(date1: str, date2: str):
     """Σύγκριση δύο ημερομηνιών."""
     try:
-        snap1 = load_incoming_snapshot(date1)
-        snap2 = load_incoming_snapshot(date2)
+        snap1 = await run_blocking(load_incoming_snapshot, date1)
+        snap2 = await run_blocking(load_incoming_snapshot, date2)
         if not snap1:
             return JSONResponse(content={"error": f"Δεν βρέθηκε snapshot για {date1}"}, status_code=404)
         if not snap2:
@@ -186,9 +186,9 @@ async def compare_dates(date1: str, date2: str):
 
         records1 = snap1.get("records", [])
         records2 = snap2.get("records", [])
-        stats1 = get_record_stats(records1)
-        stats2 = get_record_stats(records2)
-        changes = compare_incoming_records(records2, snap1)
+        stats1 = await run_blocking(get_record_stats, records1)
+        stats2 = await run_blocking(get_record_stats, records2)
+        changes = await run_blocking(compare_incoming_records, records2, snap1)
 
         return JSONResponse(
             content={
@@ -223,12 +223,11 @@ async def get_weekly_trends():
             week_data = {"week": week + 1, "days": []}
             for day in range(7):
                 date_str = (today - timedelta(days=(week * 7 + day))).strftime("%Y-%m-%d")
-                snapshot = load_incoming_snapshot(date_str)
-                if snapshot:
-                    records = snapshot.get("records", [])
-                    stats = get_record_stats(records)
+                day_stats = await run_blocking(snapshot_stats, date_str)
+                if day_stats:
+                    total, stats = day_stats
                     week_data["days"].append(
-                        {"date": date_str, "total": len(records), "real": stats.get("real", 0), "test": stats.get("test", 0)}
+                        {"date": date_str, "total": total, "real": stats.get("real", 0), "test": stats.get("test", 0)}
                     )
 
             if week_data["days"]:
@@ -1,21 +1,22 @@
 """Endpoints for procedures changes and counts."""
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 from services.report_service import load_digest
+from .executor import run_blocking
+from .responses import JSONResponse
 
 router = APIRouter()
 
 
-def _report():
-    return load_digest()
+async def _report():
+    return await run_blocking(load_digest)
 
 
 @router.get("/sede/procedures/active", tags=["Διαδικασίες"])
 async def get_procedures_active():
     """Επιστρέφει μόνο ενεργές διαδικασίες."""
     try:
-        report = _report()
+        report = await _report()
         return JSONResponse(
             content={
                 "generated_at": report.get("generated_at"),
@@ -36,7 +37,7 @@ async def get_procedures_active():
 async def get_procedures_all():
     """Επιστρέφει όλες τις διαδικασίες."""
     try:
-        report = _report()
+        report = await _report()
         return JSONResponse(
             content={
                 "generated_at": report.get("generated_at"),
@@ -57,7 +58,7 @@ async def get_procedures_all():
 async def get_procedures_changes():
     """Επιστρέφει αλλαγές διαδικασιών."""
     try:
-        report = _report()
+        report = await _report()
         active_changes = report.get("active", {}).get("changes") or {}
         all_changes = report.get("all", {}).get("changes") or {}
         return JSONResponse(
@@ -91,7 +92,7 @@ async def get_procedures_changes():
 async def get_procedures_inactive():
     """Επιστρέφει μόνο ανενεργές διαδικασίες."""
     try:
-        report = _report()
+        report = await _report()
         active_total = report.get("active", {}).get("total", 0)
         all_total = report.get("all", {}).get("total", 0)
         inactive_count = all_total - active_total
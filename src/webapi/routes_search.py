@@ -1,21 +1,22 @@
 """Search and filter endpoints."""
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 from services.report_service import load_digest
+from .executor import run_blocking
+from .responses import JSONResponse
 
 router = APIRouter()
 
 
-def _report():
-    return load_digest()
+async def _report():
+    return await run_blocking(load_digest)
 
 
 @router.get("/sede/search", tags=["Αναζήτηση"])
 async def search(q: str):
     """Αναζήτηση σε εισερχόμενες και διαδικασίες."""
     try:
-        report = _report()
+        report = await _report()
         query = q.lower()
         results = {"query": q, "incoming": [], "procedures": []}
 
@@ -47,7 +48,7 @@ async def search(q: str):
 async def filter_incoming(party: str = None, procedure: str = None, date_from: str = None, date_to: str = None):
     """Φιλτράρει εισερχόμενες αιτήσεις."""
     try:
-        report = _report()
+        report = await _report()
         records = report.get("incoming", {}).get("records", [])
         filtered = []
 
@@ -3,10 +3,12 @@ import os
 from datetime import datetime
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 from config import get_project_root
 from services.report_service import load_digest
+from snapshot_store import get_snapshot_backend
+from .executor import run_blocking
+from .responses import JSONResponse
 
 router = APIRouter()
 
@@ -39,7 +41,7 @@ async def health_check():
 async def get_baseline_info():
     """Επιστρέφει πληροφορίες baseline."""
     try:
-        report = load_digest()
+        report = await run_blocking(load_digest)
         return JSONResponse(
             content={
                 "active_procedures": {
@@ -68,11 +70,10 @@ async def get_baseline_info():
 async def get_last_update():
     """Επιστρέφει πότε ανανεώθηκαν τα δεδομένα."""
     try:
-        root = get_project_root()
-        incoming_today = os.path.join(root, "data", "incoming_requests", f'incoming_{datetime.now().strftime("%Y-%m-%d")}.json')
+        saved_at = await run_blocking(get_snapshot_backend().saved_at, datetime.now().strftime("%Y-%m-%d"))
         last_update = None
-        if os.path.exists(incoming_today):
-            last_update = datetime.fromtimestamp(os.path.getmtime(incoming_today)).strftime("%Y-%m-%d %H:%M:%S")
+        if saved_at is not None:
+            last_update = datetime.fromtimestamp(saved_at).strftime("%Y-%m-%d %H:%M:%S")
 
         return JSONResponse(
             content={"last_update": last_update, "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
@@ -15,8 +15,11 @@ from openpyxl import load_workbook
 from config import get_project_root, INCOMING_DEFAULT_PARAMS
 from utils import load_config
 from monitor import PKMMonitor
+from session_manager import get_shared_monitor
 from incoming import fetch_incoming_records, simplify_incoming_records
 from api import enrich_record_details
+from settled_cases import SettledIndex
+import charge_cache
 
 
 def get_week_boundaries(date_str):
@@ -42,10 +45,8 @@ def get_week_boundaries(date_str):
 
 def _ensure_logged_in(monitor: PKMMonitor):
     """Κάνει login και φορτώνει αρχική σελίδα αν χρειάζεται"""
-    if not monitor.logged_in and not monitor.login():
+    if not monitor.ensure_logged_in():
         raise RuntimeError("Αποτυχία login")
-    if not monitor.main_page_loaded:
-        monitor.load_main_page()
 
 
 def fetch_incoming_from_api(monitor: PKMMonitor, config: dict):
@@ -136,92 +137,61 @@ def filter_records_by_week_end(records, sunday_str):
     return filtered
 
 
-def filter_out_settled_from_records(records, monday_str, general_directorate, report_date_str):
-    """Αφαιρεί διεκπεραιωμένες πού έγιναν ΠΡΙΝ την ημερομηνία αναφοράς."""
+def load_settled_lookup(monitor=None):
+    """Φορτώνει μία φορά ανά run το lookup διεκπεραιωμένων για όλες τις Γενικές Διευθύνσεις.
+
+    SettledIndex "YYYY/CASE_ID" -> {'settled_date': ..., 'assigned_employee': ...}. Ο συγχρονισμός
+    με το portal γίνεται από το τοπικό αποθετήριο (βλ. settled_store), με το κοινό session.
+    """
+    from settled_store import get_settled_summaries
+    
+    monitor = monitor or get_shared_monitor()
+    if not monitor.ensure_logged_in():
+        print("   ⚠️  Αποτυχία login, χρήση τοπικά αποθηκευμένων διεκπεραιωμένων")
+        monitor = None
+    settled_by_protocol = get_settled_summaries(monitor)
+    print(f"   [DEBUG] Loaded {len(settled_by_protocol)} settled cases")
+    return settled_by_protocol
+
+
+def filter_out_settled_from_records(records, monday_str, general_directorate, report_date_str,
+                                    settled_by_protocol=None):
+    """Αφαιρεί διεκπεραιωμένες πού έγιναν ΠΡΙΝ την ημερομηνία αναφοράς.
+    
+    settled_by_protocol: lookup από `load_settled_lookup` (κοινό για όλες τις Γενικές
+    Διευθύνσεις του run)· αν λείπει, φορτώνεται εδώ.
+    """
     try:
-        from settled_cases import fetch_settled_cases
-        
-        project_root = get_project_root()
-        config = load_config(os.path.join(project_root, 'config', 'config.yaml'))
-        monitor = PKMMonitor(
-            base_url=config.get('base_url', 'https://shde.pkm.gov.gr'),
-            urls=config.get('urls', {}), api_params=config.get('api_params', {}),
-            login_params=config.get('login_params', {}), check_interval=config.get('check_interval', 300),
-            username=config.get('username'), password=config.get('password'),
-            session_cookies=config.get('session_cookies'))
-        
-        if not monitor.logged_in and not monitor.login():
-            return records
-        
-        settled_result = fetch_settled_cases(monitor)
-        settled_records = settled_result.get('data', []) if settled_result else []
-        if not settled_records:
+        if settled_by_protocol is None:
+            settled_by_protocol = load_settled_lookup()
+        if not settled_by_protocol:
             return records
+        settled_by_protocol = SettledIndex.from_mapping(settled_by_protocol)
         
         report_date = datetime.strptime(report_date_str, "%Y-%m-%d")
         active_records = []
         removed_count = 0
         marked_count = 0
         removed_cases = []  # Track which cases were removed
+        removed_doc_ids = []
         
         # Calculate sunday from monday
         monday_date = datetime.strptime(monday_str, "%Y-%m-%d")
         sunday_date = monday_date + timedelta(days=6)
         sunday_str = sunday_date.strftime("%Y-%m-%d")
         
-        # Build lookup dict using protocol_number format (same as xls_export.py)
-        # Maps "YYYY/CASE_ID" -> {'settled_date': ..., 'assigned_employee': ...}
-        settled_by_protocol = {}
-        for sr in settled_records:
-            protocol_num = str(sr.get('W001_P_FLD2', '')).strip()
-            settled_date_str = str(sr.get('W001_P_FLD3', '')).strip()
-            assigned_employee = str(sr.get('W001_P_FLD10', '')).strip()
-            
-            if protocol_num:
-                settled_by_protocol[protocol_num] = {
-                    'settled_date': settled_date_str,
-                    'assigned_employee': assigned_employee
-                }
-        
-        print(f"   [DEBUG] Loaded {len(settled_by_protocol)} settled cases")
         print(f"   [DEBUG] Checking {len(records)} incoming records from {monday_str} to {sunday_str}")
         print(f"   [DEBUG] Report date: {report_date_str}")
         
         match_count = 0
         
         for rec in records:
-            # Try matching using YEAR/CASE_ID format (same as xls_export.py)
-            submission_year = str(rec.get('submission_year', '')).strip()
             case_id = str(rec.get('case_id', '')).strip()
             
-            # Primary: Try YEAR/CASE_ID lookup
-            settled = None
-            lookup_key = None
-            if submission_year and case_id:
-                lookup_key = f"{submission_year}/{case_id}"
-                settled = settled_by_protocol.get(lookup_key)
-                if settled:
-                    match_count += 1
-            
-            # Fallback: Try direct protocol_number from record
-            if not settled:
-                protocol_num = str(rec.get('protocol_number', '')).strip()
-                if protocol_num:
-                    settled = settled_by_protocol.get(protocol_num)
-                    if settled:
-                        match_count += 1
-            
-            # Fallback: Try extracting from related_case (old method)
-            if not settled:
-                related_case = rec.get('related_case', '')
-                if related_case:
-                    import re
-                    match = re.search(r'(\d{4}/\d+)', str(related_case))
-                    if match:
-                        case_code = match.group(1).strip().upper()
-                        settled = settled_by_protocol.get(case_code)
-                        if settled:
-                            match_count += 1
+            # YEAR/CASE_ID, μετά protocol_number, μετά related_case (βλ. SettledIndex.match)
+            _, settled = settled_by_protocol.match(rec)
+            if settled:
+                match_count += 1
             
             if not settled:
                 active_records.append(rec)
@@ -265,6 +235,7 @@ def filter_out_settled_from_records(records, monday_str, general_directorate, re
                 print(f"   [REMOVED] Case {case_id}: Settled on {completion_date} (before report date {report_date.date()})")
                 removed_count += 1
                 removed_cases.append(case_id)
+                removed_doc_ids.append(str(rec.get('doc_id', '')).strip())
                 continue
             else:
                 # Settled after or on report date - check if submitted this week
@@ -288,6 +259,8 @@ def filter_out_settled_from_records(records, monday_str, general_directorate, re
                 active_records.append(rec)
         
         if removed_count > 0:
+            # Οι διεκπεραιωμένες δεν χρειάζονται πλέον cached χρέωση
+            charge_cache.evict(removed_doc_ids)
             print(f"   Αφαιρέθησαν {removed_count} διεκπεραιωμένες (ΠΡΙΝ την {report_date_str})")
             if removed_cases:
                 # Show first 10 case IDs
@@ -722,15 +695,7 @@ def main():
     # Φόρτωση δεδομένων από API
     project_root = get_project_root()
     config = load_config(os.path.join(project_root, 'config', 'config.yaml'))
-    monitor = PKMMonitor(
-        base_url=config.get('base_url', 'https://shde.pkm.gov.gr'),
-        urls=config.get('urls', {}),
-        api_params=config.get('api_params', {}),
-        login_params=config.get('login_params', {}),
-        check_interval=config.get('check_interval', 300),
-        username=config.get('username'),
-        password=config.get('password'),
-        session_cookies=config.get('session_cookies'))
+    monitor = get_shared_monitor(config=config)
 
     _ensure_logged_in(monitor)
     records = fetch_incoming_from_api(monitor, config)
@@ -759,10 +724,11 @@ def main():
     # Ανάκτηση χρεώσεων και εμπλουτισμός records
     charges_by_pkm = {}
     try:
-        from charges import fetch_charges_combined, add_charge_info_from_combined
+        from charges import fetch_charges_combined_timed, add_charge_info_from_combined
         print(f"📋 Ανάκτηση χρεώσεων υπαλλήλων (queryId=2 + queryId=3)...")
-        charges_records, charges_by_pkm = fetch_charges_combined(monitor)
-        print(f"   Βρέθηκαν {len(charges_records)} χρεώσεις από συνδυασμένες πηγές")
+        charges_records, charges_by_pkm, timings = fetch_charges_combined_timed(monitor)
+        print(f"   Βρέθηκαν {len(charges_records)} χρεώσεις από συνδυασμένες πηγές "
+              f"(queryId=2: {timings['queryId=2']:.1f}s, queryId=3: {timings['queryId=3']:.1f}s)")
         records = add_charge_info_from_combined(records, charges_by_pkm, monitor=monitor, enrich_missing=True)
         print(f"   ✅ Εμπλουτισμός με χρεώσεις ολοκληρώθηκε (με API enrichment)")
     except Exception as exc:
@@ -776,9 +742,12 @@ def main():
     filtered_groups = {}
     total_removed = 0
     total_settled_this_week = 0
+    # Μία ανάκτηση/ένα lookup διεκπεραιωμένων για όλες τις Γενικές Διευθύνσεις
+    settled_by_protocol = load_settled_lookup(monitor)
     
     for general_directorate, recs in groups.items():
-        filtered_recs = filter_out_settled_from_records(recs, monday, general_directorate, report_date)
+        filtered_recs = filter_out_settled_from_records(recs, monday, general_directorate, report_date,
+                                                        settled_by_protocol=settled_by_protocol)
         
         # Μέτρηση αφαιρεθεισών
         removed = len(recs) - len(filtered_recs)
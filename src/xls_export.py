@@ -53,8 +53,9 @@ def _write_sheet(ws, rows: List[Dict], title: str, settled_by_case_id: Dict = No
     
     Columns: Α/Α, Δ/νση, Αρ. Πρωτοκόλλου, ΤΥΠΟΣ, Διαδικασία, Συναλλασσόμενος, Ανάθεση σε, Διεκπεραιωμένη
     """
-    if settled_by_case_id is None:
-        settled_by_case_id = {}
+    from case_codes import extract_case_code
+    from settled_cases import SettledIndex
+    settled_by_case_id = SettledIndex.from_mapping(settled_by_case_id or {})
     
     headers = ["Α/Α", "Δ/νση", "Αρ. Πρωτοκόλλου", "ΤΥΠΟΣ", "Διαδικασία", "Συναλλασσόμενος", "Ανάθεση σε", "Διεκπεραιωμένη"]
 
@@ -105,19 +106,13 @@ def _write_sheet(ws, rows: List[Dict], title: str, settled_by_case_id: Dict = No
         charge_info = rec.get("_charge", {})
         employee = charge_info.get("employee", "") if charge_info.get("charged") else ""
         
-        # Check if case is in settled cases (queryId=19) - use its assignment
-        case_id = str(rec.get("case_id", "")).strip()
-        submission_year = str(rec.get("submission_year", "")).strip()
-        assigned_employee = ""
-        settled_date = ""
-        
-        # Try to match using YEAR/CASE_ID format (matches W001_P_FLD2 from settled cases)
-        if submission_year and case_id:
-            lookup_key = f"{submission_year}/{case_id}"
-            if lookup_key in settled_by_case_id:
-                settled_info = settled_by_case_id[lookup_key]
-                settled_date = settled_info.get("settled_date", "")
-                assigned_employee = settled_info.get("assigned_employee", "")
+        # Check if case is in settled cases (queryId=19) - use its assignment.
+        # Match by YEAR/CASE_ID (W001_P_FLD2 format), then by protocol_number; related_case
+        # is the parent case of a supplement, not this request, so it is not used here.
+        _, settled_info = settled_by_case_id.match(rec, use_related_case=False)
+        settled_info = settled_info or {}
+        settled_date = settled_info.get("settled_date", "")
+        assigned_employee = settled_info.get("assigned_employee", "")
         
         # Priority: Use assignment from settled cases (W001_P_FLD10), else use incoming charge
         if assigned_employee:
@@ -132,28 +127,20 @@ def _write_sheet(ws, rows: List[Dict], title: str, settled_by_case_id: Dict = No
         
         # ΤΥΠΟΣ (column 4) - show related case if this is a supplement
         doc_type = rec.get("document_category", "")
-        related_case = (rec.get("related_case") or "").strip()
-        if "Συμπληρωματι" in str(doc_type) and related_case:
-            # Extract year/number from related_case
-            # Format could be: "2026/117648" or "Αίτημα 2026/117648 NAME-123456"
-            # We need to extract just "2026/117648"
-            import re
-            match = re.search(r'(\d{4}/\d+)', related_case)
-            if match:
-                case_number = match.group(1)
+        if "Συμπληρωματι" in str(doc_type):
+            # related_case may be "2026/117648" or "Αίτημα 2026/117648 NAME-123456";
+            # simplify_incoming_records stores the extracted "2026/117648" as related_case_code
+            if "related_case_code" in rec:
+                case_number = rec["related_case_code"]
+            else:
+                case_number = extract_case_code(rec.get("related_case"))
+            if case_number:
                 doc_type = f"{doc_type}: {case_number}"
         
         col_vals[3].append(doc_type)
         col_vals[4].append(rec.get("procedure", ""))
         col_vals[5].append(rec.get("party", ""))
         col_vals[6].append(employee)  # Assignment from settled cases or current charge
-        
-        # Fallback: try protocol_number if available
-        if not settled_date:
-            protocol_num = str(rec.get("protocol_number", "")).strip()
-            if protocol_num and protocol_num in settled_by_case_id:
-                settled_date = settled_by_case_id[protocol_num].get("settled_date", "")
-        
         col_vals[7].append(settled_date)
 
     # Column widths
@@ -226,53 +213,17 @@ def build_requests_xls(digest: Dict, scope: str = "new", file_path: str | None =
 
 
 def _load_settled_cases(monitor_instance = None) -> Dict:
-    """Load settled cases from queryId=19 using existing authenticated session.
+    """Load settled cases (queryId=19) from the local settled-cases store.
     
     Args:
-        monitor_instance: pre-authenticated PKMMonitor instance. If None, returns empty dict.
+        monitor_instance: pre-authenticated PKMMonitor instance, used to sync the store
+            first if it is due. If None, the locally stored cases are used as-is.
     
-    Returns dict: {W001_P_FLD2: {'settled_date': 'DD-MM-YYYY', ...}, ...}
+    Returns dict: {W001_P_FLD2: {'settled_date': 'DD-MM-YYYY', 'assigned_employee': ...}, ...}
     """
     try:
-        if monitor_instance is None:
-            print("[DEBUG] No monitor instance provided for settled cases")
-            return {}
-        
-        monitor = monitor_instance
-        
-        print("[DEBUG] Loaded settled cases from queryId=19")
-        
-        # Fetch settled cases (queryId=19)
-        settled_params = {
-            'isPoll': 'false',
-            'queryId': '19',
-            'queryOwner': '2',
-            'isCase': 'false',
-            'stateId': 'welcomeGrid-45_dashboard0',
-            'page': '1',
-            'start': '0',
-            'limit': '500'
-        }
-        
-        data = monitor.fetch_data(settled_params)
-        if not data or not data.get('success'):
-            print("[DEBUG] Failed to fetch settled cases")
-            return {}
-        
-        settled_by_case_id = {}
-        for rec in data.get('data', []):
-            # W001_P_FLD2 = protocol number (like "2026/124212")
-            protocol_num = str(rec.get('W001_P_FLD2', '')).strip()
-            settled_date = str(rec.get('W001_P_FLD3', '')).strip()
-            assigned_employee = str(rec.get('W001_P_FLD10', '')).strip()  # Employee assigned (charged) to the case
-            
-            if protocol_num:
-                # Map by the protocol number directly (e.g., "2026/124212")
-                settled_by_case_id[protocol_num] = {
-                    'settled_date': settled_date,
-                    'assigned_employee': assigned_employee
-                }
-        
+        from settled_store import get_settled_summaries
+        settled_by_case_id = get_settled_summaries(monitor_instance)
         print(f"[DEBUG] Loaded {len(settled_by_case_id)} settled cases")
         return settled_by_case_id
     except Exception as e:
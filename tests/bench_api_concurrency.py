@@ -0,0 +1,128 @@
+"""
+Benchmark: latency του /health όσο τρέχει /sede/export/xls
+
+Σηκώνει το FastAPI app σε uvicorn (τοπικά, χωρίς portal) με συνθετικό digest και
+μετρά το /health (α) σε ηρεμία και (β) ενώ τρέχουν εξαγωγές Excel. Με το
+--inline τα blocking calls εκτελούνται μέσα στο event loop (παλιά συμπεριφορά)
+για σύγκριση.
+
+Χρήση:
+    python tests/bench_api_concurrency.py
+    python tests/bench_api_concurrency.py --records 20000 --exports 2
+    python tests/bench_api_concurrency.py --inline
+"""
+import argparse
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import requests
+import uvicorn
+
+from utils import get_settings
+from webapi import background, create_app, routes_export
+
+
+def _synthetic_digest(count):
+    records = [
+        {
+            'case_id': str(100000 + i), 'submitted_at': f'2026-02-{1 + i % 28:02d} 10:00:00',
+            'party': f'ΣΥΝΑΛΛΑΣΣΟΜΕΝΟΣ {i}', 'doc_id': str(900000 + i),
+            'protocol_number': str(5000 + i), 'protocol_date': '', 'procedure': f'ΔΙΑΔΙΚΑΣΙΑ {i % 40}',
+            'directory': f'ΔΙΕΥΘΥΝΣΗ {i % 15}', 'general_directorate': f'ΓΕΝΙΚΗ ΔΙΕΥΘΥΝΣΗ {i % 5}',
+            'department': '', 'document_category': 'Αίτημα', 'subject': f'Θέμα {i}',
+            'submission_year': '2026', 'related_case': '',
+        }
+        for i in range(count)
+    ]
+    return {'generated_at': '01/03/2026 08:00:00', 'incoming': {'date': '2026-03-01', 'records': records,
+                                                                 'real_new': records, 'test_new': []}}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _sample_health(base, duration, stop_event=None):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline and not (stop_event and stop_event.is_set()):
+        start = time.perf_counter()
+        requests.get(f'{base}/health', timeout=120)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.02)
+    return latencies
+
+
+def _summary(label, latencies):
+    if not latencies:
+        print(f'{label:<28} (κανένα δείγμα)')
+        return
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f'{label:<28} n={len(ordered):<4} p50={statistics.median(ordered):7.1f}ms '
+          f'p95={p95:7.1f}ms max={ordered[-1]:7.1f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latency /health κατά τη διάρκεια /sede/export/xls')
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--exports', type=int, default=2, help='Ταυτόχρονα exports')
+    parser.add_argument('--inline', action='store_true', help='Εκτέλεση blocking κώδικα μέσα στο event loop')
+    args = parser.parse_args()
+
+    digest = _synthetic_digest(args.records)
+    routes_export.load_digest = lambda reload=False: digest
+    routes_export.get_monitor = lambda: None
+    if args.inline:
+        async def _inline(func, *a, **kw):
+            return func(*a, **kw)
+        routes_export.run_blocking = _inline
+
+    # Χωρίς background refresher: το benchmark δεν πρέπει να αγγίζει το portal
+    settings = dict(get_settings())
+    settings['digest_refresh_interval'] = 0
+    background.get_settings = lambda: settings
+
+    app = create_app()
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    base = f'http://127.0.0.1:{port}'
+    while not server.started:
+        time.sleep(0.05)
+
+    mode = 'inline (event loop)' if args.inline else 'thread pool'
+    print(f'Εγγραφές: {args.records} | Ταυτόχρονα exports: {args.exports} | Εκτέλεση: {mode}')
+    _summary('/health σε ηρεμία', _sample_health(base, 2))
+
+    export_times = []
+
+    def _export():
+        start = time.perf_counter()
+        requests.get(f'{base}/sede/export/xls', params={'scope': 'all'}, timeout=600)
+        export_times.append(time.perf_counter() - start)
+
+    exporters = [threading.Thread(target=_export) for _ in range(args.exports)]
+    done = threading.Event()
+    for t in exporters:
+        t.start()
+    waiter = threading.Thread(target=lambda: ([t.join() for t in exporters], done.set()))
+    waiter.start()
+    busy = _sample_health(base, 600, stop_event=done)
+    waiter.join()
+
+    _summary('/health κατά το export', busy)
+    print(f'Διάρκεια exports: {", ".join(f"{t:.1f}s" for t in export_times)}')
+    server.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
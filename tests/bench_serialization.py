@@ -0,0 +1,97 @@
+"""
+Benchmark: χρόνοι φόρτωσης/αποθήκευσης snapshot ανά μορφή αρχείου
+
+Συγκρίνει την παλιά μορφή (stdlib json με indent=2) με τους συνδυασμούς
+μορφής/συμπίεσης του serialization layer που είναι διαθέσιμοι στο περιβάλλον.
+Χρησιμοποιεί το νεότερο data/incoming_requests snapshot αν υπάρχει, αλλιώς
+συνθετικές εγγραφές.
+
+Χρήση:
+    python tests/bench_serialization.py
+    python tests/bench_serialization.py --records 20000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import serialization
+from incoming import get_all_incoming_dates, load_incoming_snapshot
+
+
+def _synthetic_snapshot(count):
+    records = [
+        {
+            'case_id': str(100000 + i), 'submitted_at': f'2026-02-{1 + i % 28:02d} 10:00:00',
+            'party': f'ΣΥΝΑΛΛΑΣΣΟΜΕΝΟΣ {i}', 'doc_id': str(900000 + i),
+            'protocol_number': str(5000 + i), 'protocol_date': '', 'procedure': f'ΔΙΑΔΙΚΑΣΙΑ {i % 40}',
+            'directory': f'ΔΙΕΥΘΥΝΣΗ {i % 15}', 'general_directorate': f'ΓΕΝΙΚΗ ΔΙΕΥΘΥΝΣΗ {i % 5}',
+            'department': '', 'document_category': 'Αίτημα', 'subject': f'Θέμα {i}',
+            'submission_year': '2026', 'related_case': '',
+        }
+        for i in range(count)
+    ]
+    return {'date': '2026-02-28', 'count': count, 'records': records}
+
+
+def _timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _bench_legacy(snapshot, path, repeat):
+    def save():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+
+    def load():
+        with open(path, 'r', encoding='utf-8') as f:
+            json.load(f)
+
+    save_time = _timed(save, repeat)
+    return save_time, _timed(load, repeat), os.path.getsize(path)
+
+
+def _bench_codec(snapshot, path, fmt, compression, repeat):
+    save_time = _timed(lambda: serialization.write_file(path, snapshot, fmt=fmt, compression=compression), repeat)
+    load_time = _timed(lambda: serialization.read_file(path), repeat)
+    return save_time, load_time, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=0, help='Συνθετικές εγγραφές (αντί για το τελευταίο snapshot)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    snapshot = None
+    if not args.records:
+        dates = get_all_incoming_dates()
+        snapshot = load_incoming_snapshot(dates[-1]) if dates else None
+    snapshot = snapshot or _synthetic_snapshot(args.records or 10000)
+    print(f"Snapshot: {len(snapshot.get('records', []))} εγγραφές, "
+          f"JSON codec: {'orjson' if serialization.orjson else 'stdlib'}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [('json indent=2 (παλιό)',) + _bench_legacy(snapshot, os.path.join(tmp, 'legacy.json'), args.repeat)]
+        for fmt in serialization.available_formats():
+            for compression in serialization.available_compressions():
+                path = os.path.join(tmp, f'{fmt}-{compression}.bin')
+                rows.append((f'{fmt} + {compression}',) + _bench_codec(snapshot, path, fmt, compression, args.repeat))
+
+    print(f"{'Μορφή':<24}{'save (ms)':>12}{'load (ms)':>12}{'μέγεθος (KB)':>16}")
+    for label, save_time, load_time, size in rows:
+        print(f"{label:<24}{save_time * 1000:>12.1f}{load_time * 1000:>12.1f}{size / 1024:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
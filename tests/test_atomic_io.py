@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import api
+import atomic_io
+import procedures
+from atomic_io import atomic_write
+from serialization import read_file
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'baseline.json')
+    atomic_write(path, b'{"count": 1}')
+
+    def crash(src, dst):
+        raise OSError('killed')
+
+    monkeypatch.setattr(atomic_io.os, 'replace', crash)
+    with pytest.raises(OSError):
+        atomic_write(path, b'{"count": 2, "trunc')
+
+    assert read_file(path) == {'count': 1}
+    assert os.listdir(tmp_path) == ['baseline.json']
+
+
+def test_private_mode_is_applied(tmp_path):
+    path = str(tmp_path / 'session.json')
+    atomic_write(path, b'{}', mode=0o600)
+    if os.name == 'posix':
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX δικαιώματα')
+def test_default_mode_matches_plain_open(tmp_path):
+    plain = str(tmp_path / 'plain.json')
+    with open(plain, 'w') as f:
+        f.write('{}')
+    path = str(tmp_path / 'snapshot.json')
+    atomic_write(path, b'{}')
+    assert os.stat(path).st_mode & 0o777 == os.stat(plain).st_mode & 0o777
+
+    os.chmod(path, 0o640)
+    atomic_write(path, b'{"count": 1}')
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def _add_procedures(worker):
+    for i in range(20):
+        procedures.save_procedures_cache({f'Διαδικασία {worker}-{i}': {'procedure_id': str(i)}})
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='απαιτεί fork')
+def test_concurrent_processes_do_not_lose_updates(tmp_path, monkeypatch):
+    path = str(tmp_path / 'procedures_cache.json')
+    monkeypatch.setattr(procedures, 'get_procedures_cache_path', lambda: path)
+    ctx = multiprocessing.get_context('fork')
+
+    workers = [ctx.Process(target=_add_procedures, args=(w,)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(30)
+
+    assert all(p.exitcode == 0 for p in workers)
+    assert len(read_file(path)) == 80
+
+
+def _add_directories(worker):
+    def add(directory):
+        def mutate(cache):
+            cache['Άδεια'].setdefault('directories', []).append(directory)
+            return True
+        return mutate
+
+    for i in range(20):
+        procedures.update_procedures_cache(add(f'Διεύθυνση {worker}-{i}'))
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='απαιτεί fork')
+def test_concurrent_changes_to_same_entry_are_kept(tmp_path, monkeypatch):
+    path = str(tmp_path / 'procedures_cache.json')
+    monkeypatch.setattr(procedures, 'get_procedures_cache_path', lambda: path)
+    procedures.save_procedures_cache({'Άδεια': {'title': 'Άδεια', 'directories': []}})
+    ctx = multiprocessing.get_context('fork')
+
+    workers = [ctx.Process(target=_add_directories, args=(w,)) for w in range(2)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(30)
+
+    assert all(p.exitcode == 0 for p in workers)
+    assert len(read_file(path)['Άδεια']['directories']) == 40
+
+
+def test_procedures_update_keeps_other_writers_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'procedures_cache.json')
+    monkeypatch.setattr(procedures, 'get_procedures_cache_path', lambda: path)
+    procedures.save_procedures_cache({'Άδεια': {'title': 'Άδεια', 'procedure_id': '', 'code': '1'}})
+
+    procedures.update_procedures_cache_from_procedures(
+        [{'περιγραφή': 'Άδεια', 'κωδικός': '2', 'ενεργή': 'ΝΑΙ'}])
+    procedures.update_procedures_cache(
+        lambda cache: api._apply_procedure_details(cache, [('Άδεια', '42', 'Διεύθυνση Α')]))
+
+    entry = read_file(path)['Άδεια']
+    assert (entry['code'], entry['is_active']) == ('2', True)
+    assert (entry['procedure_id'], entry['directories']) == ('42', ['Διεύθυνση Α'])
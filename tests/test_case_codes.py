@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import case_codes
+from incoming import simplify_incoming_records
+
+
+def test_extract_pkm_unescapes_and_memoizes():
+    description = 'Αίτημα&nbsp;2026/106653 ΚΗΠΟΣ-258403847'
+    before = case_codes.cache_info()['pkm'].hits
+
+    assert case_codes.extract_pkm(description) == '106653'
+    assert case_codes.extract_pkm(description) == '106653'
+    assert case_codes.cache_info()['pkm'].hits == before + 1
+    assert case_codes.extract_pkm('Χωρίς κωδικό') is None
+    assert case_codes.extract_pkm(None) is None
+
+
+def test_extract_case_code():
+    assert case_codes.extract_case_code('Αίτημα 2026/105673 ΜΟΥΡΑΤΙΔΟΥ-128272645') == '2026/105673'
+    assert case_codes.extract_case_code('2026/105673') == '2026/105673'
+    assert case_codes.extract_case_code('') is None
+    assert case_codes.incoming_case_code('2026', ' 105673 ') == '2026/105673'
+    assert case_codes.incoming_case_code('', '105673') == ''
+
+
+def test_simplify_stores_extracted_codes():
+    raw = [{'W007_P_FLD21': '117700', 'DOCID': '9', 'W007_P_FLD2': '2026-02-17',
+            'W007_P_FLD7': 'Αίτημα 2026/117648 ΟΝΟΜΑ-123456'}]
+
+    rec = simplify_incoming_records(raw)[0]
+
+    assert rec['case_code'] == '2026/117700'
+    assert rec['related_case_code'] == '2026/117648'
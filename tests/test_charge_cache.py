@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import charge_cache
+from kv_store import KVStore
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    kv = KVStore(str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(charge_cache, 'get_settings',
+                        lambda: {'charge_cache_ttl': 3600, 'charge_cache_max_entries': 3})
+    monkeypatch.setattr(charge_cache, '_legacy_cache_path', lambda: str(tmp_path / 'charges_enrichment_cache.json'))
+    yield kv
+    kv.close()
+
+
+def _charge(name):
+    return {'charged': True, 'employee': name, 'source': 'ots'}
+
+
+def test_only_charged_entries_are_stored(store):
+    charge_cache.store_charges({'1': _charge('Α'), '2': {'charged': False}}, store=store)
+
+    assert charge_cache.get_cached_charges(['1', '2', '3'], store=store) == {'1': _charge('Α')}
+
+
+def test_expired_and_overflowing_entries_are_evicted(store):
+    store.put_many(charge_cache.NAMESPACE, [('old', _charge('Π'), True)], fetched_at=time.time() - 7200)
+    store.put_many(charge_cache.NAMESPACE, [('a', _charge('Α'), True)], fetched_at=time.time() - 30)
+
+    charge_cache.store_charges({d: _charge(d) for d in ('b', 'c', 'd')}, store=store)
+
+    assert store.count(charge_cache.NAMESPACE) == 3
+    assert set(charge_cache.get_cached_charges(['old', 'a', 'b', 'c', 'd'], store=store)) == {'b', 'c', 'd'}
+
+
+def test_settled_cases_are_evicted(store):
+    charge_cache.store_charges({'1': _charge('Α'), '2': _charge('Β')}, store=store)
+
+    charge_cache.evict(['1', ''], store=store)
+
+    assert set(charge_cache.get_cached_charges(['1', '2'], store=store)) == {'2'}
+
+
+def test_legacy_json_cache_is_imported_once(store, tmp_path):
+    legacy = tmp_path / 'charges_enrichment_cache.json'
+    legacy.write_text(json.dumps({'count': 1, 'by_doc_id': {'9': _charge('Γ')}}), encoding='utf-8')
+
+    assert charge_cache.get_cached_charges(['9'], store=store) == {'9': _charge('Γ')}
+    assert not legacy.exists()
+    assert (tmp_path / 'charges_enrichment_cache.json.migrated').exists()
@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import concurrency
+from charges import add_charge_info_from_combined, resolve_charge_employees
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeDetailSession:
+    """/7/{doc} -> W007_P_FLD7.docIds=[charge], /2/{charge} -> W001_P_FLD10 (με καθυστέρηση)."""
+
+    def __init__(self, charge_of, delay=0.05):
+        self.charge_of = charge_of
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        table, doc_id = url.rsplit('/', 2)[-2:]
+        with self.lock:
+            self.calls.append((table, doc_id))
+        time.sleep(self.delay)
+        if table == '7':
+            charge = self.charge_of.get(doc_id)
+            return FakeResponse({'success': True, 'data': [{'W007_P_FLD7': {'docIds': [charge] if charge else []}}]})
+        return FakeResponse({'success': True, 'data': [{'W001_P_FLD10': f'ΥΠΑΛΛΗΛΟΣ {doc_id}'}]})
+
+
+class FakeMonitor:
+    base_url = 'https://portal.example'
+    main_page_url = 'https://portal.example/main'
+    jwt_token = None
+
+    def __init__(self, charge_of):
+        self.session = FakeDetailSession(charge_of)
+
+
+@pytest.fixture(autouse=True)
+def _fast_limiter(monkeypatch):
+    monkeypatch.setattr(concurrency, 'get_settings', lambda: {'portal_rate_limit': 1000, 'enrichment_workers': 8})
+    monkeypatch.setattr(concurrency, '_limiters', {})
+
+
+def test_shared_charge_docids_are_fetched_once():
+    charge_of = {str(i): f'C{i % 5}' for i in range(20)}
+    charge_of['99'] = None
+    monitor = FakeMonitor(charge_of)
+
+    result = resolve_charge_employees(monitor, list(charge_of) + ['0'])
+
+    assert result['3'] == 'ΥΠΑΛΛΗΛΟΣ C3'
+    assert result['99'] is None
+    step2 = [doc for table, doc in monitor.session.calls if table == '2']
+    assert sorted(step2) == [f'C{i}' for i in range(5)]
+    assert len([c for c in monitor.session.calls if c[0] == '7']) == 21
+
+
+def test_resolution_is_concurrent():
+    charge_of = {str(i): f'C{i}' for i in range(40)}
+    monitor = FakeMonitor(charge_of)
+
+    start = time.monotonic()
+    resolve_charge_employees(monitor, list(charge_of))
+
+    assert time.monotonic() - start < 80 * monitor.session.delay / 3
+
+
+def test_combined_enrichment_uses_batched_resolver():
+    monitor = FakeMonitor({'d1': 'C1', 'd2': 'C2'})
+    records = [
+        {'case_id': '100', 'doc_id': 'd1'},
+        {'case_id': '200', 'doc_id': 'd2'},
+        {'case_id': '300', 'doc_id': 'd3'},
+    ]
+    charges_by_pkm = {
+        '100': {'DOCID': 'x', 'W001_P_FLD10': 'ΓΝΩΣΤΟΣ', 'DESCRIPTION': ''},
+        '200': {'DOCID': 'y', 'DESCRIPTION': ''},
+    }
+
+    enriched = add_charge_info_from_combined(records, charges_by_pkm, monitor=monitor, enrich_missing=True)
+
+    assert enriched[0]['_charge']['employee'] == 'ΓΝΩΣΤΟΣ'
+    assert enriched[1]['_charge']['employee'] == 'ΥΠΑΛΛΗΛΟΣ C2'
+    assert enriched[2]['_charge']['charged'] is False
+    assert ('7', 'd1') not in monitor.session.calls
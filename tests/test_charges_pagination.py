@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from charges import (CHARGES_PARAMS, QUERYID3_PARAMS, fetch_charges,
+                     fetch_charges_combined_timed, fetch_charges_from_queryid3)
+
+
+class FakeChargesPortal:
+    """queryId=2 / queryId=3 με σελιδοποίηση ανά `limit` (οι παράμετροι είναι strings όπως στο portal)."""
+
+    def __init__(self, q2_total, q3_total, delay=0):
+        self.delay = delay
+        self.rows = {
+            '2': [{'DOCID': f'o{i}', 'W007_P_FLD21': str(1000 + i)} for i in range(q2_total)],
+            '3': [{'DOCID': f'r{i}', 'DESCRIPTION': f'Αίτημα 2026/{2000 + i} ΘΕΜΑ',
+                   'USER_GROUP_ID_TO': f'ΥΠΑΛΛΗΛΟΣ {i}'} for i in range(q3_total)],
+        }
+        self.calls = []
+
+    def fetch_data(self, params):
+        self.calls.append(dict(params))
+        time.sleep(self.delay)
+        rows = self.rows[params['queryId']]
+        start, limit = int(params['start']), int(params['limit'])
+        return {'success': True, 'data': rows[start:start + limit], 'total': len(rows)}
+
+
+def test_queryid2_fetches_every_page():
+    portal = FakeChargesPortal(q2_total=250, q3_total=0)
+
+    records, by_pkm = fetch_charges(portal)
+
+    assert len(records) == 250
+    assert len(by_pkm) == 250
+    assert by_pkm['1249']['DOCID'] == 'o249'
+    assert sorted(int(c['start']) for c in portal.calls) == [0, 100, 200]
+    assert CHARGES_PARAMS['start'] == '0'
+
+
+def test_queryid3_fetches_every_page():
+    portal = FakeChargesPortal(q2_total=0, q3_total=230)
+
+    records, by_pkm = fetch_charges_from_queryid3(portal)
+
+    assert len(records) == 230
+    assert by_pkm['2229']['USER_GROUP_ID_TO'] == 'ΥΠΑΛΛΗΛΟΣ 229'
+    assert QUERYID3_PARAMS['start'] == '0'
+
+
+def test_combined_fetch_runs_sources_in_parallel_and_q3_wins():
+    portal = FakeChargesPortal(q2_total=50, q3_total=50, delay=0.2)
+    portal.rows['3'][0]['DESCRIPTION'] = 'Αίτημα 2026/1000 ΘΕΜΑ'
+
+    started = time.monotonic()
+    records, by_pkm, timings = fetch_charges_combined_timed(portal)
+
+    assert time.monotonic() - started < 0.35
+    assert len(records) == 100
+    assert by_pkm['1000']['DOCID'] == 'r0'
+    assert by_pkm['1001']['DOCID'] == 'o1'
+    assert set(timings) == {'queryId=2', 'queryId=3'}
+    assert all(t >= 0.2 for t in timings.values())
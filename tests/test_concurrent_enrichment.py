@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import api
+import concurrency
+import detail_cache
+from concurrency import RateLimiter, run_concurrently
+
+
+@pytest.fixture(autouse=True)
+def _no_detail_cache(monkeypatch):
+    monkeypatch.setattr(detail_cache, 'is_enabled', lambda: False)
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200):
+        self._payload = payload
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            err = requests.HTTPError(f"{self.status_code}")
+            err.response = self
+            raise err
+
+    def json(self):
+        return self._payload
+
+
+class FakeDetailSession:
+    """fetchDataTableRecord/7 με καθυστέρηση (και προαιρετικά ένα transient 503 ανά DOCID)."""
+
+    def __init__(self, delay=0.05, flaky=False):
+        self.delay = delay
+        self.flaky = flaky
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        doc_id = url.rsplit('/', 1)[-1]
+        with self.lock:
+            self.calls[doc_id] = self.calls.get(doc_id, 0) + 1
+            first = self.calls[doc_id] == 1
+        time.sleep(self.delay)
+        if first and self.flaky:
+            return FakeResponse({}, status=503)
+        return FakeResponse({'success': True, 'data': [{
+            'W007_P_FLD61': f'P-{doc_id}', 'W007_P_FLD23': f'Διαδικασία {doc_id}',
+            'W007_P_FLD17': 'Διεύθυνση Α (Γενική Διεύθυνση Β)', 'W007_P_FLD30': 'Αίτημα',
+            'W007_P_FLD16': 'Γενική Διεύθυνση Β', 'W007_P_FLD18': 'Τμήμα Γ',
+        }]})
+
+
+class FakeMonitor:
+    base_url = 'https://portal.example'
+    main_page_url = 'https://portal.example/main'
+    jwt_token = None
+
+    def __init__(self):
+        self.session = FakeDetailSession()
+
+
+def test_retryable_http_status_is_retried(monkeypatch):
+    monkeypatch.setattr(concurrency, '_limiters', {})
+    monitor = FakeMonitor()
+    monitor.session = FakeDetailSession(delay=0, flaky=True)
+    monkeypatch.setattr(concurrency, 'DEFAULT_BACKOFF', 0.001)
+
+    details = api.fetch_details_concurrently(monitor, ['7', '8'])
+
+    assert details['7'][0] == 'P-7'
+    assert monitor.session.calls == {'7': 2, '8': 2}
+
+
+def test_run_concurrently_preserves_order_and_retries():
+    attempts = {}
+
+    def flaky(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if attempts[item] == 1:
+            raise requests.ConnectionError("reset")
+        return item * 2
+
+    assert run_concurrently(flaky, range(20), max_workers=4, backoff=0.001) == [i * 2 for i in range(20)]
+    assert all(n == 2 for n in attempts.values())
+
+
+def test_non_retryable_error_is_reported_once():
+    errors = []
+
+    def broken(item):
+        raise ValueError("not json")
+
+    assert run_concurrently(broken, [1, 2], retries=3, backoff=0.001,
+                            on_error=lambda item, exc: errors.append(item)) == [None, None]
+    assert sorted(errors) == [1, 2]
+
+
+def test_rate_limiter_bounds_throughput():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.18
+
+
+def test_enrich_record_details_fetches_concurrently(monkeypatch):
+    monkeypatch.setattr(api, 'update_procedures_cache', lambda mutator: {})
+    monkeypatch.setattr(concurrency, 'get_settings', lambda: {'portal_rate_limit': 1000, 'enrichment_workers': 8})
+    monkeypatch.setattr(concurrency, '_limiters', {})
+    monitor = FakeMonitor()
+    records = [{'doc_id': str(1000 + i)} for i in range(40)]
+
+    start = time.monotonic()
+    api.enrich_record_details(monitor, records, procedures_cache={})
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 40 * monitor.session.delay / 2
+    assert records[0]['protocol_number'] == 'P-1000'
+    assert records[0]['directory'] == 'Διεύθυνση Α'
+    assert all(r['procedure'] == f"Διαδικασία {r['doc_id']}" for r in records)
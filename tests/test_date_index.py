@@ -0,0 +1,50 @@
+import os
+import sys
+from datetime import date
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import date_index
+from date_index import SnapshotDateIndex
+
+
+def _touch(directory, name):
+    (directory / name).write_text('{}', encoding='utf-8')
+
+
+def test_previous_and_next_lookups(tmp_path):
+    for name in ('incoming_2026-01-03.json', 'incoming_2026-01-01.json', 'incoming_2026-01-07.delta.json',
+                 'incoming_bad.json', 'stats.lock'):
+        _touch(tmp_path, name)
+    index = SnapshotDateIndex(str(tmp_path), 'incoming_', ('.delta.json', '.json'))
+
+    assert index.dates() == [date(2026, 1, 1), date(2026, 1, 3), date(2026, 1, 7)]
+    assert index.previous('2026-01-03') == date(2026, 1, 1)
+    assert index.previous('2026-01-05') == date(2026, 1, 3)
+    assert index.previous('2026-01-01') is None
+    assert index.next('2026-01-03') == date(2026, 1, 7)
+    assert index.next('2026-01-07') is None
+    assert '2026-01-03' in index and '2026-01-04' not in index
+
+
+def test_directory_is_rescanned_only_when_it_changes(tmp_path, monkeypatch):
+    _touch(tmp_path, 'settled_2026-01-01.json')
+    index = SnapshotDateIndex(str(tmp_path), 'settled_')
+    scans = []
+    real_listdir = date_index.os.listdir
+    monkeypatch.setattr(date_index.os, 'listdir', lambda p: scans.append(p) or real_listdir(p))
+
+    for _ in range(5):
+        index.previous('2026-02-01')
+    assert len(scans) == 1
+
+    _touch(tmp_path, 'settled_2026-01-20.json')
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    assert index.previous('2026-02-01') == date(2026, 1, 20)
+    assert len(scans) == 2
+
+
+def test_missing_directory_is_empty(tmp_path):
+    index = SnapshotDateIndex(str(tmp_path / 'none'), 'incoming_')
+    assert index.dates() == [] and index.previous('2026-01-01') is None
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import api
+import detail_cache
+from kv_store import KVStore
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    kv = KVStore(str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(detail_cache, 'get_kv_store', lambda: kv)
+    monkeypatch.setattr(detail_cache, 'is_enabled', lambda: True)
+    monkeypatch.setattr(detail_cache, 'get_settings',
+                        lambda: {'detail_cache_ttl': 3600, 'detail_cache_negative_ttl': 60})
+    yield kv
+    kv.close()
+
+
+def _details(doc_id):
+    return (f'P-{doc_id}', '01-02-2026', 'Διαδικασία', 'Διεύθυνση', '42', 'Αίτημα', 'ΓΔ', 'Τμήμα')
+
+
+def test_fresh_and_negative_entries_are_served(store):
+    detail_cache.store_details({'1': _details('1'), '2': None})
+
+    cached = detail_cache.get_cached_details(['1', '2', '3'])
+
+    assert cached['1'] == _details('1')
+    assert cached['2'] == (None,) * 8
+    assert '3' not in cached
+
+
+def test_negative_entries_expire_sooner(store):
+    old = time.time() - 120
+    store.put_many(detail_cache.NAMESPACE, [('1', list(_details('1')), True), ('2', None, False)], fetched_at=old)
+
+    cached = detail_cache.get_cached_details(['1', '2'])
+
+    assert '1' in cached
+    assert '2' not in cached
+
+
+def test_enrichment_reads_cache_before_network(store, monkeypatch):
+    monkeypatch.setattr(api, 'update_procedures_cache', lambda mutator: {})
+    detail_cache.store_details({'1': _details('1'), '2': None})
+    fetched = []
+
+    def fake_fetch(monitor, doc_id):
+        fetched.append(doc_id)
+        return _details(doc_id)
+
+    monkeypatch.setattr(api, '_fetch_record_details_strict', fake_fetch)
+    records = [{'doc_id': '1'}, {'doc_id': '2'}, {'doc_id': '3'}]
+
+    api.enrich_record_details(object(), records, procedures_cache={})
+
+    assert fetched == ['3']
+    assert records[0]['protocol_number'] == 'P-1'
+    assert 'protocol_number' not in records[1]
+    assert detail_cache.get_cached_details(['3'])['3'] == _details('3')
@@ -0,0 +1,154 @@
+import os
+import sys
+import threading
+import time
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from services.report_service import DigestCache
+
+
+def _counting_builder(delay=0.0, fail=False):
+    calls = []
+
+    def builder(reload):
+        calls.append(reload)
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("portal down")
+        return {"build": len(calls)}
+
+    return builder, calls
+
+
+def test_concurrent_cold_requests_trigger_single_build():
+    builder, calls = _counting_builder(delay=0.2)
+    cache = DigestCache(builder, ttl=60)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"build": 1}] * 10
+
+
+def test_fresh_digest_served_from_memory():
+    builder, calls = _counting_builder()
+    cache = DigestCache(builder, ttl=60)
+    cache.get()
+    cache.get()
+    assert len(calls) == 1
+
+
+def test_stale_digest_returned_while_revalidating():
+    builder, calls = _counting_builder(delay=0.2)
+    cache = DigestCache(builder, ttl=0)
+    cache.publish({"build": 0})
+
+    start = time.monotonic()
+    assert cache.get() == {"build": 0}
+    assert time.monotonic() - start < 0.1
+
+    deadline = time.monotonic() + 2
+    while cache.get() == {"build": 0} and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(calls) >= 1
+
+
+def test_reload_forces_rebuild():
+    builder, calls = _counting_builder()
+    cache = DigestCache(builder, ttl=60)
+    cache.get()
+    assert cache.get(reload=True) == {"build": 2}
+    assert calls == [False, True]
+
+
+def test_reload_does_not_join_a_normal_build():
+    builder, calls = _counting_builder(delay=0.2)
+    cache = DigestCache(builder, ttl=60)
+    normal = threading.Thread(target=cache.get)
+    normal.start()
+    time.sleep(0.05)
+
+    assert cache.get(reload=True) == {"build": 2}
+    normal.join()
+    assert calls == [False, True]
+
+
+def test_failed_cold_build_raises_and_stale_is_kept():
+    builder, _ = _counting_builder(fail=True)
+    cache = DigestCache(builder, ttl=60)
+    try:
+        cache.get()
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass
+
+    cache.publish({"build": 0})
+    cache.ttl = 0
+    assert cache.get() == {"build": 0}
+
+
+def test_failed_background_revalidation_is_logged(capsys):
+    builder, calls = _counting_builder(fail=True)
+    cache = DigestCache(builder, ttl=0)
+    cache.publish({"build": 0})
+
+    assert cache.get() == {"build": 0}
+
+    deadline = time.monotonic() + 2
+    while "[WARNING]" not in capsys.readouterr().out:
+        assert time.monotonic() < deadline, "expected background warning"
+        time.sleep(0.05)
+    assert cache.get() == {"build": 0}
+
+
+def test_failed_revalidation_is_not_retried_during_cooldown():
+    builder, calls = _counting_builder(fail=True)
+    cache = DigestCache(builder, ttl=0.5)
+    cache._entry = ({"build": 0}, time.monotonic() - 1)
+
+    assert cache.get() == {"build": 0}
+    deadline = time.monotonic() + 2
+    while cache._failed_at is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for _ in range(5):
+        assert cache.get() == {"build": 0}
+    time.sleep(0.05)
+    assert len(calls) == 1
+
+    time.sleep(0.5)
+    cache.get()
+    deadline = time.monotonic() + 2
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+
+def test_background_refresher_publishes_and_disables_read_revalidation(monkeypatch):
+    import asyncio
+    from services import report_service
+    from webapi import background
+
+    builder, calls = _counting_builder()
+    cache = DigestCache(builder, ttl=0)
+    monkeypatch.setattr(report_service, "_digest_cache", cache)
+    monkeypatch.setattr(background, "get_settings", lambda: {"digest_refresh_interval": 0.05})
+
+    async def run():
+        async with background.lifespan(None):
+            await asyncio.sleep(0.2)
+            assert cache.revalidate_on_read is False
+            builds = len(calls)
+            for _ in range(20):
+                cache.get()
+            assert len(calls) == builds
+        assert cache.revalidate_on_read is True
+
+    asyncio.run(run())
+    assert len(calls) >= 2
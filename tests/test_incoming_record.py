@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from incoming_record import IncomingRecord
+from serialization import dumps, loads
+
+
+def _record(**overrides):
+    values = dict(case_id='117700', doc_id='9', directory='Διεύθυνση Α', procedure='Άδεια',
+                  submitted_at='2026-02-17T10:00:00')
+    values.update(overrides)
+    return IncomingRecord(**values)
+
+
+def test_behaves_like_a_dict():
+    rec = _record()
+    rec['_charge'] = {'charged': True, 'employee': 'Α'}
+    rec['protocol_number'] = '2026/5'
+
+    assert rec['case_id'] == '117700'
+    assert rec.get('department') is None
+    assert rec.get('is_test', False) is False
+    assert 'doc_id' in rec and 'department' not in rec and '_charge' in rec
+    assert rec == dict(rec)
+    with pytest.raises(KeyError):
+        rec['department']
+
+    del rec['protocol_number']
+    assert 'protocol_number' not in rec
+    assert not hasattr(rec, '__dict__')
+
+
+def test_round_trip_is_lossless():
+    data = {'case_id': '1', 'directory': 'Δ', 'is_test': True, 'test_reason': 'χρήστης', '_settled_status': ''}
+
+    rec = IncomingRecord.from_dict(data)
+
+    assert rec.to_dict() == data
+    assert list(rec) == ['case_id', 'directory', 'is_test', 'test_reason', '_settled_status']
+    assert IncomingRecord.from_dict(rec) is rec
+    assert rec.copy() == rec and rec.copy() is not rec
+
+
+def test_repeated_strings_are_interned():
+    a = _record(directory=''.join(['Διεύθυνση ', 'Β']))
+    b = _record(directory=''.join(['Διεύθυνση', ' Β']))
+    b['general_directorate'] = ''.join(['Γενική ', 'Δ/νση'])
+    c = IncomingRecord.from_dict({'general_directorate': ''.join(['Γενική', ' Δ/νση'])})
+
+    assert a['directory'] is b['directory']
+    assert b['general_directorate'] is c['general_directorate']
+
+
+def test_serializes_as_plain_dict():
+    records = [_record(), _record(case_id='2')]
+    records[0]['_charge'] = {'charged': False}
+
+    assert loads(dumps({'records': records}, fmt='json', compression='none')) == \
+        {'records': [r.to_dict() for r in records]}
+
+
+def test_api_response_renders_records():
+    pytest.importorskip('fastapi')
+    from webapi.responses import JSONResponse
+
+    body = JSONResponse(content={'records': [_record()]}).body
+
+    assert json.loads(body)['records'][0]['directory'] == 'Διεύθυνση Α'
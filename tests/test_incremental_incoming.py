@@ -0,0 +1,61 @@
+import os
+import sys
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import incoming
+from incoming import fetch_incoming_records, incoming_watermark, use_incremental_fetch
+
+
+class FakeIncomingPortal:
+    """queryId=6 με 1000 εγγραφές· προαιρετικά αγνοεί την παράμετρο sort."""
+
+    def __init__(self, total=1000, honor_sort=True):
+        self.rows = [{'DOCID': i, 'DATE_INSERTED_ISO': f'2026-01-01T00:{i // 60:02d}:{i % 60:02d}'}
+                     for i in range(total)]
+        self.honor_sort = honor_sort
+        self.requests = []
+
+    def fetch_data(self, params):
+        self.requests.append(dict(params))
+        rows = self.rows
+        if self.honor_sort and 'sort' in params:
+            rows = list(reversed(rows))
+        start, limit = params.get('start', 0), params.get('limit', 200)
+        return {'success': True, 'data': rows[start:start + limit], 'total': len(rows)}
+
+
+def test_watermark_is_newest_submitted_at():
+    snapshot = {'records': [{'submitted_at': '2026-01-02'}, {'submitted_at': '2026-01-05'}, {}]}
+    assert incoming_watermark(snapshot) == '2026-01-05'
+    assert incoming_watermark(None) is None
+
+
+def test_incremental_fetch_stops_at_watermark():
+    portal = FakeIncomingPortal()
+    since = portal.rows[990]['DATE_INSERTED_ISO']
+
+    data = fetch_incoming_records(portal, {'queryId': 6, 'start': 0, 'limit': 200, 'page': 1}, since=since)
+
+    assert [r['DOCID'] for r in data['data']] == list(range(999, 989, -1))
+    assert len(portal.requests) == 1
+
+
+def test_unsorted_portal_falls_back_to_full_fetch():
+    portal = FakeIncomingPortal(honor_sort=False)
+    since = portal.rows[990]['DATE_INSERTED_ISO']
+
+    data = fetch_incoming_records(portal, {'queryId': 6, 'start': 0, 'limit': 200}, since=since)
+
+    assert len(data['data']) == 1000
+    assert 'incremental' not in data
+
+
+def test_full_resync_flags(monkeypatch):
+    monkeypatch.setattr(incoming, 'get_settings', lambda: {'incoming_incremental_fetch': True})
+    monkeypatch.delenv('INCOMING_FULL_RESYNC', raising=False)
+    assert use_incremental_fetch()
+    assert not use_incremental_fetch(full_resync=True)
+    monkeypatch.setenv('INCOMING_FULL_RESYNC', '1')
+    assert not use_incremental_fetch()
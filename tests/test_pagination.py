@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+import time
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from pagination import fetch_all_pages
+
+
+class FakePortal:
+    """Σελιδοποιημένο API με καθυστέρηση και μετρητή ταυτόχρονων requests."""
+
+    def __init__(self, total, page_size, delay=0.05, fail_start=None):
+        self.rows = [{'DOCID': i} for i in range(total)]
+        self.page_size = page_size
+        self.delay = delay
+        self.fail_start = fail_start
+        self.api_params = {'queryId': 1, 'start': 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def fetch_data(self, params):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            start = params.get('start', 0)
+            if start == self.fail_start:
+                return None
+            page = self.rows[start:start + self.page_size]
+            return {'success': True, 'data': page, 'total': len(self.rows)}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_pages_fetched_concurrently_and_reassembled_in_order():
+    portal = FakePortal(total=1050, page_size=100)
+    params = {'queryId': 3, 'start': 0, 'limit': 100, 'page': 1}
+
+    result = fetch_all_pages(portal, params, max_workers=4)
+
+    assert [r['DOCID'] for r in result['data']] == list(range(1050))
+    assert result['total'] == 1050
+    assert 1 < portal.max_in_flight <= 4
+    assert params == {'queryId': 3, 'start': 0, 'limit': 100, 'page': 1}
+    assert portal.api_params == {'queryId': 1, 'start': 0}
+
+
+def test_single_page_result():
+    portal = FakePortal(total=30, page_size=100)
+    result = fetch_all_pages(portal, {'limit': 100})
+    assert len(result['data']) == 30
+
+
+def test_failed_first_page_returns_none():
+    portal = FakePortal(total=500, page_size=100, fail_start=0)
+    assert fetch_all_pages(portal, {'limit': 100}) is None
+
+
+def test_failed_middle_page_keeps_ordered_prefix():
+    portal = FakePortal(total=500, page_size=100, fail_start=300)
+    result = fetch_all_pages(portal, {'limit': 100}, max_workers=3)
+    assert [r['DOCID'] for r in result['data']] == list(range(300))
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pytest.importorskip('fastapi')
+
+from snapshot_store import DeltaSnapshotBackend, JsonSnapshotBackend, SqliteSnapshotBackend
+from webapi import routes_status
+
+
+def _records(n):
+    return [{'case_id': str(100 + i), 'doc_id': f'd{i}', 'submitted_at': '2026-01-01 10:00:00'} for i in range(n)]
+
+
+def _last_update():
+    response = asyncio.run(routes_status.get_last_update())
+    return json.loads(response.body)['last_update']
+
+
+@pytest.mark.parametrize('kind', ['json', 'sqlite', 'delta'])
+def test_last_update_uses_snapshot_backend(kind, tmp_path, monkeypatch):
+    if kind == 'json':
+        backend = JsonSnapshotBackend(str(tmp_path))
+    elif kind == 'sqlite':
+        backend = SqliteSnapshotBackend(str(tmp_path / 'snapshots.sqlite3'))
+    else:
+        backend = DeltaSnapshotBackend(str(tmp_path), keyframe_interval=7)
+    monkeypatch.setattr(routes_status, 'get_snapshot_backend', lambda: backend)
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    assert _last_update() is None
+
+    if kind == 'delta':
+        # Η σημερινή ημέρα γράφεται ως delta πάνω στο keyframe της προηγούμενης
+        backend.save('2000-01-01', _records(3))
+        backend.save(today, _records(4))
+        assert os.path.exists(backend.delta_path(today)) and not os.path.exists(backend.path(today))
+    else:
+        backend.save(today, _records(4))
+
+    last_update = _last_update()
+    assert last_update is not None
+    assert abs((datetime.now() - datetime.strptime(last_update, '%Y-%m-%d %H:%M:%S')).total_seconds()) < 60
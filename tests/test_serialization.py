@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import serialization
+from serialization import dumps, loads, read_file, write_file
+
+PAYLOAD = {'date': '2026-02-01', 'count': 2,
+           'records': [{'case_id': '1', 'party': 'ΠΑΠΑΔΟΠΟΥΛΟΣ'}, {'case_id': '2', 'party': ''}]}
+
+
+@pytest.mark.parametrize('compression', serialization.available_compressions())
+@pytest.mark.parametrize('fmt', serialization.available_formats())
+def test_roundtrip_autodetects_format(fmt, compression):
+    assert loads(dumps(PAYLOAD, fmt=fmt, compression=compression)) == PAYLOAD
+
+
+def test_legacy_indented_json_files_still_load(tmp_path):
+    path = tmp_path / 'incoming_2026-02-01.json'
+    path.write_text(json.dumps(PAYLOAD, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    assert read_file(str(path)) == PAYLOAD
+    assert read_file(str(tmp_path / 'missing.json')) is None
+
+
+def test_default_encoding_is_compact_utf8_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(serialization, 'get_settings', lambda: {})
+    path = write_file(str(tmp_path / 'out.json'), PAYLOAD)
+
+    raw = open(path, 'rb').read()
+    assert b'\n' not in raw and 'ΠΑΠΑΔΟΠΟΥΛΟΣ'.encode('utf-8') in raw
+    assert json.loads(raw) == PAYLOAD
+
+
+def test_unavailable_codec_falls_back(monkeypatch):
+    monkeypatch.setattr(serialization, 'get_settings',
+                        lambda: {'storage_format': 'cbor', 'storage_compression': 'lz4'})
+
+    assert json.loads(dumps(PAYLOAD)) == PAYLOAD
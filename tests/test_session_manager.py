@@ -0,0 +1,92 @@
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import session_manager
+import session_store
+from session import PKMSession, jwt_expiry
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+def _fake_session(monkeypatch, token_exp=None, delay=0.0):
+    monkeypatch.setattr(session_store, 'is_enabled', lambda: False)
+    sess = PKMSession('https://portal.example', {}, username='user', password='pass')
+    calls = {'login': 0, 'main': 0}
+
+    def login():
+        calls['login'] += 1
+        time.sleep(delay)
+        sess.jwt_token = _jwt(token_exp) if token_exp is not None else 'opaque-token'
+        sess.logged_in = True
+        return True
+
+    def load_main_page():
+        calls['main'] += 1
+        sess.main_page_loaded = True
+        return True
+
+    monkeypatch.setattr(sess, 'login', login)
+    monkeypatch.setattr(sess, 'load_main_page', load_main_page)
+    return sess, calls
+
+
+def test_jwt_expiry_parsing():
+    assert jwt_expiry(_jwt(1700000000)) == 1700000000
+    assert jwt_expiry('not-a-jwt') is None
+
+
+def test_concurrent_ensure_logged_in_logs_in_once(monkeypatch):
+    sess, calls = _fake_session(monkeypatch, delay=0.1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(sess.ensure_logged_in())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [True] * 8
+    assert calls == {'login': 1, 'main': 1}
+
+
+def test_expired_jwt_triggers_relogin(monkeypatch):
+    sess, calls = _fake_session(monkeypatch, token_exp=time.time() + 3600)
+    assert sess.ensure_logged_in()
+    assert sess.ensure_logged_in()
+    assert calls['login'] == 1
+
+    sess.jwt_token = _jwt(time.time() - 10)
+    assert sess.ensure_logged_in()
+    assert calls['login'] == 2
+    assert calls['main'] == 2
+
+
+def test_http_session_uses_pooled_adapter():
+    sess = PKMSession('https://portal.example', {})
+    adapter = sess.session.get_adapter('https://portal.example/x')
+    assert adapter._pool_maxsize >= 1
+    assert adapter.max_retries.total == 2
+
+
+def test_shared_monitor_is_reused_per_config(monkeypatch, tmp_path):
+    session_manager.reset_shared_monitors()
+    config = {'base_url': 'https://portal.example', 'urls': {}, 'username': 'u', 'password': 'p'}
+    loads = []
+    monkeypatch.setattr(session_manager, 'load_config', lambda path: loads.append(path) or dict(config))
+
+    path_a = str(tmp_path / 'a.yaml')
+    path_b = str(tmp_path / 'b.yaml')
+    first = session_manager.get_shared_monitor(path_a)
+    assert session_manager.get_shared_monitor(path_a) is first
+    assert session_manager.get_shared_monitor(path_b) is not first
+    assert len(loads) == 2
+    session_manager.reset_shared_monitors()
@@ -0,0 +1,120 @@
+import base64
+import json
+import os
+import stat
+import sys
+import time
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import session_store
+from session import PKMSession
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+def _session(monkeypatch, tmp_path, token_exp):
+    monkeypatch.setattr(session_store, 'get_project_root', lambda: str(tmp_path))
+    monkeypatch.setattr(session_store, 'is_enabled', lambda: True)
+    sess = PKMSession('https://portal.example', {}, username='user', password='pass')
+    calls = {'login': 0, 'main': 0}
+
+    def login():
+        calls['login'] += 1
+        sess.session.cookies.set('JSESSIONID', 'abc', domain='portal.example', path='/')
+        sess.jwt_token = _jwt(token_exp)
+        sess.logged_in = True
+        return True
+
+    def load_main_page():
+        calls['main'] += 1
+        sess.main_page_loaded = True
+        return True
+
+    monkeypatch.setattr(sess, 'login', login)
+    monkeypatch.setattr(sess, 'load_main_page', load_main_page)
+    return sess, calls
+
+
+def test_new_process_reuses_stored_session_without_login(monkeypatch, tmp_path):
+    first, first_calls = _session(monkeypatch, tmp_path, time.time() + 3600)
+    assert first.ensure_logged_in()
+    assert first_calls == {'login': 1, 'main': 1}
+
+    path = session_store.session_store_path(first.base_url, first.username)
+    assert os.path.exists(path)
+    if os.name == 'posix':
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    second, second_calls = _session(monkeypatch, tmp_path, time.time() + 3600)
+    assert second.ensure_logged_in()
+    assert second_calls == {'login': 0, 'main': 0}
+    assert second.jwt_token == first.jwt_token
+    assert second.session.cookies.get('JSESSIONID') == 'abc'
+
+
+def test_expired_stored_session_falls_back_to_login(monkeypatch, tmp_path):
+    first, _ = _session(monkeypatch, tmp_path, time.time() + 3600)
+    first.ensure_logged_in()
+    path = session_store.session_store_path(first.base_url, first.username)
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    payload['expires_at'] = time.time() - 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+    second, calls = _session(monkeypatch, tmp_path, time.time() + 3600)
+    assert second.ensure_logged_in()
+    assert calls['login'] == 1
+
+
+def test_invalidate_removes_stored_session(monkeypatch, tmp_path):
+    sess, _ = _session(monkeypatch, tmp_path, time.time() + 3600)
+    sess.ensure_logged_in()
+    path = session_store.session_store_path(sess.base_url, sess.username)
+    assert os.path.exists(path)
+
+    sess.invalidate()
+    assert not os.path.exists(path)
+
+
+class _Response:
+    def __init__(self, url, payload=None):
+        self.url = url
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError('login page')
+        return self._payload
+
+
+def test_revoked_stored_session_relogins_on_direct_get(monkeypatch, tmp_path):
+    import api
+
+    first, _ = _session(monkeypatch, tmp_path, time.time() + 3600)
+    first.ensure_logged_in()
+    second, calls = _session(monkeypatch, tmp_path, time.time() + 3600)
+    assert second.ensure_logged_in() and calls['login'] == 0
+
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        if calls['login'] == 0:  # το portal έχει ανακαλέσει το αποθηκευμένο session
+            return _Response('https://portal.example/login')
+        return _Response(url, {'success': True, 'data': [{'W007_P_FLD61': 'P-9'}]})
+
+    monkeypatch.setattr(second.session, 'get', get)
+
+    payload = api._fetch_record_payload(second, '9')
+
+    assert payload['data'][0]['W007_P_FLD61'] == 'P-9'
+    assert calls['login'] == 1 and len(requested) == 2
@@ -0,0 +1,52 @@
+import os
+import sys
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from settled_cases import SettledIndex, correlate_incoming_with_settled, get_settled_for_incoming
+
+
+SETTLED = [
+    {'W001_P_FLD2': ' 2026/100 ', 'W001_P_FLD3': '2026-02-01'},
+    {'W001_P_FLD2': '2026/200', 'W001_P_FLD3': '2026-02-02'},
+    {'W001_P_FLD2': '2026/300', 'W001_P_FLD3': '2026-02-03'},
+]
+
+
+def test_keys_are_normalized():
+    index = SettledIndex(SETTLED)
+
+    assert len(index) == 3
+    assert '2026/100' in index
+    assert index[' 2026/100'] is SETTLED[0]
+    assert index.get('2026/999') is None
+
+
+def test_match_priority_and_fields():
+    index = SettledIndex(SETTLED)
+
+    assert index.match({'submission_year': '2026', 'case_id': '100', 'protocol_number': '2026/200'}) == \
+        ('2026/100', SETTLED[0])
+    assert index.match({'case_id': '100', 'protocol_number': '2026/200'})[0] == '2026/200'
+    assert index.match({'related_case': 'Αίτημα 2026/300 ΟΝΟΜΑ-123'})[0] == '2026/300'
+    assert index.match({'related_case': '2026/300'}, use_related_case=False) == (None, None)
+    assert get_settled_for_incoming({'W007_P_FLD7': 'Αίτημα 2026/200 Χ'}, index) is SETTLED[1]
+
+
+def test_from_mapping_wraps_summaries():
+    index = SettledIndex.from_mapping({'2026/100 ': {'settled_date': '01-02-2026'}})
+
+    assert index['2026/100']['settled_date'] == '01-02-2026'
+    assert SettledIndex.from_mapping(index) is index
+
+
+def test_correlation_uses_index():
+    incoming = [{'W007_P_FLD7': 'Αίτημα 2026/100 Α-1'}, {'W007_P_FLD7': ''}]
+
+    result = correlate_incoming_with_settled(incoming, SETTLED)
+
+    assert [c['case_code'] for c in result['correlated']] == ['2026/100']
+    assert len(result['incoming_without_settled']) == 1
+    assert len(result['settled_without_incoming']) == 2
+    assert result['stats']['total_settled'] == 3
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import charge_cache
+import settled_store
+from kv_store import KVStore
+from snapshot_store import JsonSnapshotBackend
+
+
+def _settled(code, completed, employee='Υπάλληλος'):
+    return {'W001_P_FLD2': code, 'W001_P_FLD3': completed[:10], 'W001_P_FLD8': completed,
+            'W001_P_FLD10': employee}
+
+
+class FakeSettledPortal:
+    """queryId=19 με σελίδες των 2 και προαιρετική ταξινόμηση DESC κατά W001_P_FLD8."""
+
+    def __init__(self, records, honour_sort=True):
+        self.records = list(records)
+        self.honour_sort = honour_sort
+        self.calls = []
+
+    def fetch_data(self, params):
+        self.calls.append(dict(params))
+        rows = list(self.records)
+        if 'sort' in params and self.honour_sort:
+            field = json.loads(params['sort'])[0]['property']
+            rows.sort(key=lambda r: r[field], reverse=True)
+        start = int(params.get('start', 0))
+        return {'success': True, 'data': rows[start:start + 2], 'total': len(rows)}
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    kv = KVStore(str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(settled_store, 'get_settings',
+                        lambda: {'settled_sync_interval': 0, 'settled_full_sync_interval': 3600})
+    monkeypatch.setattr(settled_store, '_sync_lock_path', lambda: str(tmp_path / 'settled_cases_sync'))
+    backend = JsonSnapshotBackend(str(tmp_path / 'incoming'))
+    monkeypatch.setattr(settled_store, 'get_snapshot_backend', lambda: backend)
+    yield kv
+    kv.close()
+
+
+def test_first_sync_is_full_then_incremental(store):
+    portal = FakeSettledPortal([_settled('2026/1', '2026-01-10'), _settled('2026/2', '2026-01-12'),
+                                _settled('2026/3', '2026-01-15')])
+    assert settled_store.sync_settled_cases(portal, store=store) == 3
+    assert settled_store.get_sync_state(store)['watermark'] == '2026-01-15'
+
+    portal.records.append(_settled('2026/4', '2026-01-20', employee='Νέος'))
+    portal.calls.clear()
+    assert settled_store.sync_settled_cases(portal, store=store) == 2  # νέα + ισοπαλία στο watermark
+    assert all('sort' in call for call in portal.calls)
+    assert len(portal.calls) == 2  # σταματά στην πρώτη σελίδα με παλαιότερη εγγραφή
+
+    assert settled_store.get_settled_case(' 2026/4 ', store=store)['W001_P_FLD10'] == 'Νέος'
+    assert len(settled_store.load_settled_records(store=store)) == 4
+
+
+def test_summaries_are_shared_until_next_sync(store):
+    portal = FakeSettledPortal([_settled('2026/1', '2026-01-10', employee='Α')])
+    first = settled_store.get_settled_summaries(portal, store=store)
+    assert first == {'2026/1': {'settled_date': '2026-01-10', 'assigned_employee': 'Α'}}
+    assert settled_store.get_settled_summaries(store=store) is first
+
+    portal.records.append(_settled('2026/2', '2026-01-11', employee='Β'))
+    second = settled_store.get_settled_summaries(portal, store=store)
+    assert second is not first
+    assert second['2026/2']['assigned_employee'] == 'Β'
+
+
+def test_recent_sync_is_not_repeated(store, monkeypatch):
+    portal = FakeSettledPortal([_settled('2026/1', '2026-01-10')])
+    settled_store.sync_settled_cases(portal, store=store)
+    monkeypatch.setattr(settled_store, 'get_settings', lambda: {'settled_sync_interval': 3600})
+    portal.calls.clear()
+
+    assert settled_store.sync_settled_cases(portal, store=store) == 0
+    assert portal.calls == []
+
+
+def test_ignored_sort_falls_back_to_full_sync_and_drops_stale(store):
+    portal = FakeSettledPortal([_settled('2026/1', '2026-01-10'), _settled('2026/2', '2026-01-12'),
+                                _settled('2026/3', '2026-01-11')], honour_sort=False)
+    settled_store.sync_settled_cases(portal, store=store, force=True)
+    portal.records = [r for r in portal.records if r['W001_P_FLD2'] != '2026/2']
+
+    settled_store.sync_settled_cases(portal, store=store)
+
+    assert settled_store.get_settled_case('2026/2', store=store) is None
+    assert settled_store.get_sync_state(store)['count'] == 2
+
+
+def test_sync_evicts_cached_charges_of_newly_settled(store, monkeypatch):
+    settled_store.get_snapshot_backend().save('2026-01-20', [
+        {'doc_id': '11', 'case_code': '2026/1'},
+        {'doc_id': '12', 'submission_year': '2026', 'case_id': '2'},
+        {'doc_id': '13', 'case_code': '2026/3', 'related_case_code': '2026/2'},
+    ])
+    monkeypatch.setattr(charge_cache, '_legacy_cache_path', lambda: str(store.path) + '.legacy')
+    charge_cache.store_charges({d: {'charged': True} for d in ('11', '12', '13')}, store=store)
+    portal = FakeSettledPortal([_settled('2026/1', '2026-01-10')])
+    settled_store.sync_settled_cases(portal, store=store)
+    charge_cache.store_charges({'11': {'charged': True}}, store=store)
+
+    portal.records.append(_settled('2026/2', '2026-01-12'))
+    settled_store.sync_settled_cases(portal, store=store)
+
+    # Μόνο οι νέες διεκπεραιωμένες (όχι όσες απλώς αναφέρονται ως σχετική υπόθεση)
+    assert set(charge_cache.get_cached_charges(['11', '12', '13'], store=store)) == {'11', '13'}
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import incoming
+import snapshot_stats
+import snapshot_store
+from services import report_service
+from snapshot_store import JsonSnapshotBackend
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    backend = JsonSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    monkeypatch.setattr(snapshot_store, '_backend', backend)
+    monkeypatch.setattr(snapshot_stats, 'get_snapshot_stats_path',
+                        lambda date_str: str(tmp_path / f'stats_{date_str}.json'))
+    config_path = tmp_path / 'test_users.json'
+    _write_config(config_path, ['ΔΟΚΙΜΑΣΤΙΚΟΣ'])
+    monkeypatch.setattr('test_users.get_test_users_config_path', lambda: str(config_path))
+    return backend, config_path
+
+
+def _write_config(path, test_users):
+    config = {'internal_user_suffix': '(Εσωτ. χρήστης)', 'test_users': test_users, 'test_companies': []}
+    path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+
+
+RECORDS = [
+    {'case_id': '1', 'party': 'ΠΑΠΑΔΟΠΟΥΛΟΣ', 'directory': 'Δ/νση Α', 'general_directorate': 'ΓΔ 1'},
+    {'case_id': '2', 'party': 'ΔΟΚΙΜΑΣΤΙΚΟΣ ΧΡΗΣΤΗΣ', 'directory': 'Δ/νση Α', 'general_directorate': 'ΓΔ 1'},
+    {'case_id': '3', 'party': 'Υπάλληλος (Εσωτ. χρήστης)', 'directory': 'Δ/νση Β', 'general_directorate': 'ΓΔ 2'},
+]
+
+
+def test_stats_written_on_save_and_read_without_snapshot(data_dir, monkeypatch):
+    records = [dict(r) for r in RECORDS]
+    incoming.save_incoming_snapshot('2026-03-01', records)
+    assert 'is_test' not in records[0]
+
+    monkeypatch.setattr(data_dir[0], 'load', lambda date_str: pytest.fail('snapshot φορτώθηκε'))
+    total, stats = report_service.snapshot_stats('2026-03-01')
+
+    assert (total, stats['real'], stats['test']) == (3, 1, 2)
+    assert stats['test_breakdown'] == {'test_user': 1, 'internal_user': 1}
+    assert stats['by_directory'] == {'Δ/νση Α': 2, 'Δ/νση Β': 1}
+    assert stats['by_general_directorate'] == {'ΓΔ 1': 2, 'ΓΔ 2': 1}
+
+
+def test_missing_or_stale_sidecar_is_rebuilt(data_dir):
+    backend, config_path = data_dir
+    backend.save('2026-03-02', [dict(r) for r in RECORDS])
+    assert report_service.snapshot_stats('2026-03-03') is None
+    assert report_service.snapshot_stats('2026-03-02')[1]['test'] == 2
+
+    _write_config(config_path, [])
+    assert report_service.snapshot_stats('2026-03-02')[1]['test'] == 1
+
+
+def test_signature_is_not_recomputed_for_unchanged_config(data_dir, monkeypatch):
+    backend, _ = data_dir
+    backend.save('2026-03-04', [dict(r) for r in RECORDS])
+    snapshot_stats.load_snapshot_stats('2026-03-04')
+
+    monkeypatch.setattr('test_users.load_test_users_config', lambda: pytest.fail('test_users.json διαβάστηκε ξανά'))
+    for _ in range(3):
+        assert snapshot_stats.load_snapshot_stats('2026-03-04')['test'] == 2
@@ -0,0 +1,191 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import incoming
+import snapshot_store
+from snapshot_store import JsonSnapshotBackend, SqliteSnapshotBackend, import_json_snapshots
+
+
+def _records(n, directory='Δ/νση Α'):
+    return [{'case_id': str(100 + i), 'doc_id': f'd{i}', 'directory': directory if i % 2 else 'Δ/νση Β',
+             'submitted_at': f'2026-01-{i + 1:02d} 10:00:00', 'party': 'ΠΑΠΑΔΟΠΟΥΛΟΣ'} for i in range(n)]
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = SqliteSnapshotBackend(str(tmp_path / 'snapshots.sqlite3'))
+    yield backend
+    backend.close()
+
+
+def test_sqlite_roundtrip_keeps_api_shape(sqlite_backend):
+    sqlite_backend.save('2026-01-05', _records(3))
+    sqlite_backend.save('2026-01-05', _records(4))
+
+    snap = sqlite_backend.load('2026-01-05')
+
+    assert snap == {'date': '2026-01-05', 'count': 4, 'records': _records(4)}
+    assert sqlite_backend.load('2026-01-06') is None
+
+
+def test_saved_at_reports_last_save(sqlite_backend, tmp_path):
+    json_backend = JsonSnapshotBackend(str(tmp_path / 'json'))
+    for backend in (json_backend, sqlite_backend):
+        assert backend.saved_at('2026-01-05') is None
+        before = time.time() - 1
+        backend.save('2026-01-05', _records(2))
+        assert before <= backend.saved_at('2026-01-05') <= time.time() + 1
+
+
+def test_range_queries_with_indexed_filters(sqlite_backend):
+    for day in ('2026-01-05', '2026-01-06', '2026-01-07'):
+        sqlite_backend.save(day, _records(6))
+
+    rows = list(sqlite_backend.iter_records('2026-01-06', '2026-01-07', directory='Δ/νση Α'))
+    assert [(d, r['case_id']) for d, r in rows] == [
+        ('2026-01-06', '101'), ('2026-01-06', '103'), ('2026-01-06', '105'),
+        ('2026-01-07', '101'), ('2026-01-07', '103'), ('2026-01-07', '105'),
+    ]
+    rows = list(sqlite_backend.iter_records(submitted_from='2026-01-05', case_id='105'))
+    assert [d for d, _ in rows] == ['2026-01-05', '2026-01-06', '2026-01-07']
+    with pytest.raises(ValueError):
+        list(sqlite_backend.iter_records(party='x'))
+
+
+def test_json_import_and_incoming_api_delegate_to_backend(sqlite_backend, tmp_path, monkeypatch):
+    source = JsonSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    source.save('2026-01-05', _records(2))
+    source.save('2026-01-06', _records(3))
+
+    assert import_json_snapshots(sqlite_backend, source) == 2
+    assert import_json_snapshots(sqlite_backend, source) == 0
+
+    monkeypatch.setattr(snapshot_store, '_backend', sqlite_backend)
+    assert incoming.get_all_incoming_dates() == ['2026-01-05', '2026-01-06']
+    prev_date, prev = incoming.load_previous_incoming_snapshot('2026-01-07')
+    assert prev_date == '2026-01-06'
+    assert prev['records'] == _records(3)
+    assert [d for d, _ in incoming.query_incoming_records(doc_id='d2')] == ['2026-01-06']
+
+
+def _day(n):
+    return f'2026-02-{n:02d}'
+
+
+def test_delta_backend_reconstructs_every_day(tmp_path):
+    from snapshot_store import DeltaSnapshotBackend
+
+    backend = DeltaSnapshotBackend(str(tmp_path / 'incoming_requests'), keyframe_interval=3, cache_days=2)
+    history = {}
+    records = _records(20)
+    for n in range(1, 8):
+        records = [dict(r) for r in records]
+        records[n]['directory'] = f'Αλλαγή {n}'
+        records.insert(0, {'case_id': str(900 + n), 'doc_id': f'n{n}', 'directory': 'Νέα',
+                           'submitted_at': f'2026-02-{n:02d} 09:00:00'})
+        records.pop()
+        backend.save(_day(n), records)
+        history[_day(n)] = records
+
+    files = sorted(os.listdir(tmp_path / 'incoming_requests'))
+    assert files.count('incoming_2026-02-01.json') == 1
+    assert len([f for f in files if f.endswith('.delta.json')]) == 4
+
+    fresh = DeltaSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    for date_str, expected in history.items():
+        assert fresh.load(date_str)['records'] == expected
+    assert [d.strftime('%Y-%m-%d') for d in fresh.dates()] == list(history)
+
+
+def test_delta_backend_resave_keeps_later_days_intact(tmp_path):
+    from snapshot_store import DeltaSnapshotBackend
+
+    backend = DeltaSnapshotBackend(str(tmp_path / 'incoming_requests'), keyframe_interval=10)
+    backend.save(_day(1), _records(5))
+    backend.save(_day(2), _records(6))
+    backend.save(_day(3), list(reversed(_records(7))))
+
+    backend.save(_day(2), _records(2))
+
+    fresh = DeltaSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    assert fresh.load(_day(2))['records'] == _records(2)
+    assert fresh.load(_day(3))['records'] == list(reversed(_records(7)))
+    loaded = fresh.load(_day(1))
+    loaded['records'][0]['party'] = 'ΑΛΛΟΣ'
+    assert fresh.load(_day(1))['records'] == _records(5)
+
+
+def test_delta_cache_sees_writes_from_other_processes(tmp_path):
+    from snapshot_store import DeltaSnapshotBackend
+
+    directory = str(tmp_path / 'incoming_requests')
+    reader = DeltaSnapshotBackend(directory, keyframe_interval=10)
+    writer = DeltaSnapshotBackend(directory, keyframe_interval=10)
+    writer.save(_day(1), _records(3))
+    writer.save(_day(2), _records(4))
+    assert reader.load(_day(2))['count'] == 4
+
+    writer.save(_day(2), _records(5) + [{'case_id': '999', 'doc_id': 'z', 'directory': '', 'submitted_at': ''}])
+
+    assert reader.load(_day(2))['count'] == 6
+
+
+def test_snapshot_cache_skips_unchanged_files(tmp_path, monkeypatch):
+    from snapshot_store import SnapshotCache
+
+    cache = SnapshotCache(max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(snapshot_store, '_snapshot_cache', cache)
+    backend = JsonSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    backend.save('2026-01-05', _records(3))
+    reads = []
+    real_read = snapshot_store.read_file_sized
+    monkeypatch.setattr(snapshot_store, 'read_file_sized', lambda path: reads.append(path) or real_read(path))
+
+    first = backend.load('2026-01-05')
+    first['records'][0]['party'] = 'ΑΛΛΑΓΜΕΝΟ'
+    second = backend.load('2026-01-05')
+
+    assert len(reads) == 1 and cache.hits == 1
+    assert second['records'] == _records(3)
+
+    backend.save('2026-01-05', _records(4))
+    assert backend.load('2026-01-05')['count'] == 4
+    assert len(reads) == 2
+
+
+def test_snapshot_cache_evicts_least_recently_used(tmp_path):
+    from snapshot_store import SnapshotCache
+
+    backend = JsonSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    for day in ('2026-01-05', '2026-01-06', '2026-01-07'):
+        backend.save(day, _records(50))
+    size = os.path.getsize(backend.path('2026-01-05')) * snapshot_store._PARSED_OVERHEAD
+    cache = SnapshotCache(max_bytes=int(size * 2.5))
+
+    for day in ('2026-01-05', '2026-01-06', '2026-01-05', '2026-01-07'):
+        cache.get(backend.path(day), snapshot_store.read_file_sized)
+
+    assert set(cache._entries) == {backend.path('2026-01-05'), backend.path('2026-01-07')}
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_snapshot_cache_cost_uses_decompressed_size(tmp_path, monkeypatch):
+    import serialization
+    from serialization import dumps
+    from snapshot_store import SnapshotCache
+
+    monkeypatch.setattr(serialization, 'get_settings', lambda: {'storage_compression': 'gzip'})
+    backend = JsonSnapshotBackend(str(tmp_path / 'incoming_requests'))
+    backend.save('2026-01-05', _records(200))
+    raw_size = len(dumps(backend.load('2026-01-05'), fmt='json', compression='none'))
+    assert os.path.getsize(backend.path('2026-01-05')) * 4 < raw_size
+
+    cache = SnapshotCache(max_bytes=100 * 1024 * 1024)
+    assert cache.get(backend.path('2026-01-05'), snapshot_store.read_file_sized)['count'] == 200
+    assert cache.total_bytes == raw_size * snapshot_store._PARSED_OVERHEAD
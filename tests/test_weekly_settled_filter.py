@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Setup path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import weekly_report_generator as weekly
+
+
+def _rec(case_id, submitted_at, doc_id='1'):
+    return {'case_id': case_id, 'submission_year': '2026', 'submitted_at': submitted_at,
+            'doc_id': doc_id, 'protocol_number': '', 'related_case': ''}
+
+
+def test_all_directorates_share_one_settled_lookup(monkeypatch):
+    def no_monitor(*args, **kwargs):
+        raise AssertionError("δεν πρέπει να γίνει σύνδεση ανά Γενική Διεύθυνση")
+
+    evicted = []
+    monkeypatch.setattr(weekly, 'get_shared_monitor', no_monitor)
+    monkeypatch.setattr(weekly.charge_cache, 'evict', evicted.extend)
+    lookup = {
+        '2026/100': {'settled_date': '2026-02-02', 'assigned_employee': ''},
+        '2026/200': {'settled_date': '2026-02-20', 'assigned_employee': ''},
+    }
+    groups = {
+        'Α': [_rec('100', '2026-01-20', doc_id='d100'), _rec('300', '2026-02-10')],
+        'Β': [_rec('200', '2026-02-10')],
+    }
+
+    filtered = {gd: weekly.filter_out_settled_from_records(recs, '2026-02-09', gd, '2026-02-16',
+                                                           settled_by_protocol=lookup)
+                for gd, recs in groups.items()}
+
+    assert [r['case_id'] for r in filtered['Α']] == ['300']
+    assert evicted == ['d100']
+    assert filtered['Β'][0]['_settled_status'] == 'Διεκπεραιωμένη'